@@ -1,5 +1,5 @@
 import os
-import pathlib
+import stat
 from time import monotonic
 
 import jinja2
@@ -36,7 +36,16 @@ from app import proxy_fix, webauthn_server
 from app.asset_fingerprinter import asset_fingerprinter
 from app.commands import setup_commands
 from app.config import configs
-from app.extensions import antivirus_client, redis_client, zendesk_client
+from app.extensions import (
+    antivirus_client,
+    http_session,
+    in_process_cache,
+    job_upload_cache,
+    letter_upload_cache,
+    recipient_csv_cache,
+    redis_client,
+    zendesk_client,
+)
 from app.formatters import (
     convert_to_boolean,
     format_auth_type,
@@ -127,6 +136,8 @@ from app.url_converters import (
     TicketTypeConverter,
 )
 from app.utils import format_provider
+from app.utils.constants import JSON_UPDATES_BLUEPRINT_NAME, NO_COOKIE_BLUEPRINT_NAME
+from app.utils.json_updates import make_json_updates_conditional
 from app.utils.user_id import get_user_id_from_flask_login_session
 
 login_manager = LoginManager()
@@ -151,7 +162,15 @@ def create_app(application):
     notify_environment = os.environ["NOTIFY_ENVIRONMENT"]
 
     application.config.from_object(configs[notify_environment])
-    asset_fingerprinter._asset_root = application.config["ASSET_PATH"]
+    asset_fingerprinter.init_app(application)
+
+    # These have to be set before anything uses `application.jinja_env`, which is created from them
+    application.jinja_options = {
+        **application.jinja_options,
+        # Keep every template compiled in memory, there are more of them than Jinja’s default of 400
+        "cache_size": -1,
+        "bytecode_cache": get_jinja_bytecode_cache(application),
+    }
 
     init_app(application)
 
@@ -171,6 +190,7 @@ def create_app(application):
         proxy_fix,
         request_helper,
         # API clients
+        http_session,
         api_key_api_client,
         billing_api_client,
         broadcast_message_api_client,
@@ -200,8 +220,13 @@ def create_app(application):
         # External API clients
         antivirus_client,
         redis_client,
+        # Needs Redis to be set up first
+        in_process_cache,
         zendesk_client,
         logo_client,
+        recipient_csv_cache,
+        job_upload_cache,
+        letter_upload_cache,
     ):
         client.init_app(application)
 
@@ -226,6 +251,10 @@ def create_app(application):
 
     setup_event_handlers()
 
+    if application.config["PRECOMPILE_JINJA_TEMPLATES"]:
+        count, seconds = precompile_jinja_templates(application)
+        application.logger.info("Compiled %s templates in %.2fs", count, seconds)
+
 
 def init_app(application):
     application.after_request(useful_headers_after_request)
@@ -238,10 +267,7 @@ def init_app(application):
 
     application.session_interface = NotifyAdminSessionInterface()
 
-    font_paths = [
-        str(item)[len(asset_fingerprinter._filesystem_path) :]
-        for item in pathlib.Path(asset_fingerprinter._filesystem_path).glob("fonts/*.woff2")
-    ]
+    font_paths = asset_fingerprinter.get_asset_paths("fonts/*.woff2")
 
     @application.context_processor
     def _attach_current_service():
@@ -397,7 +423,15 @@ def useful_headers_after_request(response):
     )
     if "Cache-Control" in response.headers:
         del response.headers["Cache-Control"]
-    response.headers.add("Cache-Control", "no-store, no-cache, private, must-revalidate")
+    if request.blueprint == JSON_UPDATES_BLUEPRINT_NAME or (
+        # Only previews without anyone’s personal details in them get an ETag
+        request.blueprint == NO_COOKIE_BLUEPRINT_NAME
+        and "ETag" in response.headers
+    ):
+        # Let the browser keep the last response, so it can check with us whether it’s changed
+        response.headers.add("Cache-Control", "no-cache, private, must-revalidate")
+    else:
+        response.headers.add("Cache-Control", "no-store, no-cache, private, must-revalidate")
     for key, value in response.headers:
         response.headers[key] = SanitiseASCII.encode(value)
     return response
@@ -534,6 +568,7 @@ def setup_blueprints(application):
 
     main_blueprint.before_request(make_session_permanent)
     main_blueprint.after_request(save_service_or_org_after_request)
+    json_updates_blueprint.after_request(make_json_updates_conditional)
 
     application.register_blueprint(main_blueprint)
     application.register_blueprint(json_updates_blueprint)
@@ -616,3 +651,41 @@ def init_jinja(application):
 
     application.jinja_env.filters["format_provider"] = format_provider
     application.jinja_env.add_extension("jinja2.ext.do")
+
+
+def get_jinja_bytecode_cache(application):
+    if not application.config["USE_JINJA_BYTECODE_CACHE"]:
+        return None
+
+    if not (directory := application.config["JINJA_BYTECODE_CACHE_DIR"]):
+        # Jinja makes (and checks) a directory that only this user can use
+        return jinja2.FileSystemBytecodeCache()
+
+    # Jinja loads templates from the cache with `marshal`, so nobody else can be allowed to write to it
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    directory_stat = os.lstat(directory)
+    if (
+        not stat.S_ISDIR(directory_stat.st_mode)
+        or directory_stat.st_uid != os.getuid()
+        or directory_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    ):
+        raise RuntimeError(f"JINJA_BYTECODE_CACHE_DIR {directory} must be a directory only this user can write to")
+
+    return jinja2.FileSystemBytecodeCache(directory)
+
+
+def precompile_jinja_templates(application):
+    """
+    Loads every template, so that they’re compiled (or loaded from the
+    bytecode cache) before any request needs them, and so that they’re in
+    the bytecode cache for the next worker that starts.
+
+    Returns how many templates there were and how long it took, in seconds.
+    """
+    start = monotonic()
+    template_names = application.jinja_env.list_templates(extensions=["html"])
+
+    for template_name in template_names:
+        application.jinja_env.get_template(template_name)
+
+    return len(template_names), monotonic() - start
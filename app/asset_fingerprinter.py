@@ -1,4 +1,7 @@
 import hashlib
+import json
+from fnmatch import fnmatchcase
+from pathlib import Path
 
 
 class AssetFingerprinter:
@@ -17,22 +20,50 @@ class AssetFingerprinter:
         {{ asset_fingerprinter.get_url('stylesheets/application.css') }}
 
     * 'app/static' is assumed to be the root for all asset files
+
+    The frontend build writes the hash of every asset to
+    'app/static/asset-manifest.json'. Assets which aren’t in the manifest
+    (or if there’s no manifest) get hashed when they’re first used, unless
+    the manifest is required.
     """
 
+    MANIFEST_FILENAME = "asset-manifest.json"
+
     def __init__(self, asset_root="/static/", filesystem_path="app/static/"):
         self._cache = {}
         self._asset_root = asset_root
         self._filesystem_path = filesystem_path
+        self._manifest = {}
+        self._manifest_required = False
+
+    def init_app(self, application):
+        self._asset_root = application.config["ASSET_PATH"]
+        self._manifest_required = application.config["ASSET_MANIFEST_REQUIRED"]
+        self._manifest = self.load_manifest()
+
+    def load_manifest(self):
+        try:
+            with open(self._filesystem_path + self.MANIFEST_FILENAME) as manifest_file:
+                return json.load(manifest_file)
+        except FileNotFoundError:
+            if self._manifest_required:
+                raise
+            return {}
 
     def get_url(self, asset_path, with_querystring_hash=True):
         if not with_querystring_hash:
             return self._asset_root + asset_path
         if asset_path not in self._cache:
-            self._cache[asset_path] = (
-                self._asset_root + asset_path + "?" + self.get_asset_fingerprint(self._filesystem_path + asset_path)
-            )
+            self._cache[asset_path] = self._asset_root + asset_path + "?" + self.get_fingerprint_for(asset_path)
         return self._cache[asset_path]
 
+    def get_fingerprint_for(self, asset_path):
+        if asset_path in self._manifest:
+            return self._manifest[asset_path]
+        if self._manifest_required:
+            raise KeyError(f"{asset_path} is not in the asset manifest")
+        return self.get_asset_fingerprint(self._filesystem_path + asset_path)
+
     def get_asset_fingerprint(self, asset_file_path):
         return hashlib.md5(self.get_asset_file_contents(asset_file_path)).hexdigest()
 
@@ -41,5 +72,16 @@ class AssetFingerprinter:
             contents = asset_file.read()
         return contents
 
+    def get_asset_paths(self, pattern):
+        """
+        Paths (relative to 'app/static') of the assets matching `pattern`,
+        from the manifest if there is one
+        """
+        if self._manifest:
+            return sorted(asset_path for asset_path in self._manifest if fnmatchcase(asset_path, pattern))
+        return sorted(
+            str(item.relative_to(self._filesystem_path)) for item in Path(self._filesystem_path).glob(pattern)
+        )
+
 
 asset_fingerprinter = AssetFingerprinter()
@@ -95,7 +95,8 @@
           if (response.stop === 1) {
             window.clearTimeout(timeout); // stop polling
           } else {
-            interval = calculateBackoff(Date.now() - startTime); // keep polling but adjust for response time
+            // keep polling but adjust for response time, and wait longer if the server asks us to
+            interval = Math.max(calculateBackoff(Date.now() - startTime), response.poll_interval || 0);
           }
         }
       ).fail(
@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 
 import csv
-import pickle
 import sys
+from collections import defaultdict
 from math import isclose
 from pathlib import Path
 
@@ -18,15 +18,14 @@ from populations import (
     SMARTPHONE_OWNERSHIP_BY_AGE_RANGE,
     estimate_number_of_smartphones_for_population,
 )
-from repo import BroadcastAreasRepository, rtree_index_path
-from rtreelib import Rect, RTree
+from repo import BroadcastAreasRepository, PackedRTree, rtree_index_path
 from shapely import wkt
 from shapely.geometry import MultiPolygon, Polygon
 
 source_files_path = Path(__file__).resolve().parent / "source_files"
 point_counts = []
 invalid_polygons = []
-rtree_index = RTree()
+ward_bounds = []
 
 # The hard limit in the CBCs is 6,000 points per polygon. But we also
 # care about optimising how quickjly we can process and display polygons
@@ -437,7 +436,7 @@ def _add_electoral_wards(dataset_id):
         feature, simple_feature, utm_crs = polygons_and_simplified_polygons(feature["geometry"])
 
         if feature:
-            rtree_index.insert(ward_id, Rect(*Polygons(feature).bounds))
+            ward_bounds.append((ward_id, Polygons(feature).bounds))
 
         areas_to_add.append(
             [
@@ -452,7 +451,7 @@ def _add_electoral_wards(dataset_id):
             ]
         )
 
-    rtree_index_path.open("wb").write(pickle.dumps(rtree_index))
+    PackedRTree.write(rtree_index_path, ward_bounds)
     repo.insert_broadcast_areas(areas_to_add, keep_old_polygons)
 
 
@@ -517,11 +516,43 @@ def _add_counties_and_unitary_authorities(dataset_id):
     repo.insert_broadcast_areas(areas_to_add, keep_old_polygons)
 
 
+def roll_up_counts_of_phones():
+    counts_of_phones = {}
+    sub_area_ids = defaultdict(list)
+
+    for area_id, group_id, count_of_phones in repo.get_all_areas_with_groups():
+        counts_of_phones[area_id] = count_of_phones
+        if group_id:
+            sub_area_ids[group_id].append(area_id)
+
+    rolled_up_counts_of_phones = {}
+
+    def roll_up(area_id):
+        if area_id not in rolled_up_counts_of_phones:
+            if area_id.endswith(CITY_OF_LONDON.WARDS):
+                # Estimated from physical area, as we have no population
+                # figures for wards of the City of London
+                polygons, utm_crs = repo.get_polygons_for_area(area_id)
+                rolled_up_counts_of_phones[area_id] = CITY_OF_LONDON.DAYTIME_POPULATION * (
+                    Polygons(polygons, utm_crs=utm_crs).estimated_area / CITY_OF_LONDON.AREA_SQUARE_METRES
+                )
+            elif sub_area_ids[area_id]:
+                rolled_up_counts_of_phones[area_id] = sum(roll_up(sub_area_id) for sub_area_id in sub_area_ids[area_id])
+            else:
+                rolled_up_counts_of_phones[area_id] = counts_of_phones[area_id] or 0
+        return rolled_up_counts_of_phones[area_id]
+
+    for area_id in counts_of_phones:
+        roll_up(area_id)
+
+    repo.update_counts_of_phones(rolled_up_counts_of_phones)
+
+
 # cheeky global variable
 keep_old_polygons = sys.argv[1:] == ["--keep-old-polygons"]
 print("keep_old_polygons: ", keep_old_polygons)  # noqa: T201
 
-repo = BroadcastAreasRepository()
+repo = BroadcastAreasRepository(read_only=False)
 
 if keep_old_polygons:
     repo.delete_library_data()
@@ -535,6 +566,15 @@ add_police_force_areas()
 add_countries()
 add_wards_local_authorities_and_counties()
 
+print("\nBuilding area hierarchy")  # noqa: T201
+repo.insert_ancestors()
+
+print("\nBuilding geometry store")  # noqa: T201
+repo.build_geometry_store()
+
+print("\nRolling up counts of phones")  # noqa: T201
+roll_up_counts_of_phones()
+
 most_detailed_polygons = formatted_list(
     sorted(point_counts, reverse=True)[:5],
     before_each="",
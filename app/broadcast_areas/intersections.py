@@ -0,0 +1,66 @@
+from notifications_utils.polygons import Polygons
+from shapely.geometry import Polygon, box
+from shapely.ops import unary_union
+from shapely.prepared import prep
+
+
+class PreparedPolygons:
+    """
+    Wraps some `Polygons` so that lots of other areas can be compared
+    against them quickly.
+
+    The polygons are merged and prepared once, which builds an index of
+    their edges. After that, working out whether an area is completely
+    inside or completely outside them is cheap, so the expensive part (an
+    exact intersection, then an area estimate) only needs doing for areas
+    which straddle the boundary.
+    """
+
+    def __init__(self, polygons):
+        self.geometry = unary_union(list(polygons))
+        if not self.geometry.is_valid:
+            self.geometry = self.geometry.buffer(0)
+        self.prepared = prep(self.geometry)
+
+    def intersects(self, polygons):
+        return any(self.prepared.intersects(polygon) for polygon in polygons)
+
+    def contains(self, polygons):
+        return all(
+            # Checking the bounding box first is much quicker than checking
+            # the polygon, and is enough for most areas well inside
+            self.prepared.contains(box(*polygon.bounds)) or self.prepared.contains(polygon)
+            for polygon in polygons
+        )
+
+    def ratio_of_intersection(self, polygons):
+        """
+        The proportion of `polygons` which is covered by these polygons,
+        between 0 and 1
+        """
+        if not self.intersects(polygons):
+            return 0
+
+        if self.contains(polygons):
+            return 1
+
+        if not polygons.estimated_area:
+            return 0
+
+        intersection = Polygons(
+            [part for polygon in polygons for part in _polygons_in(polygon.intersection(self.geometry))],
+            utm_crs=polygons.utm_crs,
+        )
+
+        return intersection.estimated_area / polygons.estimated_area
+
+    def ratios_of_intersection(self, areas):
+        return [self.ratio_of_intersection(area.simple_polygons) for area in areas]
+
+
+def _polygons_in(geometry):
+    # An intersection can be a single polygon, or a collection of polygons,
+    # lines and points (where the shapes only touch) – we only want polygons
+    if isinstance(geometry, Polygon):
+        return [geometry] if not geometry.is_empty else []
+    return [polygon for part in getattr(geometry, "geoms", []) for polygon in _polygons_in(part)]
@@ -4,12 +4,12 @@ from abc import ABC, abstractmethod
 from notifications_utils.formatters import formatted_list
 from notifications_utils.polygons import Polygons
 from notifications_utils.serialised_model import SerialisedModelCollection
-from rtreelib import Rect
 from werkzeug.utils import cached_property
 
 from app.formatters import square_metres_to_square_miles
 from app.models import SortingAndEqualityMixin
 
+from .intersections import PreparedPolygons
 from .populations import CITY_OF_LONDON
 from .repo import BroadcastAreasRepository, rtree_index
 
@@ -67,11 +67,14 @@ class BroadcastArea(BaseBroadcastArea, SortingAndEqualityMixin):
     __sort_attribute__ = "name"
 
     def __init__(self, row):
-        self.id, self.name, self._count_of_phones, self.library_id = row
+        self.id, self.name, self._count_of_phones, self.library_id, self.depth = row
 
     @cached_property
     def is_lower_tier_local_authority(self):
-        return self.id.startswith("lad21-") and self.parent
+        if self.depth is None:
+            # From a database built before depths were precomputed
+            return self.id.startswith("lad21-") and self.parent
+        return self.id.startswith("lad21-") and self.depth > 0
 
     @cached_property
     def is_electoral_ward(self):
@@ -79,10 +82,10 @@ class BroadcastArea(BaseBroadcastArea, SortingAndEqualityMixin):
 
     @classmethod
     def from_row_with_simple_polygons(cls, row):
-        instance = cls(row[:4])
+        instance = cls(row[:5])
         instance.simple_polygons = Polygons(
-            row[4],
-            utm_crs=row[5],
+            row[5],
+            utm_crs=row[6],
         )
         return instance
 
@@ -102,37 +105,38 @@ class BroadcastArea(BaseBroadcastArea, SortingAndEqualityMixin):
 
     @property
     def count_of_phones(self):
-        if self.id.endswith(CITY_OF_LONDON.WARDS):
-            return CITY_OF_LONDON.DAYTIME_POPULATION * (
-                self.polygons.estimated_area / CITY_OF_LONDON.AREA_SQUARE_METRES
-            )
-        if self.sub_areas:
-            return sum(area.count_of_phones for area in self.sub_areas)
+        # Counts for areas with sub areas (and for wards of the City of
+        # London) are rolled up when the database is built, see
+        # `create-broadcast-areas-db.py`, but not in databases built before
+        # depths were precomputed
+        if self.depth is None:
+            if self.id.endswith(CITY_OF_LONDON.WARDS):
+                return CITY_OF_LONDON.DAYTIME_POPULATION * (
+                    self.polygons.estimated_area / CITY_OF_LONDON.AREA_SQUARE_METRES
+                )
+            if self.sub_areas:
+                return sum(area.count_of_phones for area in self.sub_areas)
+
         # TODO: remove the `or 0` once missing data is fixed, see
         # https://www.pivotaltracker.com/story/show/174837293
         return self._count_of_phones or 0
 
     @cached_property
     def ancestors(self):
-        return list(self._ancestors_iterator)
+        return self._ancestors_from_rows(BroadcastAreasRepository().get_ancestors_for_areas([self.id])[self.id])
 
     @cached_property
     def parent(self):
         return next(iter(self.ancestors), None)
 
-    @property
-    def _ancestors_iterator(self):
-        id = self.id
-
-        while True:
-            parent = BroadcastAreasRepository().get_parent_for_area(id)
-
-            if not parent:
-                return
-
-            parent_broadcast_area = BroadcastArea(parent)
-            yield parent_broadcast_area
-            id = parent_broadcast_area.id
+    @classmethod
+    def _ancestors_from_rows(cls, rows):
+        ancestors = [cls(row) for row in rows]
+        # Each ancestor’s own ancestors are the rest of the chain, so we
+        # can fill them in now rather than query for them later
+        for index, ancestor in enumerate(ancestors):
+            ancestor.ancestors = ancestors[index + 1 :]
+        return ancestors
 
 
 class CustomBroadcastArea(BaseBroadcastArea):
@@ -156,27 +160,29 @@ class CustomBroadcastArea(BaseBroadcastArea):
 
     simple_polygons = polygons
 
+    @cached_property
+    def prepared_polygons(self):
+        return PreparedPolygons(self.polygons)
+
     @cached_property
     def overlapping_electoral_wards(self):
-        return [area for area in self.nearby_electoral_wards if area.simple_polygons.intersects(self.polygons)]
+        return [area for area in self.nearby_electoral_wards if self.prepared_polygons.intersects(area.simple_polygons)]
 
     @cached_property
     def nearby_electoral_wards(self):
         if not self.polygons:
             return []
-        return broadcast_area_libraries.get_areas_with_simple_polygons(
-            [
-                # We only index electoral wards in the RTree
-                overlap.data
-                for overlap in rtree_index.query(Rect(*self.simple_polygons.bounds))
-            ]
-        )
+        # We only index electoral wards in the RTree
+        return broadcast_area_libraries.get_areas_with_simple_polygons(rtree_index.query(self.simple_polygons.bounds))
 
     @cached_property
     def count_of_phones(self):
         return sum(
-            area.simple_polygons.ratio_of_intersection_with(self.polygons) * area.count_of_phones
-            for area in self.nearby_electoral_wards
+            ratio * area.count_of_phones
+            for area, ratio in zip(
+                self.nearby_electoral_wards,
+                self.prepared_polygons.ratios_of_intersection(self.nearby_electoral_wards),
+            )
         )
 
 
@@ -235,5 +241,38 @@ class BroadcastAreaLibraries(SerialisedModelCollection, GetItemByIdMixin):
         areas = BroadcastAreasRepository().get_areas_with_simple_polygons(area_ids)
         return [BroadcastArea.from_row_with_simple_polygons(area) for area in areas]
 
+    @staticmethod
+    def prefetch_ancestors(areas):
+        """
+        Loads the ancestors of all `areas` in one query, rather than one
+        query per area
+        """
+        areas = [area for area in areas if isinstance(area, BroadcastArea) and "ancestors" not in area.__dict__]
+
+        if not areas:
+            return
+
+        ancestors = BroadcastAreasRepository().get_ancestors_for_areas([area.id for area in areas])
+
+        for area in areas:
+            area.ancestors = BroadcastArea._ancestors_from_rows(ancestors[area.id])
+
+    @staticmethod
+    def prefetch_sub_areas(areas):
+        """
+        Loads the sub areas of all `areas`, and their sub areas, and so on,
+        with one query per level rather than one query per area
+        """
+        repo = BroadcastAreasRepository()
+        areas = [area for area in areas if isinstance(area, BroadcastArea)]
+
+        while areas := [area for area in areas if "sub_areas" not in area.__dict__]:
+            sub_areas = repo.get_all_areas_for_groups([area.id for area in areas])
+
+            for area in areas:
+                area.sub_areas = [BroadcastArea(row) for row in sub_areas[area.id]]
+
+            areas = [sub_area for area in areas for sub_area in area.sub_areas]
+
 
 broadcast_area_libraries = BroadcastAreaLibraries()
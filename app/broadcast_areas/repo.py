@@ -1,20 +1,373 @@
 import json
+import math
+import mmap
 import os
-import pickle
 import sqlite3
+import struct
+from itertools import accumulate, chain
 from pathlib import Path
 
-rtree_index_path = Path(__file__).parent / "rtree.pickle"
-rtree_index = pickle.loads(rtree_index_path.read_bytes())
+rtree_index_path = Path(__file__).resolve().parent / "broadcast-areas-rtree.bin"
+
+geometry_store_path = Path(__file__).resolve().parent / "broadcast-areas-geometry.bin"
+
+
+def _pack_string(string):
+    encoded = string.encode("utf-8")
+    return struct.pack("<H", len(encoded)) + encoded
+
+
+def _unpack_string(buffer, offset):
+    (length,) = struct.unpack_from("<H", buffer, offset)
+    offset += 2
+    return bytes(buffer[offset : offset + length]).decode("utf-8"), offset + length
+
+
+class GeometryStore:
+    """
+    The polygons for every broadcast area, packed as arrays of floats so they
+    can be read without parsing any JSON. It’s built from the
+    `broadcast_area_polygons` table by `create-broadcast-areas-db.py`.
+
+    The file is memory-mapped read-only, so the operating system keeps one
+    copy of it in memory which is shared by all the app’s processes.
+
+    Layout, all little-endian:
+    - header: magic bytes, offset of the index (uint64), number of areas (uint32)
+    - each geometry: number of polygons (uint32), number of points in each
+      polygon (uint32 each), then every point as a pair of float64s
+    - index: for each area, its id and UTM CRS (each a uint16 length then
+      UTF-8 bytes), then the offsets of its full and simple geometry (uint64s)
+    """
+
+    MAGIC = b"BAGEOM01"
+    HEADER = struct.Struct("<8sQI")
+    OFFSETS = struct.Struct("<QQ")
+
+    def __init__(self, path):
+        self.path = path
+        self._mmap = None
+        self._index = None
+
+    @property
+    def is_built(self):
+        return self._index is not None or self.path.exists()
+
+    @classmethod
+    def write(cls, path, areas):
+        """
+        `areas` is an iterable of `(id, polygons, simple_polygons, utm_crs)`
+        where each of the polygons is a list of lists of coordinate pairs
+        """
+        index = []
+
+        with open(path, "wb") as f:
+            f.write(bytes(cls.HEADER.size))
+
+            for id, polygons, simple_polygons, utm_crs in areas:
+                polygons_offset = f.tell()
+                f.write(cls._pack_geometry(polygons))
+                simple_polygons_offset = f.tell()
+                f.write(cls._pack_geometry(simple_polygons))
+                index.append((id, utm_crs, polygons_offset, simple_polygons_offset))
+
+            index_offset = f.tell()
+
+            for id, utm_crs, polygons_offset, simple_polygons_offset in index:
+                f.write(_pack_string(id))
+                f.write(_pack_string(utm_crs))
+                f.write(cls.OFFSETS.pack(polygons_offset, simple_polygons_offset))
+
+            f.seek(0)
+            f.write(cls.HEADER.pack(cls.MAGIC, index_offset, len(index)))
+
+    @staticmethod
+    def _pack_geometry(polygons):
+        point_counts = [len(polygon) for polygon in polygons]
+        coordinates = [coordinate for polygon in polygons for point in polygon for coordinate in point]
+        return struct.pack(
+            f"<I{len(point_counts)}I{len(coordinates)}d",
+            len(point_counts),
+            *point_counts,
+            *coordinates,
+        )
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            store = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, offset, count = self.HEADER.unpack_from(store, 0)
+
+        if magic != self.MAGIC:
+            raise ValueError(f"{self.path} is not a broadcast areas geometry store")
+
+        index = {}
+
+        for _ in range(count):
+            id, offset = _unpack_string(store, offset)
+            utm_crs, offset = _unpack_string(store, offset)
+            polygons_offset, simple_polygons_offset = self.OFFSETS.unpack_from(store, offset)
+            offset += self.OFFSETS.size
+            index[id] = (polygons_offset, simple_polygons_offset, utm_crs)
+
+        self._mmap, self._index = store, index
+
+    def _unpack_geometry(self, offset):
+        (polygon_count,) = struct.unpack_from("<I", self._mmap, offset)
+        offset += 4
+        point_counts = struct.unpack_from(f"<{polygon_count}I", self._mmap, offset)
+        offset += 4 * polygon_count
+        coordinates = struct.unpack_from(f"<{sum(point_counts) * 2}d", self._mmap, offset)
+        points = iter(coordinates)
+        points = [[x, y] for x, y in zip(points, points)]
+        return [points[start:end] for start, end in zip(accumulate(point_counts, initial=0), accumulate(point_counts))]
+
+    def get_polygons(self, area_id):
+        if self._index is None:
+            self._load()
+        polygons_offset, _, utm_crs = self._index[area_id]
+        return self._unpack_geometry(polygons_offset), utm_crs
+
+    def get_simple_polygons(self, area_id):
+        if self._index is None:
+            self._load()
+        _, simple_polygons_offset, utm_crs = self._index[area_id]
+        return self._unpack_geometry(simple_polygons_offset), utm_crs
+
+
+geometry_store = GeometryStore(geometry_store_path)
+
+
+class PackedRTree:
+    """
+    A static R-tree of the bounding boxes of every electoral ward, used to
+    find which wards might overlap a custom area. It’s built once by
+    `create-broadcast-areas-db.py` using Sort-Tile-Recursive packing, so
+    every node is full and the tree is as shallow as it can be.
+
+    Rather than a tree of Python objects, the nodes are stored level by
+    level in flat arrays, leaves first and the root last. The children of
+    any node are next to each other, so a node only needs to store where
+    they start. The file is memory-mapped read-only and isn’t opened until
+    the first query.
+
+    Layout, all little-endian:
+    - header: magic bytes, node size, number of leaves, number of levels (uint32s)
+    - where each level ends, counting in boxes (uint64 each)
+    - every box as min x, min y, max x, max y (float64s)
+    - for every box, the index of its area ID if it’s a leaf, otherwise
+      the position of its first child (uint32 each)
+    - area IDs (each a uint16 length then UTF-8 bytes)
+    """
+
+    MAGIC = b"BARTRE01"
+    HEADER = struct.Struct("<8sIII")
+    NODE_SIZE = 16
+
+    def __init__(self, path):
+        self.path = path
+        self._level_ends = None
+
+    @classmethod
+    def write(cls, path, areas, node_size=NODE_SIZE):
+        """
+        `areas` is an iterable of `(id, (min_x, min_y, max_x, max_y))`
+        """
+        ids, leaf_boxes = tuple(zip(*areas)) or ((), ())
+
+        levels = [cls._sort_tile_recursive(list(enumerate(leaf_boxes)), node_size)]
+
+        while len(levels[-1]) > 1 or len(levels) == 1:
+            children, offset = levels[-1], sum(len(level) for level in levels[:-1])
+            parents = [
+                (offset + start, cls._bounding_box([box for _, box in children[start : start + node_size]]))
+                for start in range(0, len(children), node_size)
+            ]
+            levels.append(cls._sort_tile_recursive(parents, node_size))
+
+        nodes = list(chain.from_iterable(levels))
+        level_ends = list(accumulate(len(level) for level in levels))
+
+        with open(path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, node_size, len(ids), len(levels)))
+            f.write(struct.pack(f"<{len(level_ends)}Q", *level_ends))
+            f.write(struct.pack(f"<{len(nodes) * 4}d", *chain.from_iterable(box for _, box in nodes)))
+            f.write(struct.pack(f"<{len(nodes)}I", *(pointer for pointer, _ in nodes)))
+            for id in ids:
+                f.write(_pack_string(id))
+
+    @staticmethod
+    def _sort_tile_recursive(boxes, node_size):
+        """
+        Orders `(pointer, box)` pairs so that each run of `node_size` of them
+        is close together: first into vertical slices by x, then by y
+        within each slice
+        """
+        node_count = math.ceil(len(boxes) / node_size)
+        slice_size = node_size * max(1, math.ceil(math.sqrt(node_count)))
+
+        boxes = sorted(boxes, key=lambda item: item[1][0] + item[1][2])
+
+        return [
+            item
+            for start in range(0, len(boxes), slice_size)
+            for item in sorted(boxes[start : start + slice_size], key=lambda item: item[1][1] + item[1][3])
+        ]
+
+    @staticmethod
+    def _bounding_box(boxes):
+        return (
+            min(box[0] for box in boxes),
+            min(box[1] for box in boxes),
+            max(box[2] for box in boxes),
+            max(box[3] for box in boxes),
+        )
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, node_size, leaf_count, level_count = self.HEADER.unpack_from(index, 0)
+
+        if magic != self.MAGIC:
+            raise ValueError(f"{self.path} is not a broadcast areas R-tree")
+
+        offset = self.HEADER.size
+        level_ends = struct.unpack_from(f"<{level_count}Q", index, offset)
+        offset += 8 * level_count
+        node_count = level_ends[-1]
+
+        boxes = memoryview(index)[offset : offset + node_count * 32].cast("d")
+        offset += node_count * 32
+        pointers = memoryview(index)[offset : offset + node_count * 4].cast("I")
+        offset += node_count * 4
+
+        ids = []
+        for _ in range(leaf_count):
+            id, offset = _unpack_string(index, offset)
+            ids.append(id)
+
+        self._mmap, self._boxes, self._pointers, self._ids = index, boxes, pointers, ids
+        self._node_size, self._level_ends = node_size, level_ends
+
+    def query(self, bounds):
+        """
+        Returns the IDs of every area whose bounding box intersects `bounds`,
+        which is `(min_x, min_y, max_x, max_y)`
+        """
+        if self._level_ends is None:
+            self._load()
+
+        min_x, min_y, max_x, max_y = bounds
+        boxes, pointers, node_size, level_ends = self._boxes, self._pointers, self._node_size, self._level_ends
+
+        if not self._ids:
+            return []
+
+        results = []
+        # Each item is the position of a node whose box intersects, and
+        # the level it’s on. We start at the root, which is the last box.
+        stack = [(level_ends[-1] - 1, len(level_ends) - 1)]
+
+        while stack:
+            position, level = stack.pop()
+            first_child = pointers[position]
+            children_end = min(first_child + node_size, level_ends[level - 1])
+
+            for child in range(first_child, children_end):
+                if (
+                    boxes[child * 4] > max_x
+                    or boxes[child * 4 + 1] > max_y
+                    or boxes[child * 4 + 2] < min_x
+                    or boxes[child * 4 + 3] < min_y
+                ):
+                    continue
+                if level == 1:
+                    results.append(self._ids[pointers[child]])
+                else:
+                    stack.append((child, level - 1))
+
+        return results
+
+
+rtree_index = PackedRTree(rtree_index_path)
+
+# One connection per database per process. SQLite connections can’t be
+# shared across a fork, so they’re keyed on the process ID too.
+_read_only_connections = {}
+
+# Whether each database was built with the ancestry, depth and rolled up
+# counts of phones precomputed
+_has_precomputed_hierarchy = {}
 
 
 class BroadcastAreasRepository:
-    def __init__(self):
+    # Negative means KiB rather than pages
+    READ_ONLY_CACHE_SIZE = -32 * 1024
+    READ_ONLY_MMAP_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, *, read_only=True):
+        """
+        The app only ever reads from the database, so by default queries go
+        through a long-lived, read-only connection. `create-broadcast-areas-db.py`
+        needs to write to (and read back from) the database as it builds it,
+        so it passes `read_only=False`.
+        """
         self.database = Path(__file__).resolve().parent / "broadcast-areas.sqlite3"
+        self.read_only = read_only
 
     def conn(self):
         return sqlite3.connect(str(self.database))
 
+    def read_only_conn(self):
+        key = (os.getpid(), self.database)
+
+        if key not in _read_only_connections:
+            # `immutable` tells SQLite the file can’t change underneath it, so
+            # it can skip locking and change detection on every query
+            conn = sqlite3.connect(
+                f"{self.database.as_uri()}?mode=ro&immutable=1",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+            conn.execute(f"PRAGMA cache_size = {self.READ_ONLY_CACHE_SIZE}")
+            conn.execute(f"PRAGMA mmap_size = {self.READ_ONLY_MMAP_SIZE}")
+            _read_only_connections[key] = conn
+
+        return _read_only_connections[key]
+
+    @property
+    def has_precomputed_hierarchy(self):
+        """
+        Databases built before `broadcast_area_ancestors` and the `depth`
+        column were added are still readable, but ancestors are found by
+        walking up the tree and counts of phones are added up at runtime.
+        """
+        if self.read_only and self.database in _has_precomputed_hierarchy:
+            return _has_precomputed_hierarchy[self.database]
+
+        # Not using `query` so this doesn’t count as one of the queries a page makes
+        conn = self.read_only_conn() if self.read_only else self.conn()
+        has_precomputed_hierarchy = bool(
+            conn.execute(
+                """
+            SELECT
+                exists(SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'broadcast_area_ancestors')
+                AND exists(SELECT 1 FROM pragma_table_info('broadcast_areas') WHERE name = 'depth')
+            """
+            ).fetchone()[0]
+        )
+
+        if self.read_only:
+            _has_precomputed_hierarchy[self.database] = has_precomputed_hierarchy
+
+        return has_precomputed_hierarchy
+
+    @property
+    def _depth(self):
+        return "broadcast_areas.depth" if self.has_precomputed_hierarchy else "NULL"
+
     def delete_db(self):
         os.remove(str(self.database))
 
@@ -46,7 +399,10 @@ class BroadcastAreasRepository:
                 name TEXT NOT NULL,
                 broadcast_area_library_id TEXT NOT NULL,
                 broadcast_area_library_group_id TEXT,
+                -- for areas with sub areas this is the sum of their sub areas
                 count_of_phones INTEGER,
+                -- how many ancestors this area has
+                depth INTEGER NOT NULL DEFAULT 0,
 
                 FOREIGN KEY (broadcast_area_library_id)
                     REFERENCES broadcast_area_libraries(id),
@@ -56,6 +412,17 @@ class BroadcastAreasRepository:
             )"""
             )
 
+            conn.execute(
+                """
+            CREATE TABLE broadcast_area_ancestors (
+                area_id TEXT NOT NULL,
+                ancestor_id TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+
+                PRIMARY KEY (area_id, ancestor_id)
+            )"""
+            )
+
             conn.execute(
                 """
             CREATE TABLE broadcast_area_polygons (
@@ -80,12 +447,20 @@ class BroadcastAreasRepository:
             """
             )
 
+            conn.execute(
+                """
+            CREATE INDEX broadcast_area_ancestors_ancestor_id
+            ON broadcast_area_ancestors (ancestor_id);
+            """
+            )
+
     def delete_library_data(self):
         # delete everything except broadcast_area_polygons
         with self.conn() as conn:
             conn.execute("DELETE FROM broadcast_area_libraries;")
             conn.execute("DELETE FROM broadcast_area_library_groups;")
             conn.execute("DELETE FROM broadcast_areas;")
+            conn.execute("DELETE FROM broadcast_area_ancestors;")
 
     def insert_broadcast_area_library(self, id, *, name, name_singular, is_group):
 
@@ -122,7 +497,75 @@ class BroadcastAreasRepository:
                 if not keep_old_features:
                     conn.execute(features_q, (id, json.dumps(polygons), json.dumps(simple_polygons), utm_crs))
 
+    def insert_ancestors(self):
+        """
+        Precomputes every area’s ancestors (and so its depth in the
+        hierarchy), so we don’t need to walk up the tree at runtime
+        """
+        with self.conn() as conn:
+            conn.execute(
+                """
+            INSERT INTO broadcast_area_ancestors (area_id, ancestor_id, depth)
+            WITH RECURSIVE ancestors(area_id, ancestor_id, depth) AS (
+                SELECT id, broadcast_area_library_group_id, 1
+                FROM broadcast_areas
+                WHERE broadcast_area_library_group_id IS NOT NULL
+
+                UNION ALL
+
+                SELECT ancestors.area_id, broadcast_areas.broadcast_area_library_group_id, ancestors.depth + 1
+                FROM ancestors
+                JOIN broadcast_areas ON broadcast_areas.id = ancestors.ancestor_id
+                WHERE broadcast_areas.broadcast_area_library_group_id IS NOT NULL
+            )
+            SELECT area_id, ancestor_id, depth FROM ancestors
+            """
+            )
+            conn.execute(
+                """
+            UPDATE broadcast_areas
+            SET depth = (
+                SELECT count(*)
+                FROM broadcast_area_ancestors
+                WHERE broadcast_area_ancestors.area_id = broadcast_areas.id
+            )
+            """
+            )
+
+    def get_all_areas_with_groups(self):
+        # Ordered the same as `get_all_areas_for_group`, so that adding
+        # up sub areas gives exactly the same floats either way
+        q = """
+        SELECT id, broadcast_area_library_group_id, count_of_phones
+        FROM broadcast_areas
+        ORDER BY rowid
+        """
+
+        results = self.query(q)
+
+        return [(row[0], row[1], row[2]) for row in results]
+
+    def update_counts_of_phones(self, counts_of_phones):
+        with self.conn() as conn:
+            conn.executemany(
+                "UPDATE broadcast_areas SET count_of_phones = ? WHERE id = ?",
+                ((count_of_phones, id) for id, count_of_phones in counts_of_phones.items()),
+            )
+
+    def build_geometry_store(self):
+        results = self.query("SELECT id, polygons, simple_polygons, utm_crs FROM broadcast_area_polygons ORDER BY id")
+        GeometryStore.write(
+            geometry_store_path,
+            (
+                (id, json.loads(polygons), json.loads(simple_polygons), utm_crs)
+                for id, polygons, simple_polygons, utm_crs in results
+            ),
+        )
+
     def query(self, sql, *args):
+        if self.read_only:
+            return self.read_only_conn().execute(sql, (*args,)).fetchall()
+
         with self.conn() as conn:
             cursor = conn.cursor()
             cursor.execute(sql, (*args,))
@@ -136,30 +579,34 @@ class BroadcastAreasRepository:
 
     def get_areas(self, area_ids):
         q = f"""
-        SELECT id, name, count_of_phones, broadcast_area_library_id
+        SELECT id, name, count_of_phones, broadcast_area_library_id, {self._depth}
         FROM broadcast_areas
         WHERE id IN ({','.join('?' * len(area_ids))})
         """
 
         results = self.query(q, *area_ids)
 
-        areas = [(row[0], row[1], row[2], row[3]) for row in results]
+        areas = [(row[0], row[1], row[2], row[3], row[4]) for row in results]
 
         return areas
 
     def get_areas_with_simple_polygons(self, area_ids):
+        if geometry_store.is_built:
+            return [(*area, *geometry_store.get_simple_polygons(area[0])) for area in self.get_areas(area_ids)]
+
         q = """
-        SELECT broadcast_areas.id, name, count_of_phones, broadcast_area_library_id, simple_polygons, utm_crs
+        SELECT broadcast_areas.id, name, count_of_phones, broadcast_area_library_id, {}, simple_polygons, utm_crs
         FROM broadcast_areas
         JOIN broadcast_area_polygons on broadcast_area_polygons.id = broadcast_areas.id
         WHERE broadcast_areas.id IN ({})
         """.format(
-            ",".join("?" * len(area_ids))
+            self._depth,
+            ",".join("?" * len(area_ids)),
         )
 
         results = self.query(q, *area_ids)
 
-        areas = [(row[0], row[1], row[2], row[3], json.loads(row[4]), row[5]) for row in results]
+        areas = [(row[0], row[1], row[2], row[3], row[4], json.loads(row[5]), row[6]) for row in results]
 
         return areas
 
@@ -176,10 +623,20 @@ class BroadcastAreasRepository:
             library_id,
         )[0][0]
 
-        if is_multi_tier_library:
+        if is_multi_tier_library and self.has_precomputed_hierarchy:
             # only interested in areas with children - eg local authorities, counties, unitary authorities. not wards.
             q = """
-            SELECT id, name, count_of_phones, broadcast_area_library_id
+            SELECT id, name, count_of_phones, broadcast_area_library_id, depth
+            FROM broadcast_areas
+            WHERE broadcast_area_library_id = ? AND exists(
+                SELECT 1
+                FROM broadcast_area_ancestors
+                WHERE ancestor_id = broadcast_areas.id
+            )
+            """
+        elif is_multi_tier_library:
+            q = """
+            SELECT id, name, count_of_phones, broadcast_area_library_id, NULL
             FROM broadcast_areas
             JOIN (
                 SELECT DISTINCT broadcast_area_library_group_id
@@ -190,48 +647,123 @@ class BroadcastAreasRepository:
             """
         else:
             # Countries don't have any children, so the above query wouldn't return anything.
-            q = """
-            SELECT id, name, count_of_phones, broadcast_area_library_id
+            q = f"""
+            SELECT id, name, count_of_phones, broadcast_area_library_id, {self._depth}
             FROM broadcast_areas
             WHERE broadcast_area_library_id = ?
             """
 
         results = self.query(q, library_id)
 
-        return [(row[0], row[1], row[2], row[3]) for row in results]
+        return [(row[0], row[1], row[2], row[3], row[4]) for row in results]
 
     def get_all_areas_for_group(self, group_id):
-        q = """
-        SELECT id, name, count_of_phones, broadcast_area_library_id
+        q = f"""
+        SELECT id, name, count_of_phones, broadcast_area_library_id, {self._depth}
         FROM broadcast_areas
         WHERE broadcast_area_library_group_id = ?
         """
 
         results = self.query(q, group_id)
 
-        areas = [(row[0], row[1], row[2], row[3]) for row in results]
+        areas = [(row[0], row[1], row[2], row[3], row[4]) for row in results]
 
         return areas
 
     def get_parent_for_area(self, area_id):
-        q = """
-        SELECT id, name, count_of_phones, broadcast_area_library_id
-        FROM broadcast_areas
-        WHERE id IN (
-            SELECT broadcast_area_library_group_id
+        if self.has_precomputed_hierarchy:
+            q = """
+            SELECT id, name, count_of_phones, broadcast_area_library_id, broadcast_areas.depth
+            FROM broadcast_area_ancestors
+            JOIN broadcast_areas ON broadcast_areas.id = broadcast_area_ancestors.ancestor_id
+            WHERE area_id = ? AND broadcast_area_ancestors.depth = 1
+            """
+        else:
+            q = """
+            SELECT id, name, count_of_phones, broadcast_area_library_id, NULL
             FROM broadcast_areas
-            WHERE id = ?
-        )
-        """
+            WHERE id IN (
+                SELECT broadcast_area_library_group_id
+                FROM broadcast_areas
+                WHERE id = ?
+            )
+            """
 
         results = self.query(q, area_id)
 
         if not results:
             return None
 
-        return (results[0][0], results[0][1], results[0][2], results[0][3])
+        return (results[0][0], results[0][1], results[0][2], results[0][3], results[0][4])
+
+    def get_all_areas_for_groups(self, group_ids):
+        q = """
+        SELECT broadcast_area_library_group_id, id, name, count_of_phones, broadcast_area_library_id, {}
+        FROM broadcast_areas
+        WHERE broadcast_area_library_group_id IN ({})
+        """.format(
+            self._depth,
+            ",".join("?" * len(group_ids)),
+        )
+
+        results = self.query(q, *group_ids)
+
+        areas = {group_id: [] for group_id in group_ids}
+
+        for row in results:
+            areas[row[0]].append((row[1], row[2], row[3], row[4], row[5]))
+
+        return areas
+
+    def get_ancestors_for_areas(self, area_ids):
+        """
+        Returns a dictionary of each area ID to a list of its ancestors,
+        nearest first
+        """
+        if self.has_precomputed_hierarchy:
+            q = """
+            SELECT area_id, id, name, count_of_phones, broadcast_area_library_id, broadcast_areas.depth
+            FROM broadcast_area_ancestors
+            JOIN broadcast_areas ON broadcast_areas.id = broadcast_area_ancestors.ancestor_id
+            WHERE area_id IN ({})
+            ORDER BY area_id, broadcast_area_ancestors.depth
+            """
+        else:
+            # Walk up the tree in a single query however deep it goes
+            q = """
+            WITH RECURSIVE ancestors(area_id, ancestor_id, depth) AS (
+                SELECT id, broadcast_area_library_group_id, 1
+                FROM broadcast_areas
+                WHERE id IN ({}) AND broadcast_area_library_group_id IS NOT NULL
+
+                UNION ALL
+
+                SELECT ancestors.area_id, broadcast_areas.broadcast_area_library_group_id, ancestors.depth + 1
+                FROM ancestors
+                JOIN broadcast_areas ON broadcast_areas.id = ancestors.ancestor_id
+                WHERE broadcast_areas.broadcast_area_library_group_id IS NOT NULL
+            )
+            SELECT ancestors.area_id, id, name, count_of_phones, broadcast_area_library_id, NULL
+            FROM ancestors
+            JOIN broadcast_areas ON broadcast_areas.id = ancestors.ancestor_id
+            ORDER BY ancestors.area_id, ancestors.depth
+            """
+
+        q = q.format(",".join("?" * len(area_ids)))
+
+        results = self.query(q, *area_ids)
+
+        ancestors = {area_id: [] for area_id in area_ids}
+
+        for row in results:
+            ancestors[row[0]].append((row[1], row[2], row[3], row[4], row[5]))
+
+        return ancestors
 
     def get_polygons_for_area(self, area_id):
+        if geometry_store.is_built:
+            return geometry_store.get_polygons(area_id)
+
         q = """
         SELECT polygons, utm_crs
         FROM broadcast_area_polygons
@@ -243,6 +775,9 @@ class BroadcastAreasRepository:
         return json.loads(results[0][0]), results[0][1]
 
     def get_simple_polygons_for_area(self, area_id):
+        if geometry_store.is_built:
+            return geometry_store.get_simple_polygons(area_id)
+
         q = """
         SELECT simple_polygons, utm_crs
         FROM broadcast_area_polygons
@@ -88,3 +88,15 @@ def save_app_routes(acknowledge_removed_routes: bool) -> int:
         outfile.write(json.dumps(sorted_current_routes, indent=4) + "\n")
 
     return len(sorted_current_routes)
+
+
+@notify_command(name="precompile-templates")
+def precompile_templates_command():
+    """
+    Compiles every template into the bytecode cache, so workers started
+    afterwards don’t have to.
+    """
+    from app import precompile_jinja_templates
+
+    count, seconds = precompile_jinja_templates(current_app)
+    click.echo(f"Compiled {count} templates in {seconds:.2f}s")
@@ -83,8 +83,48 @@ class Config:
     REDIS_URL = os.environ.get("REDIS_URL")
     REDIS_ENABLED = False if os.environ.get("REDIS_ENABLED") == "0" else True
 
+    # Outbound HTTP connection pooling, shared by the API clients and template preview calls
+    HTTP_POOL_CONNECTIONS = 10  # number of different hosts to keep a pool of connections for
+    HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 50))  # connections kept alive per host
+    HTTP_TCP_KEEPALIVE = True
+    HTTP_CONNECT_TIMEOUT = 5
+    HTTP_READ_TIMEOUT = 120
+    API_READ_TIMEOUT = 30
+
+    # How long to keep the outcome of validating an uploaded spreadsheet, and how many uploads to keep, per process
+    RECIPIENT_CSV_CACHE_TTL_IN_SECONDS = 120
+    RECIPIENT_CSV_CACHE_MAX_SIZE = 8
+
+    # How long to keep the index of a job’s original upload for exporting its notifications, and how many jobs to keep
+    JOB_UPLOAD_CACHE_TTL_IN_SECONDS = 600
+    JOB_UPLOAD_CACHE_MAX_SIZE = 4
+
+    # How long to keep an uploaded letter split into pages for previewing, and how many letters to keep, per process
+    LETTER_UPLOAD_CACHE_TTL_IN_SECONDS = 300
+    LETTER_UPLOAD_CACHE_MAX_SIZE = 8
+
+    # How long to keep the current user and service in memory in front of Redis, and how many to keep, per process
+    IN_PROCESS_CACHE_TTL_IN_SECONDS = 5
+    IN_PROCESS_CACHE_MAX_SIZE = 1000
+
+    # How long to share the rendered partials for auto-updating pages between a user’s open tabs
+    JSON_UPDATES_CACHE_TTL_IN_SECONDS = 5
+
+    # How long to keep rendered letter previews in Redis, and the biggest preview worth keeping
+    LETTER_PREVIEW_CACHE_TTL_IN_SECONDS = 60 * 60 * 24
+    LETTER_PREVIEW_CACHE_MAX_ITEM_SIZE_IN_BYTES = 1024 * 1024
+
+    # Keep compiled Jinja templates on disk, so every worker on an instance (and every restart) can share them
+    USE_JINJA_BYTECODE_CACHE = True
+    # Where to keep them – if not set, Jinja uses a directory in the temp directory that only this user can use
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get("JINJA_BYTECODE_CACHE_DIR")
+    # Compile every template when a worker starts, rather than when a request first needs it
+    PRECOMPILE_JINJA_TEMPLATES = True
+
     ASSET_DOMAIN = ""
     ASSET_PATH = "/static/"
+    # Fail, rather than hash assets at runtime, if the frontend build didn’t write a manifest of their hashes
+    ASSET_MANIFEST_REQUIRED = os.environ.get("ASSET_MANIFEST_REQUIRED") == "1"
 
     # as defined in api db migration 0331_add_broadcast_org.py
     BROADCAST_ORGANISATION_ID = "38e4bf69-93b0-445d-acee-53ea53fe02df"
@@ -138,6 +178,9 @@ class Development(Config):
     REDIS_ENABLED = os.environ.get("REDIS_ENABLED") == "1"
     NOTIFY_RUNTIME_PLATFORM = "local"
 
+    USE_JINJA_BYTECODE_CACHE = False
+    PRECOMPILE_JINJA_TEMPLATES = False
+
 
 class Test(Development):
     DEBUG = True
@@ -158,6 +201,13 @@ class Test(Development):
     ANTIVIRUS_API_KEY = "test-antivirus-secret"
     ANTIVIRUS_ENABLED = True
 
+    RECIPIENT_CSV_CACHE_TTL_IN_SECONDS = 0
+    JOB_UPLOAD_CACHE_TTL_IN_SECONDS = 0
+    LETTER_UPLOAD_CACHE_TTL_IN_SECONDS = 0
+    IN_PROCESS_CACHE_TTL_IN_SECONDS = 0
+    JSON_UPDATES_CACHE_TTL_IN_SECONDS = 0
+    LETTER_PREVIEW_CACHE_TTL_IN_SECONDS = 0
+
     ASSET_DOMAIN = "static.example.com"
     ASSET_PATH = "https://static.example.com/"
 
@@ -2,6 +2,21 @@ from notifications_utils.clients.antivirus.antivirus_client import AntivirusClie
 from notifications_utils.clients.redis.redis_client import RedisClient
 from notifications_utils.clients.zendesk.zendesk_client import ZendeskClient
 
+from app.http_session import PooledHTTPSession
+from app.in_process_cache import InProcessCache
+from app.ttl_memory_cache import TTLMemoryCache
+
 antivirus_client = AntivirusClient()
 zendesk_client = ZendeskClient()
 redis_client = RedisClient()
+http_session = PooledHTTPSession()
+# The outcome of validating an upload, so checking it and clicking through
+# the previews of its rows doesn’t download and validate it every time
+recipient_csv_cache = TTLMemoryCache(config_prefix="RECIPIENT_CSV_CACHE")
+# Where each row of a job’s original upload starts, so exporting the job’s
+# notifications doesn’t download and parse the file every time
+job_upload_cache = TTLMemoryCache(config_prefix="JOB_UPLOAD_CACHE")
+# Uploaded letters and attachments split into a PDF for each page, so
+# previewing every page of one doesn’t download and split it every time
+letter_upload_cache = TTLMemoryCache(config_prefix="LETTER_UPLOAD_CACHE")
+in_process_cache = InProcessCache(redis_client)
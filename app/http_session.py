@@ -0,0 +1,78 @@
+import socket
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from gds_metrics.metrics import Counter
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+HTTP_CLIENT_CONNECTIONS_TOTAL = Counter(
+    "http_client_connections_total",
+    "Outbound HTTP requests, by whether they opened a new connection or reused a pooled one",
+    ["host", "connection"],
+)
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    def __init__(self, *args, tcp_keepalive=True, **kwargs):
+        self.socket_options = HTTPConnection.default_socket_options + (
+            [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)] if tcp_keepalive else []
+        )
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        pool = self.get_connection(request.url, kwargs.get("proxies"))
+        connections_before = pool.num_connections
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            # With concurrent requests to the same host this is approximate, but
+            # it’s good enough to see whether connections are being reused
+            HTTP_CLIENT_CONNECTIONS_TOTAL.labels(
+                host=pool.host,
+                connection="new" if pool.num_connections > connections_before else "reused",
+            ).inc()
+
+
+class PooledHTTPSession:
+    """
+    A single `requests.Session` per worker, shared by everything that talks
+    to the API or template preview, so that connections (and their TLS
+    handshakes) get reused between requests instead of opened every time.
+
+    The session is shared between every user’s requests, so it never keeps
+    cookies.
+    """
+
+    def __init__(self):
+        # Make sure to call `init_app` to configure the session properly.
+        self.session = None
+        self.timeout = None
+
+    def init_app(self, application):
+        self.timeout = (application.config["HTTP_CONNECT_TIMEOUT"], application.config["HTTP_READ_TIMEOUT"])
+
+        adapter = _CountingHTTPAdapter(
+            pool_connections=application.config["HTTP_POOL_CONNECTIONS"],
+            pool_maxsize=application.config["HTTP_POOL_MAXSIZE"],
+            tcp_keepalive=application.config["HTTP_TCP_KEEPALIVE"],
+        )
+
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
@@ -0,0 +1,146 @@
+import copy
+import json
+import time
+from fnmatch import fnmatchcase
+from threading import Lock
+
+from cachetools import TTLCache
+
+
+class InProcessCache:
+    """
+    Keeps the API responses which almost every request needs (the current
+    user and the current service) in memory for a few seconds, in front of
+    Redis, so that most requests don’t need a round trip to Redis for them.
+
+    When a response is removed from Redis each process is told to forget it
+    too, using Redis pub/sub. If the subscription fails a process can show
+    something out of date, but only until its TTL runs out, which is why it’s
+    kept short.
+
+    The size and TTL come from `IN_PROCESS_CACHE_MAX_SIZE` and
+    `IN_PROCESS_CACHE_TTL_IN_SECONDS`.
+    """
+
+    INVALIDATION_CHANNEL = "notify-admin-in-process-cache-invalidation"
+
+    def __init__(self, redis_client):
+        # Make sure to call `init_app` (after the Redis client’s) to turn the cache on.
+        self.redis_client = redis_client
+        self.cache = None
+        self.lock = Lock()
+        # Goes up every time something is forgotten, so a response fetched
+        # before then isn’t cached after it
+        self.generation = 0
+        self.logger = None
+        self.subscriber = None
+
+    def init_app(self, application):
+        self.logger = application.logger
+
+        if self.subscriber:
+            self.subscriber.stop()
+            self.subscriber = None
+
+        self.cache = None
+
+        if not application.config["IN_PROCESS_CACHE_TTL_IN_SECONDS"]:
+            return
+
+        if not self.redis_client.active:
+            # Without Redis there’s no way to hear about changes made by other processes
+            return
+
+        self.cache = TTLCache(
+            maxsize=application.config["IN_PROCESS_CACHE_MAX_SIZE"],
+            ttl=application.config["IN_PROCESS_CACHE_TTL_IN_SECONDS"],
+        )
+
+        try:
+            pubsub = self.redis_client.redis_store.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.INVALIDATION_CHANNEL: self._handle_invalidation})
+            self.subscriber = pubsub.run_in_thread(
+                sleep_time=1, daemon=True, exception_handler=self._handle_subscriber_error
+            )
+        except Exception:
+            self.logger.exception("Couldn’t subscribe to %s, not caching in process", self.INVALIDATION_CHANNEL)
+            self.cache = None
+
+    @property
+    def enabled(self):
+        return self.cache is not None
+
+    def get_or_call(self, key, fn, *args, **kwargs):
+        """
+        Returns a copy of what was cached for `key`, otherwise calls `fn` and
+        caches what it returns. The second value returned is whether it came
+        from the cache.
+        """
+        if self.cache is None:
+            return fn(*args, **kwargs), False
+
+        with self.lock:
+            cached = self.cache.get(key)
+            generation = self.generation
+
+        if cached is not None:
+            # Callers are free to modify what they get back, so don’t let them modify our copy
+            return copy.deepcopy(cached), True
+
+        response = fn(*args, **kwargs)
+
+        with self.lock:
+            if self.generation == generation:
+                self.cache[key] = response
+
+        return copy.deepcopy(response), False
+
+    def evict(self, keys=(), patterns=()):
+        """
+        Forgets `keys`, and any keys matching Redis-style glob `patterns`, in
+        this process and tells every other process to do the same
+        """
+        if self.cache is None or not (keys or patterns):
+            return
+
+        self._evict_locally(keys, patterns)
+
+        try:
+            self.redis_client.redis_store.publish(
+                self.INVALIDATION_CHANNEL, json.dumps({"keys": list(keys), "patterns": list(patterns)})
+            )
+        except Exception:
+            self.logger.exception("Couldn’t publish in process cache invalidation for %s %s", keys, patterns)
+
+    def clear(self):
+        if self.cache is None:
+            return
+
+        with self.lock:
+            self.cache.clear()
+            self.generation += 1
+
+    def _evict_locally(self, keys, patterns):
+        with self.lock:
+            for key in keys:
+                self.cache.pop(key, None)
+            for pattern in patterns:
+                for key in [key for key in self.cache if fnmatchcase(key, pattern)]:
+                    self.cache.pop(key, None)
+            self.generation += 1
+
+    def _handle_invalidation(self, message):
+        try:
+            invalidation = json.loads(message["data"])
+        except ValueError:
+            self.logger.warning("Ignoring malformed in process cache invalidation %r", message["data"])
+            return
+
+        self._evict_locally(invalidation.get("keys", ()), invalidation.get("patterns", ()))
+
+    def _handle_subscriber_error(self, exception, pubsub, thread):
+        # We might have missed some invalidations while the connection was down
+        self.logger.warning("Error listening for in process cache invalidations: %s", exception)
+        self.clear()
+        # Don’t spin while Redis is unavailable, the next `get_message` reconnects and resubscribes
+        time.sleep(1)
@@ -12,19 +12,29 @@ from wtforms import ValidationError
 from wtforms.validators import DataRequired, StopValidation
 
 from app import antivirus_client
-from app.main._commonly_used_passwords import commonly_used_passwords
+from app.main._commonly_used_passwords import (
+    get_commonly_used_passwords,
+    normalise_password,
+)
 from app.models.spreadsheet import Spreadsheet
 from app.utils.user import is_gov_user
 
 
 class CommonlyUsedPassword:
-    def __init__(self, message=None):
+    def __init__(self, message=None, normalise=False):
         if not message:
             message = "Password is in list of commonly used passwords."
         self.message = message
+        # Whether to ignore case and common letter-for-number substitutions
+        self.normalise = normalise
 
     def __call__(self, form, field):
-        if field.data in commonly_used_passwords:
+        if not field.data:
+            return
+
+        password = normalise_password(field.data) if self.normalise else field.data
+
+        if password in get_commonly_used_passwords(normalised=self.normalise):
             raise ValidationError(self.message)
 
 
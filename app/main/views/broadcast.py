@@ -12,6 +12,7 @@ from app.main.forms import (
 )
 from app.models.broadcast_message import BroadcastMessage, BroadcastMessages
 from app.utils import service_has_permission
+from app.utils.json_updates import cache_json_updates, get_poll_interval
 from app.utils.user import user_has_permissions
 
 
@@ -86,8 +87,20 @@ def broadcast_dashboard_rejected(service_id):
 @json_updates.route("/services/<uuid:service_id>/broadcast-dashboard.json")
 @user_has_permissions()
 @service_has_permission("broadcast")
+@cache_json_updates
 def broadcast_dashboard_updates(service_id):
-    return jsonify(get_broadcast_dashboard_partials(current_service.id))
+    # Already fetched for the partials, so this doesn’t go to the API again
+    broadcast_messages = BroadcastMessages(current_service.id)
+
+    return jsonify(
+        **get_broadcast_dashboard_partials(current_service.id),
+        poll_interval=get_poll_interval(
+            max(
+                filter(None, (message.updated_at or message.created_at for message in broadcast_messages)), default=None
+            ),
+            active=bool(broadcast_messages.with_status("pending-approval", "broadcasting")),
+        ),
+    )
 
 
 def get_broadcast_dashboard_partials(service_id):
@@ -286,6 +299,7 @@ def choose_broadcast_sub_area(service_id, broadcast_message_id, library_slug, ar
         service_id=current_service.id,
     )
     area = BroadcastMessage.libraries.get_areas([area_slug])[0]
+    BroadcastMessage.libraries.prefetch_sub_areas([area])
 
     back_link = _get_broadcast_sub_area_back_link(service_id, broadcast_message_id, library_slug)
 
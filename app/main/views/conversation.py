@@ -8,6 +8,7 @@ from app import current_service, notification_api_client, service_api_client
 from app.main import json_updates, main
 from app.main.forms import SearchByNameForm
 from app.models.template_list import UserTemplateList
+from app.utils.json_updates import cache_json_updates, get_poll_interval
 from app.utils.user import user_has_permissions
 
 
@@ -20,7 +21,7 @@ def conversation(service_id, notification_id):
     return render_template(
         "views/conversations/conversation.html",
         user_number=user_number,
-        partials=get_conversation_partials(service_id, user_number),
+        partials=get_conversation_partials(service_id, user_number)[0],
         updates_url=url_for(
             "json_updates.conversation_updates", service_id=service_id, notification_id=notification_id
         ),
@@ -30,9 +31,12 @@ def conversation(service_id, notification_id):
 
 @json_updates.route("/services/<uuid:service_id>/conversation/<uuid:notification_id>.json")
 @user_has_permissions("view_activity")
+@cache_json_updates
 def conversation_updates(service_id, notification_id):
+    user_number = get_user_number(service_id, notification_id)
+    partials, last_changed = get_conversation_partials(service_id, user_number)
 
-    return jsonify(get_conversation_partials(service_id, get_user_number(service_id, notification_id)))
+    return jsonify(**partials, poll_interval=get_poll_interval(last_changed))
 
 
 @main.route("/services/<uuid:service_id>/conversation/<uuid:notification_id>/reply-with")
@@ -77,13 +81,21 @@ def conversation_reply_with_template(
 
 
 def get_conversation_partials(service_id, user_number):
-
-    return {
-        "messages": render_template(
-            "views/conversations/messages.html",
-            conversation=get_sms_thread(service_id, user_number),
-        )
-    }
+    """
+    Returns the partials, and when the most recent message in the
+    conversation was sent or received
+    """
+    conversation = list(get_sms_thread(service_id, user_number))
+
+    return (
+        {
+            "messages": render_template(
+                "views/conversations/messages.html",
+                conversation=conversation,
+            )
+        },
+        conversation[-1]["created_at"] if conversation else None,
+    )
 
 
 def get_user_number(service_id, notification_id):
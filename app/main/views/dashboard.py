@@ -16,14 +16,17 @@ from app import (
 )
 from app.formatters import format_date_numeric, format_datetime_numeric
 from app.main import json_updates, main
+from app.models.spreadsheet import Spreadsheet
 from app.statistics_utils import get_formatted_percentage
 from app.utils import (
     DELIVERED_STATUSES,
     FAILURE_STATUSES,
     REQUESTED_STATUSES,
+    SENDING_STATUSES,
     service_has_permission,
 )
-from app.utils.csv import Spreadsheet
+from app.utils.concurrency import run_concurrently
+from app.utils.json_updates import cache_json_updates, get_poll_interval
 from app.utils.pagination import generate_next_dict, generate_previous_dict
 from app.utils.time import get_current_financial_year
 from app.utils.user import user_has_permissions
@@ -58,8 +61,21 @@ def service_dashboard(service_id):
 
 @json_updates.route("/services/<uuid:service_id>/dashboard.json")
 @user_has_permissions("view_activity")
+@cache_json_updates
 def service_dashboard_updates(service_id):
-    return jsonify(**get_dashboard_partials(service_id))
+    partials = get_dashboard_partials(service_id)
+    # Already fetched for the partials, so these don’t go to the API again
+    statistics = template_statistics_client.get_template_statistics_for_service(service_id, limit_days=7)
+    inbound_sms_summary = current_service.inbound_sms_summary or {}
+
+    return jsonify(
+        **partials,
+        poll_interval=get_poll_interval(
+            inbound_sms_summary.get("most_recent"),
+            # Letters can wait days to be sent, so only texts and emails count
+            active=any(stat["template_type"] != "letter" and stat["status"] in SENDING_STATUSES for stat in statistics),
+        ),
+    )
 
 
 @main.route("/services/<uuid:service_id>/template-activity")
@@ -118,9 +134,11 @@ def template_usage(service_id):
 def usage(service_id):
     year, current_financial_year = requested_and_current_financial_year(request)
 
-    free_sms_allowance = billing_api_client.get_free_sms_fragment_limit_for_year(service_id, year)
-    units = billing_api_client.get_monthly_usage_for_service(service_id, year)
-    yearly_usage = billing_api_client.get_annual_usage_for_service(service_id, year)
+    free_sms_allowance, units, yearly_usage = run_concurrently(
+        partial(billing_api_client.get_free_sms_fragment_limit_for_year, service_id, year),
+        partial(billing_api_client.get_monthly_usage_for_service, service_id, year),
+        partial(billing_api_client.get_annual_usage_for_service, service_id, year),
+    )
 
     return render_template(
         "views/usage.html",
@@ -168,9 +186,18 @@ def inbox(service_id):
 @json_updates.route("/services/<uuid:service_id>/inbox.json")
 @user_has_permissions("view_activity")
 @service_has_permission("inbound_sms")
+@cache_json_updates
 def inbox_updates(service_id):
-
-    return jsonify(get_inbox_partials(service_id))
+    partials = get_inbox_partials(service_id)
+    # Already fetched for the partials, so this doesn’t go to the API again
+    inbound_messages = service_api_client.get_most_recent_inbound_sms(
+        service_id, page=int(request.args.get("page", 1))
+    )["data"]
+
+    return jsonify(
+        **partials,
+        poll_interval=get_poll_interval(max((message["created_at"] for message in inbound_messages), default=None)),
+    )
 
 
 @main.route("/services/<uuid:service_id>/inbox.csv")
@@ -270,19 +297,23 @@ def aggregate_notifications_stats(template_statistics):
 
 
 def get_dashboard_partials(service_id):
-    all_statistics = template_statistics_client.get_template_statistics_for_service(service_id, limit_days=7)
+    all_statistics, free_sms_allowance, yearly_usage = run_concurrently(
+        partial(template_statistics_client.get_template_statistics_for_service, service_id, limit_days=7),
+        partial(
+            billing_api_client.get_free_sms_fragment_limit_for_year,
+            current_service.id,
+            get_current_financial_year(),
+        ),
+        partial(
+            billing_api_client.get_annual_usage_for_service,
+            service_id,
+            get_current_financial_year(),
+        ),
+    )
     template_statistics = aggregate_template_usage(all_statistics)
     stats = aggregate_notifications_stats(all_statistics)
 
     dashboard_totals = (get_dashboard_totals(stats),)
-    free_sms_allowance = billing_api_client.get_free_sms_fragment_limit_for_year(
-        current_service.id,
-        get_current_financial_year(),
-    )
-    yearly_usage = billing_api_client.get_annual_usage_for_service(
-        service_id,
-        get_current_financial_year(),
-    )
     return {
         "upcoming": render_template(
             "views/dashboard/_upcoming.html",
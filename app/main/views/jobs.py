@@ -33,7 +33,9 @@ from app.main import json_updates, main
 from app.main.forms import SearchNotificationsForm
 from app.models.job import Job
 from app.utils import parse_filter_args, set_status_filters
+from app.utils.concurrency import run_concurrently
 from app.utils.csv import generate_notifications_csv
+from app.utils.json_updates import cache_json_updates, get_poll_interval
 from app.utils.letters import get_letter_printing_statement, printing_today_or_tomorrow
 from app.utils.pagination import (
     generate_next_dict,
@@ -145,11 +147,15 @@ def cancel_letter_job(service_id, job_id):
 
 @json_updates.route("/services/<uuid:service_id>/jobs/<uuid:job_id>.json")
 @user_has_permissions()
+@cache_json_updates
 def view_job_updates(service_id, job_id):
 
     job = Job.from_id(job_id, service_id=service_id)
 
-    return jsonify(**get_job_partials(job))
+    return jsonify(
+        **get_job_partials(job),
+        poll_interval=get_poll_interval(job.processing_started or job.created_at, active=job.still_processing),
+    )
 
 
 @main.route("/services/<uuid:service_id>/notifications", methods=["GET", "POST"])
@@ -337,7 +343,10 @@ def _get_job_counts(job):
 def get_job_partials(job):
     filter_args = parse_filter_args(request.args)
     filter_args["status"] = set_status_filters(filter_args)
-    notifications = job.get_notifications(status=filter_args["status"])
+    notifications, service_data_retention_days = run_concurrently(
+        partial(job.get_notifications, status=filter_args["status"]),
+        partial(current_service.get_days_of_retention, job.template_type),
+    )
     if job.template_type == "letter":
         counts = render_template(
             "partials/jobs/count-letters.html",
@@ -350,7 +359,6 @@ def get_job_partials(job):
             status=filter_args["status"],
             notifications_deleted=(job.status == "finished" and not notifications["notifications"]),
         )
-    service_data_retention_days = current_service.get_days_of_retention(job.template_type)
 
     return {
         "counts": counts,
@@ -36,9 +36,9 @@ from app.main.views.dashboard import (
     requested_and_current_financial_year,
 )
 from app.models.organisation import AllOrganisations, Organisation
+from app.models.spreadsheet import Spreadsheet
 from app.models.user import InvitedOrgUser
 from app.s3_client.s3_mou_client import get_mou
-from app.utils.csv import Spreadsheet
 from app.utils.user import user_has_permissions, user_is_platform_admin
 from app.utils.user_permissions import organisation_user_permission_options
 
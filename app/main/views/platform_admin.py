@@ -19,7 +19,7 @@ from app import (
     service_api_client,
     user_api_client,
 )
-from app.extensions import redis_client
+from app.extensions import in_process_cache, redis_client
 from app.main import main
 from app.main.forms import (
     AdminClearCacheForm,
@@ -29,12 +29,12 @@ from app.main.forms import (
     PlatformAdminSearchForm,
     RequiredDateFilterForm,
 )
+from app.models.spreadsheet import Spreadsheet
 from app.notify_client.platform_admin_api_client import admin_api_client
 from app.statistics_utils import (
     get_formatted_percentage,
     get_formatted_percentage_two_dp,
 )
-from app.utils.csv import Spreadsheet
 from app.utils.pagination import (
     generate_next_dict,
     generate_previous_dict,
@@ -674,6 +674,7 @@ def clear_cache():
         patterns = list(itertools.chain(*groups))
 
         num_deleted = sum(redis_client.delete_by_pattern(pattern) for pattern in patterns)
+        in_process_cache.evict(patterns=patterns)
 
         msg = f"Removed {num_deleted} objects across {len(patterns)} key formats " f'for {", ".join(group_keys)}'
 
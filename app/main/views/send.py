@@ -1,4 +1,5 @@
 import itertools
+from functools import partial
 from string import ascii_uppercase
 from zipfile import BadZipFile
 
@@ -29,6 +30,7 @@ from app import (
     notification_api_client,
     service_api_client,
 )
+from app.extensions import recipient_csv_cache
 from app.main import main, no_cookie
 from app.main.forms import (
     ChooseTimeForm,
@@ -38,6 +40,7 @@ from app.main.forms import (
     get_placeholder_form_instance,
 )
 from app.models.contact_list import ContactList, ContactListsAlphabetical
+from app.models.spreadsheet import Spreadsheet
 from app.models.user import Users
 from app.s3_client.s3_csv_client import (
     get_csv_metadata,
@@ -47,7 +50,8 @@ from app.s3_client.s3_csv_client import (
 )
 from app.template_previews import TemplatePreview
 from app.utils import PermanentRedirect, should_skip_template_page, unicode_truncate
-from app.utils.csv import Spreadsheet, get_errors_for_csv
+from app.utils.concurrency import run_concurrently
+from app.utils.csv import RecipientCSVSummary
 from app.utils.templates import get_template
 from app.utils.user import user_has_permissions
 
@@ -576,8 +580,6 @@ def _check_messages(service_id, template_id, upload_id, preview_row):
         if e.status_code != 404:
             raise
 
-    contents = s3download(service_id, upload_id)
-
     template = current_service.get_template_with_user_permission_or_403(
         template_id,
         current_user,
@@ -601,19 +603,25 @@ def _check_messages(service_id, template_id, upload_id, preview_row):
         template.sender = get_sms_sender_from_session()
         template.show_sender = bool(template.sender)
 
-    recipients = RecipientCSV(
-        contents,
-        template=template,
-        max_initial_rows_shown=50,
-        max_errors_shown=50,
-        guestlist=itertools.chain.from_iterable(
-            [user.name, user.mobile_number, user.email_address] for user in Users(service_id)
-        )
-        if current_service.trial_mode
-        else None,
-        remaining_messages=remaining_messages,
-        allow_international_sms=current_service.has_permission("international_sms"),
-        allow_international_letters=current_service.has_permission("international_letters"),
+    get_recipient_csv = partial(_get_recipient_csv, service_id, upload_id, template, remaining_messages)
+    recipients, csv_metadata = run_concurrently(
+        partial(
+            recipient_csv_cache.get_or_set,
+            (
+                service_id,
+                upload_id,
+                template_id,
+                template.get_raw("version"),
+                session.get("sender_id"),
+                current_service.trial_mode,
+                current_service.has_permission("international_sms"),
+                current_service.has_permission("international_letters"),
+                # Whether there are more rows than can be sent, and so whether there are errors, depends on it
+                remaining_messages,
+            ),
+            lambda: RecipientCSVSummary(get_recipient_csv()),
+        ),
+        partial(get_csv_metadata, service_id, upload_id),
     )
 
     if request.args.get("from_test"):
@@ -627,20 +635,23 @@ def _check_messages(service_id, template_id, upload_id, preview_row):
     if preview_row < 2:
         abort(404)
 
-    if preview_row < len(recipients) + 2:
-        template.values = recipients[preview_row - 2].recipient_and_personalisation
+    if preview_row < recipients.count_of_recipients + 2:
+        if not (row := recipients.get_displayed_row(preview_row - 2)):
+            # Only the rows shown on the page are cached
+            row = get_recipient_csv()[preview_row - 2]
+        template.values = row.recipient_and_personalisation
     elif preview_row > 2:
         abort(404)
 
-    original_file_name = get_csv_metadata(service_id, upload_id).get("original_file_name", "")
+    original_file_name = csv_metadata.get("original_file_name", "")
 
     return dict(
         recipients=recipients,
         template=template,
         errors=recipients.has_errors,
-        row_errors=get_errors_for_csv(recipients, template.template_type),
-        count_of_recipients=len(recipients),
-        count_of_displayed_recipients=len(list(recipients.displayed_rows)),
+        row_errors=recipients.row_errors,
+        count_of_recipients=recipients.count_of_recipients,
+        count_of_displayed_recipients=len(recipients.displayed_rows),
         original_file_name=original_file_name,
         upload_id=upload_id,
         form=CsvUploadForm(),
@@ -663,6 +674,23 @@ def _check_messages(service_id, template_id, upload_id, preview_row):
     )
 
 
+def _get_recipient_csv(service_id, upload_id, template, remaining_messages):
+    return RecipientCSV(
+        s3download(service_id, upload_id),
+        template=template,
+        max_initial_rows_shown=50,
+        max_errors_shown=50,
+        guestlist=itertools.chain.from_iterable(
+            [user.name, user.mobile_number, user.email_address] for user in Users(service_id)
+        )
+        if current_service.trial_mode
+        else None,
+        remaining_messages=remaining_messages,
+        allow_international_sms=current_service.has_permission("international_sms"),
+        allow_international_letters=current_service.has_permission("international_letters"),
+    )
+
+
 @main.route("/services/<uuid:service_id>/<uuid:template_id>/check/<uuid:upload_id>", methods=["GET"])
 @main.route(
     "/services/<uuid:service_id>/<uuid:template_id>/check/<uuid:upload_id>/row-<int:row_index>", methods=["GET"]
@@ -50,7 +50,7 @@ from app.models.service import Service
 from app.models.template_list import TemplateList, UserTemplateList, UserTemplateLists
 from app.s3_client.s3_letter_upload_client import (
     backup_original_letter_to_s3,
-    get_attachment_pdf_and_metadata,
+    get_attachment_pages_and_metadata,
     get_transient_letter_file_location,
     upload_letter_attachment_to_s3,
     upload_letter_to_s3,
@@ -1140,14 +1140,17 @@ def view_invalid_letter_attachment_as_preview(service_id, file_id):
     except ValueError:
         abort(400)
 
-    pdf_file, metadata = get_attachment_pdf_and_metadata(service_id, file_id)
+    pages, metadata = get_attachment_pages_and_metadata(service_id, file_id)
 
     invalid_pages = json.loads(metadata.get("invalid_pages", "[]"))
 
+    if not 1 <= page <= len(pages):
+        abort(400)
+
     if metadata.get("message") == "content-outside-printable-area" and page in invalid_pages:
-        return TemplatePreview.from_invalid_pdf_file(pdf_file, page, is_an_attachment=True)
+        return TemplatePreview.from_invalid_pdf_page(pages[page - 1], page, is_an_attachment=True)
     else:
-        return TemplatePreview.from_valid_pdf_file(pdf_file, page)
+        return TemplatePreview.from_valid_pdf_page(pages[page - 1], page)
 
 
 def _get_page_numbers(page_count):
@@ -35,17 +35,18 @@ from app import (
 from app.main import main
 from app.main.forms import CsvUploadForm, LetterUploadPostageForm, PDFUploadForm
 from app.models.contact_list import ContactList
+from app.models.spreadsheet import Spreadsheet
 from app.s3_client.s3_letter_upload_client import (
     LetterNotFoundError,
     backup_original_letter_to_s3,
     get_letter_metadata,
-    get_letter_pdf_and_metadata,
+    get_letter_pages_and_metadata,
     get_transient_letter_file_location,
     upload_letter_to_s3,
 )
 from app.template_previews import TemplatePreview, sanitise_letter
 from app.utils import unicode_truncate
-from app.utils.csv import Spreadsheet, get_errors_for_csv
+from app.utils.csv import get_errors_for_csv
 from app.utils.letters import (
     get_error_from_upload_form,
     get_letter_printing_statement,
@@ -295,13 +296,16 @@ def view_letter_upload_as_preview(service_id, file_id):
     except ValueError:
         abort(400)
 
-    pdf_file, metadata = get_letter_pdf_and_metadata(service_id, file_id)
+    pages, metadata = get_letter_pages_and_metadata(service_id, file_id)
     invalid_pages = json.loads(metadata.get("invalid_pages", "[]"))
 
+    if not 1 <= page <= len(pages):
+        abort(400)
+
     if metadata.get("message") == "content-outside-printable-area" and page in invalid_pages:
-        return TemplatePreview.from_invalid_pdf_file(pdf_file, page)
+        return TemplatePreview.from_invalid_pdf_page(pages[page - 1], page)
     else:
-        return TemplatePreview.from_valid_pdf_file(pdf_file, page)
+        return TemplatePreview.from_valid_pdf_page(pages[page - 1], page)
 
 
 @main.route("/services/<uuid:service_id>/upload-letter/send/<uuid:file_id>", methods=["POST"])
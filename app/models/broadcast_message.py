@@ -138,6 +138,7 @@ class BroadcastMessage(JSONModel):
 
     @property
     def _ancestor_areas_iterator(self):
+        broadcast_area_libraries.prefetch_ancestors(self.areas)
         for area in self.areas:
             for ancestor in area.ancestors:
                 yield ancestor
@@ -500,6 +500,16 @@ class Service(JSONModel):
     def all_template_folder_ids(self):
         return {folder["id"] for folder in self.all_template_folders}
 
+    @cached_property
+    def _template_folders_by_id(self):
+        return {folder["id"]: folder for folder in self.all_template_folders}
+
+    @cached_property
+    def _template_folder_paths(self):
+        # Filled in as paths are looked up, so each folder’s path is only
+        # worked out once, however many of its sub-folders we look at
+        return {}
+
     def get_template_folder(self, folder_id):
         if folder_id is None:
             return {
@@ -507,7 +517,10 @@ class Service(JSONModel):
                 "name": "Templates",
                 "parent_id": None,
             }
-        return self._get_by_id(self.all_template_folders, folder_id)
+        try:
+            return self._template_folders_by_id[str(folder_id)]
+        except KeyError:
+            abort(404)
 
     def get_template_folder_path(self, template_folder_id):
 
@@ -516,7 +529,10 @@ class Service(JSONModel):
         if folder["id"] is None:
             return [folder]
 
-        return self.get_template_folder_path(folder["parent_id"]) + [self.get_template_folder(folder["id"])]
+        if folder["id"] not in self._template_folder_paths:
+            self._template_folder_paths[folder["id"]] = self.get_template_folder_path(folder["parent_id"]) + [folder]
+
+        return list(self._template_folder_paths[folder["id"]])
 
     def get_template_path(self, template):
         return self.get_template_folder_path(template["folder"]) + [
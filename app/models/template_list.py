@@ -1,6 +1,12 @@
+from collections import Counter, defaultdict
+from functools import partial
+
 from werkzeug.utils import cached_property
 
 from app import format_notification_type
+from app.notify_client.service_api_client import service_api_client
+from app.notify_client.template_folder_api_client import template_folder_api_client
+from app.utils.concurrency import run_concurrently
 
 
 class TemplateList:
@@ -48,6 +54,10 @@ class TemplateList:
     def all_templates(self):
         return self.service.all_templates
 
+    @cached_property
+    def tree(self):
+        return TemplateFolderTree(self.all_templates, self.all_template_folders)
+
     def _get_templates_and_folders(self, template_type, template_folder_id, ancestors):
 
         for item in self._get_template_folders(
@@ -81,12 +91,7 @@ class TemplateList:
         if template_folder_id:
             template_folder_id = str(template_folder_id)
 
-        return [
-            template
-            for template in self.all_templates
-            if (set([template_type]) & {"all", template["template_type"]})
-            and template.get("folder") == template_folder_id
-        ]
+        return self.tree.get_templates(template_type, template_folder_id)
 
     def _get_template_folders(self, template_type, parent_folder_id):
         if parent_folder_id:
@@ -94,8 +99,8 @@ class TemplateList:
 
         return [
             folder
-            for folder in self.all_template_folders
-            if (folder["parent_id"] == parent_folder_id and self._is_folder_visible(folder["id"], template_type))
+            for folder in self.tree.get_folders(parent_folder_id)
+            if self._is_folder_visible(folder["id"], template_type)
         ]
 
     def _is_folder_visible(self, template_folder_id, template_type):
@@ -103,16 +108,7 @@ class TemplateList:
         if template_type == "all":
             return True
 
-        if self._get_templates(template_type, template_folder_id):
-            return True
-
-        if any(
-            self._is_folder_visible(child_folder["id"], template_type)
-            for child_folder in self._get_template_folders(template_type, template_folder_id)
-        ):
-            return True
-
-        return False
+        return self.tree.count_templates(template_type, template_folder_id) > 0
 
     @property
     def templates_to_show(self):
@@ -120,7 +116,79 @@ class TemplateList:
 
     @property
     def folder_is_empty(self):
-        return not any(self._get_templates_and_folders("all", self.template_folder_id, []))
+        return not (
+            self._get_template_folders("all", self.template_folder_id)
+            or self._get_templates("all", self.template_folder_id)
+        )
+
+
+class TemplateFolderTree:
+    """
+    An index of a list of templates and folders, built in one pass, so
+    that finding what’s in a folder doesn’t mean looking through every
+    template and folder each time.
+
+    As well as each folder’s own templates and sub-folders it counts how
+    many templates of each type are in each folder and all of its
+    sub-folders, which is how we tell if a folder should be shown when
+    filtering by template type.
+    """
+
+    def __init__(self, templates, folders):
+        self._templates = defaultdict(list)
+        self._templates_by_type = defaultdict(list)
+        self._folders = defaultdict(list)
+
+        for template in templates:
+            self._templates[template.get("folder")].append(template)
+            self._templates_by_type[template.get("folder"), template["template_type"]].append(template)
+
+        for folder in folders:
+            self._folders[folder["parent_id"]].append(folder)
+
+        self._template_counts = {}
+
+        for folder in folders:
+            self._count_templates_in(folder["id"])
+
+    def _count_templates_in(self, folder_id):
+        # Counts the templates in sub-folders before their parents, without
+        # recursing, so folders can be nested as deeply as anyone likes
+        stack = [folder_id]
+
+        while stack:
+            folder_id = stack[-1]
+
+            if folder_id in self._template_counts:
+                stack.pop()
+                continue
+
+            if uncounted_folders := [
+                folder["id"] for folder in self._folders[folder_id] if folder["id"] not in self._template_counts
+            ]:
+                stack += uncounted_folders
+                continue
+
+            stack.pop()
+            counts = Counter(template["template_type"] for template in self._templates[folder_id])
+            for folder in self._folders[folder_id]:
+                counts.update(self._template_counts[folder["id"]])
+            self._template_counts[folder_id] = counts
+
+    def get_templates(self, template_type, folder_id):
+        if template_type == "all":
+            return list(self._templates[folder_id])
+        return list(self._templates_by_type[folder_id, template_type])
+
+    def get_folders(self, parent_folder_id):
+        return self._folders[parent_folder_id]
+
+    def count_templates(self, template_type, folder_id):
+        """
+        The number of templates of `template_type` in a folder, including in
+        all of its sub-folders
+        """
+        return self._template_counts.get(folder_id, Counter())[template_type]
 
 
 class UserTemplateList(TemplateList):
@@ -147,7 +215,7 @@ class UserTemplateList(TemplateList):
 
     @cached_property
     def all_templates(self):
-        all_folder_ids = [folder["id"] for folder in self.all_template_folders]
+        all_folder_ids = {folder["id"] for folder in self.all_template_folders} | {None}
 
         return [
             template
@@ -155,7 +223,7 @@ class UserTemplateList(TemplateList):
             # Check if each template is in a folder the user has
             # access to. If it's not in a folder ("None"), then
             # it's at the top level and all users have access.
-            if template["folder"] in (all_folder_ids + [None])
+            if template["folder"] in all_folder_ids
         ]
 
     @cached_property
@@ -177,8 +245,10 @@ class UserTemplateList(TemplateList):
         for folder in self.service.all_template_folders:
             if not self.user.has_template_folder_permission(folder, service=self.service):
                 continue
-            parent = self.service.get_template_folder(folder["parent_id"])
-            if self.user.has_template_folder_permission(parent, service=self.service):
+            # Every folder above this one, nearest first, ending with the
+            # top level "Templates" folder
+            ancestors = self.service.get_template_folder_path(folder["parent_id"])[::-1]
+            if self.user.has_template_folder_permission(ancestors[0], service=self.service):
                 user_folders.append(folder)
             else:
                 folder_attrs = {
@@ -187,18 +257,14 @@ class UserTemplateList(TemplateList):
                     "parent_id": folder["parent_id"],
                     "users_with_permission": folder["users_with_permission"],
                 }
-                while folder_attrs["parent_id"] is not None:
+                for parent, grandparent in zip(ancestors, ancestors[1:]):
                     folder_attrs["name"] = [
                         parent["name"],
                         folder_attrs["name"],
                     ]
-                    if parent["parent_id"] is None:
-                        folder_attrs["parent_id"] = None
-                    else:
-                        parent = self.service.get_template_folder(parent["parent_id"])
-                        folder_attrs["parent_id"] = parent.get("id", None)
-                        if self.user.has_template_folder_permission(parent, service=self.service):
-                            break
+                    folder_attrs["parent_id"] = grandparent["id"]
+                    if self.user.has_template_folder_permission(grandparent, service=self.service):
+                        break
                 user_folders.append(folder_attrs)
         return user_folders
 
@@ -258,6 +324,8 @@ class UserTemplateLists:
             )
             return
 
+        self._prefetch_templates_and_folders()
+
         for service in self.services:
             yield from ServiceTemplateList(
                 service=service,
@@ -268,6 +336,13 @@ class UserTemplateLists:
     def templates_to_show(self):
         return bool(self.services)
 
+    def _prefetch_templates_and_folders(self):
+        service_ids = [service.id for service in self.services]
+        run_concurrently(
+            partial(service_api_client.prefetch_service_templates, service_ids),
+            partial(template_folder_api_client.prefetch_template_folders, service_ids),
+        )
+
 
 class TemplateListItem:
 
@@ -1,12 +1,218 @@
-from flask import g, has_request_context, request
+import copy
+import inspect
+import json
+import time
+from contextvars import ContextVar
+from functools import partial, wraps
+
+import requests
+from flask import current_app, g, has_request_context, request
 from flask_login import current_user
+from gds_metrics.metrics import Counter
 from notifications_python_client import __version__
 from notifications_python_client.base import BaseAPIClient
+from notifications_python_client.errors import HTTPError
 from notifications_utils.clients.redis import RequestCache
 
-from app.extensions import redis_client
+from app.extensions import http_session, in_process_cache, redis_client
+from app.utils.concurrency import run_concurrently
+
+REQUEST_CACHE_TOTAL = Counter(
+    "request_cache_total",
+    "Cached API responses, by key format and whether they came from memory, Redis or the API",
+    ["key_format", "result"],
+)
+
+# Set by the innermost layer of a cached client method that had to call the API
+_called_api = ContextVar("called_api", default=False)
+
+# Set while a cached client method is being memoised, so the API calls it makes aren’t memoised as well
+_memoising_client_method = ContextVar("memoising_client_method", default=False)
+
+
+class RequestMemo:
+    """
+    Holds API responses for the lifetime of a single request, so that the
+    same lookup made several times while rendering a page (for example
+    fetching the current service in `load_service_before_request` and again
+    from a view) only goes to Redis or the API once.
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.duplicates_avoided = 0
+
+    @staticmethod
+    def get_for_request():
+        if not has_request_context():
+            return None
+        if not hasattr(request, "_notify_admin_request_memo"):
+            request._notify_admin_request_memo = RequestMemo()
+        return request._notify_admin_request_memo
+
+    def get_or_call(self, key, fn, *args, **kwargs):
+        # Callers are free to modify what they get back, so the memo keeps its
+        # own copy and only ever hands out copies of that
+        if key not in self.responses:
+            response = fn(*args, **kwargs)
+            self.responses[key] = copy.deepcopy(response)
+            return response
+
+        self.duplicates_avoided += 1
+        current_app.logger.debug(
+            "Request memo hit for %s (%s duplicate calls avoided this request)", key, self.duplicates_avoided
+        )
+        return copy.deepcopy(self.responses[key])
+
+    def clear(self):
+        self.responses.clear()
+
+
+def _clear_request_memo():
+    if memo := RequestMemo.get_for_request():
+        memo.clear()
+
+
+def _call_memoised_client_method(client_method, *args, **kwargs):
+    token = _memoising_client_method.set(True)
+    try:
+        return client_method(*args, **kwargs)
+    finally:
+        _memoising_client_method.reset(token)
+
+
+class NotifyAdminRequestCache(RequestCache):
+    # How many API calls `prefetch` will make at once for things that aren’t in Redis
+    PREFETCH_CONCURRENCY = 10
+
+    def set(self, key_format, *args, in_process=False, **kwargs):
+        """
+        As well as caching in Redis, passing `in_process=True` keeps the
+        response in memory (see `InProcessCache`) for a few seconds. This is
+        only worth it for things nearly every request needs.
+        """
+        redis_set = super().set(key_format, *args, **kwargs)
+
+        def _set(client_method):
+            @wraps(client_method)
+            def api_client_method(*args, **kwargs):
+                _called_api.set(True)
+                return client_method(*args, **kwargs)
+
+            redis_cached_client_method = redis_set(api_client_method)
+            client_method_signature = inspect.signature(client_method)
+
+            @wraps(client_method)
+            def counted_client_method(*args, **kwargs):
+                token = _called_api.set(False)
+                try:
+                    if in_process:
+                        key = self._make_in_process_key(key_format, client_method_signature, args, kwargs)
+                        response, from_memory = in_process_cache.get_or_call(
+                            key, redis_cached_client_method, *args, **kwargs
+                        )
+                    else:
+                        response, from_memory = redis_cached_client_method(*args, **kwargs), False
+                    result = "in_process_hit" if from_memory else "miss" if _called_api.get() else "redis_hit"
+                finally:
+                    _called_api.reset(token)
+                REQUEST_CACHE_TOTAL.labels(key_format=key_format, result=result).inc()
+                return response
+
+            @wraps(client_method)
+            def new_client_method(*args, **kwargs):
+                if not (memo := RequestMemo.get_for_request()):
+                    return counted_client_method(*args, **kwargs)
+                # The first argument is the API client instance
+                key = self._memo_key(key_format, args[1:], kwargs)
+                return memo.get_or_call(key, _call_memoised_client_method, counted_client_method, *args, **kwargs)
+
+            return new_client_method
 
-cache = RequestCache(redis_client)
+        return _set
+
+    def prefetch(self, key_format, client_method, argument_name, values):
+        """
+        Gets what `client_method` (which must be decorated with `set` using
+        the same `key_format`) returns for each of `values`, so that calling it
+        with any of them later in this request doesn’t go to Redis or the API.
+
+        Everything already in Redis is fetched with a single `MGET`, then the
+        API is called for anything missing, several at a time.
+        """
+        if not (memo := RequestMemo.get_for_request()):
+            return
+
+        values = [
+            value for value in dict.fromkeys(values) if self._memo_key(key_format, (value,), {}) not in memo.responses
+        ]
+        cached_responses = self._get_many([key_format.format(**{argument_name: value}) for value in values])
+        misses = []
+
+        for value, cached_response in zip(values, cached_responses):
+            if cached_response is None:
+                misses.append(value)
+            else:
+                memo.responses[self._memo_key(key_format, (value,), {})] = json.loads(cached_response)
+
+        run_concurrently(
+            *(partial(client_method, value) for value in misses),
+            max_workers=self.PREFETCH_CONCURRENCY,
+        )
+
+    def _get_many(self, keys):
+        if not keys or not self.redis_client.active:
+            return [None] * len(keys)
+        try:
+            return self.redis_client.redis_store.mget(keys)
+        except Exception:
+            current_app.logger.exception("Redis error performing MGET on %s keys", len(keys))
+            return [None] * len(keys)
+
+    @staticmethod
+    def _memo_key(key_format, args, kwargs):
+        return repr((key_format, tuple(args), sorted(kwargs.items())))
+
+    @staticmethod
+    def _make_in_process_key(key_format, client_method_signature, args, kwargs):
+        arguments = client_method_signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        return key_format.format(**arguments.arguments)
+
+    def delete(self, key_format, *args, **kwargs):
+        return self._invalidate_after(super().delete(key_format, *args, **kwargs), key_format)
+
+    def delete_by_pattern(self, key_format, *args, **kwargs):
+        return self._invalidate_after(super().delete_by_pattern(key_format, *args, **kwargs), key_format, pattern=True)
+
+    def _invalidate_after(self, redis_delete, key_format, pattern=False):
+        def _delete(client_method):
+            @wraps(client_method)
+            def clearing_client_method(*args, **kwargs):
+                try:
+                    return client_method(*args, **kwargs)
+                finally:
+                    _clear_request_memo()
+
+            redis_deleting_client_method = redis_delete(clearing_client_method)
+            client_method_signature = inspect.signature(client_method)
+
+            @wraps(client_method)
+            def new_client_method(*args, **kwargs):
+                try:
+                    return redis_deleting_client_method(*args, **kwargs)
+                finally:
+                    # Only once it’s gone from Redis, otherwise another process could put it straight back
+                    if in_process_cache.enabled:
+                        key = self._make_in_process_key(key_format, client_method_signature, args, kwargs)
+                        in_process_cache.evict(**{"patterns" if pattern else "keys": [key]})
+
+            return new_client_method
+
+        return _delete
+
+
+cache = NotifyAdminRequestCache(redis_client)
 
 
 def _attach_current_user(data):
@@ -22,6 +228,46 @@ class NotifyAdminAPIClient(BaseAPIClient):
         self.service_id = app.config["ADMIN_CLIENT_USER_NAME"]
         self.api_key = app.config["ADMIN_CLIENT_SECRET"]
         self.route_secret = app.config["ROUTE_SECRET_KEY_1"]
+        self.timeout = (app.config["HTTP_CONNECT_TIMEOUT"], app.config["API_READ_TIMEOUT"])
+
+    def request(self, method, url, data=None, params=None, memoise=True, read_only=False):
+        """
+        Pass `read_only=True` for requests which only fetch things but aren’t
+        GETs (usually to keep personal data out of URLs), so they don’t clear
+        what’s been memoised for this request.
+        """
+        memo = RequestMemo.get_for_request()
+
+        if memo is None:
+            return super().request(method, url, data=data, params=params)
+
+        if method != "GET":
+            if not read_only:
+                # Anything we’ve already fetched during this request might be changed by this call
+                memo.clear()
+            return super().request(method, url, data=data, params=params)
+
+        if not memoise or _memoising_client_method.get():
+            return super().request(method, url, data=data, params=params)
+
+        key = repr((url, sorted((params or {}).items())))
+        return memo.get_or_call(key, super().request, method, url, data=data, params=params)
+
+    def _perform_request(self, method, url, kwargs):
+        # Same as the base client, except using our pooled session rather than a new connection every time
+        start_time = time.monotonic()
+        try:
+            response = http_session.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            api_error = HTTPError.create(e)
+            current_app.logger.warning(
+                "API %s request on %s failed with %s '%s'", method, url, api_error.status_code, api_error.message
+            )
+            raise api_error
+        finally:
+            current_app.logger.debug("API %s request on %s finished in %s", method, url, time.monotonic() - start_time)
 
     def generate_headers(self, api_token):
         headers = {
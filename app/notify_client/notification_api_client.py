@@ -33,17 +33,24 @@ class NotificationApiClient(NotifyAdminAPIClient):
 
         params = {k: v for k, v in params.items() if v is not None}
 
-        # if `to` is set it is likely PII like an email address or mobile which
-        # we do not want in our logs, so we do a POST request instead of a GET
-        method = self.post if to else self.get
-        kwargs = {"data": params} if to else {"params": params}
-
         if job_id:
-            return method(url=f"/service/{service_id}/job/{job_id}/notifications", **kwargs)
+            url = f"/service/{service_id}/job/{job_id}/notifications"
         else:
             if limit_days is not None:
                 params["limit_days"] = limit_days
-            return method(url=f"/service/{service_id}/notifications", **kwargs)
+            url = f"/service/{service_id}/notifications"
+
+        if to:
+            # `to` is likely PII like an email address or mobile which we do
+            # not want in our logs, so we do a POST request instead of a GET
+            return self.request("POST", url, data=params, read_only=True)
+
+        if format_for_csv:
+            # Each page of a CSV export is only fetched once, and there can be lots of
+            # them, so don’t hold on to them for the rest of the request
+            return self.request("GET", url, params=params, memoise=False)
+
+        return self.get(url=url, params=params)
 
     def send_notification(self, service_id, *, template_id, recipient, personalisation, sender_id):
         data = {
@@ -2,7 +2,7 @@ from itertools import chain
 
 from notifications_python_client.errors import HTTPError
 
-from app.extensions import redis_client
+from app.extensions import in_process_cache, redis_client
 from app.notify_client import NotifyAdminAPIClient, cache
 
 
@@ -53,7 +53,9 @@ class OrganisationsClient(NotifyAdminAPIClient):
         api_response = self.post(url=f"/organisations/{org_id}", data=kwargs)
 
         if cached_service_ids:
-            redis_client.delete(*map("service-{}".format, cached_service_ids))
+            service_keys = list(map("service-{}".format, cached_service_ids))
+            redis_client.delete(*service_keys)
+            in_process_cache.evict(keys=service_keys)
 
         if "name" in kwargs:
             redis_client.delete(f"organisation-{org_id}-name")
@@ -2,7 +2,7 @@ from datetime import datetime
 
 from notifications_utils.clients.redis import daily_limit_cache_key
 
-from app.extensions import redis_client
+from app.extensions import in_process_cache, redis_client
 from app.notify_client import NotifyAdminAPIClient, _attach_current_user, cache
 
 
@@ -36,7 +36,7 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         data = _attach_current_user(data)
         return self.post("/service", data)["data"]["id"]
 
-    @cache.set("service-{service_id}")
+    @cache.set("service-{service_id}", in_process=True)
     def get_service(self, service_id):
         """
         Retrieve a service.
@@ -147,7 +147,9 @@ class ServiceAPIClient(NotifyAdminAPIClient):
     @cache.delete_by_pattern("service-{service_id}-template*")
     def archive_service(self, service_id, cached_service_user_ids):
         if cached_service_user_ids:
-            redis_client.delete(*map("user-{}".format, cached_service_user_ids))
+            user_keys = list(map("user-{}".format, cached_service_user_ids))
+            redis_client.delete(*user_keys)
+            in_process_cache.evict(keys=user_keys)
         return self.post(f"/service/{service_id}/archive", data=None)
 
     @cache.delete("service-{service_id}")
@@ -252,6 +254,14 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         endpoint = f"/service/{service_id}/template?detailed=False"
         return self.get(endpoint)
 
+    def prefetch_service_templates(self, service_ids):
+        """
+        Loads the templates for lots of services at once, so that
+        `get_service_templates` doesn’t need to go to Redis or the API for
+        each of them, one after another
+        """
+        cache.prefetch("service-{service_id}-templates", self.get_service_templates, "service_id", service_ids)
+
     # This doesn’t need caching because it calls through to a method which is cached
     def count_service_templates(self, service_id, template_type=None):
         return len(
@@ -295,9 +305,11 @@ class ServiceAPIClient(NotifyAdminAPIClient):
 
     def get_inbound_sms(self, service_id, user_number=""):
         # POST prevents the user phone number leaking into our logs
-        return self.post(
+        return self.request(
+            "POST",
             f"/service/{service_id}/inbound-sms",
             data={"phone_number": user_number},
+            read_only=True,
         )
 
     def get_most_recent_inbound_sms(self, service_id, page=None):
@@ -469,7 +481,9 @@ class ServiceAPIClient(NotifyAdminAPIClient):
         provider_restriction is one of "all", "three", "o2", "vodafone", "ee"
         """
         if cached_service_user_ids:
-            redis_client.delete(*map("user-{}".format, cached_service_user_ids))
+            user_keys = list(map("user-{}".format, cached_service_user_ids))
+            redis_client.delete(*user_keys)
+            in_process_cache.evict(keys=user_keys)
 
         data = {
             "service_mode": service_mode,
@@ -12,6 +12,9 @@ class TemplateFolderAPIClient(NotifyAdminAPIClient):
     def get_template_folders(self, service_id):
         return self.get(f"/service/{service_id}/template-folder")["template_folders"]
 
+    def prefetch_template_folders(self, service_ids):
+        cache.prefetch("service-{service_id}-template-folders", self.get_template_folders, "service_id", service_ids)
+
     def get_template_folder(self, service_id, folder_id):
         if folder_id is None:
             return {
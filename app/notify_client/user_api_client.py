@@ -34,7 +34,7 @@ class UserApiClient(NotifyAdminAPIClient):
     def get_user(self, user_id):
         return self._get_user(user_id)["data"]
 
-    @cache.set("user-{user_id}")
+    @cache.set("user-{user_id}", in_process=True)
     def _get_user(self, user_id):
         return self.get(f"/user/{user_id}")
 
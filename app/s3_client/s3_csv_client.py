@@ -1,3 +1,4 @@
+import codecs
 import uuid
 
 import botocore
@@ -8,6 +9,8 @@ from app.s3_client import get_s3_object
 
 FILE_LOCATION_STRUCTURE = "service-{}-notify/{}.csv"
 
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
 
 def get_csv_location(service_id, upload_id, bucket=None):
     return (
@@ -33,14 +36,21 @@ def s3upload(service_id, filedata, region, bucket=None):
 
 
 def s3download(service_id, upload_id, bucket=None):
-    contents = ""
+    return "".join(_s3download_chunks(service_id, upload_id, bucket))
+
+
+def _s3download_chunks(service_id, upload_id, bucket=None):
+    # Decoding a chunk at a time means we never have the whole file in
+    # memory as bytes as well as text
+    decoder = codecs.getincrementaldecoder("utf-8")()
     try:
-        key = get_csv_upload(service_id, upload_id, bucket)
-        contents = key.get()["Body"].read().decode("utf-8")
+        body = get_csv_upload(service_id, upload_id, bucket).get()["Body"]
+        for chunk in body.iter_chunks(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            yield decoder.decode(chunk)
     except botocore.exceptions.ClientError as e:
         current_app.logger.error("Unable to download s3 file %s", FILE_LOCATION_STRUCTURE.format(service_id, upload_id))
         raise e
-    return contents
+    yield decoder.decode(b"", final=True)
 
 
 def set_metadata_on_csv_upload(service_id, upload_id, bucket=None, **kwargs):
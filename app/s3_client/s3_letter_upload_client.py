@@ -1,10 +1,14 @@
 import json
 import urllib
+from io import BytesIO
 
 import botocore
 from boto3 import resource
 from flask import current_app
 from notifications_utils.s3 import s3upload as utils_s3upload
+from pypdf import PdfReader, PdfWriter
+
+from app.extensions import letter_upload_cache
 
 
 class LetterNotFoundError(Exception):
@@ -95,6 +99,42 @@ def get_attachment_pdf_and_metadata(service_id, file_id):
     return pdf, s3_object["Metadata"]
 
 
+def get_letter_pages_and_metadata(service_id, file_id):
+    """
+    Like `get_letter_pdf_and_metadata`, but with the letter split into a
+    PDF for each page. The pages are kept in memory for a short time, so
+    previewing every page of a letter only downloads and parses it once.
+    """
+    return letter_upload_cache.get_or_set(
+        ("letter", service_id, file_id),
+        lambda: _split_pdf_and_metadata(*get_letter_pdf_and_metadata(service_id, file_id)),
+    )
+
+
+def get_attachment_pages_and_metadata(service_id, file_id):
+    return letter_upload_cache.get_or_set(
+        ("attachment", service_id, file_id),
+        lambda: _split_pdf_and_metadata(*get_attachment_pdf_and_metadata(service_id, file_id)),
+    )
+
+
+def _split_pdf_and_metadata(pdf_file, metadata):
+    return split_pdf_into_pages(pdf_file), metadata
+
+
+def split_pdf_into_pages(pdf_file):
+    pages = []
+
+    for page in PdfReader(BytesIO(pdf_file)).pages:
+        writer = PdfWriter()
+        writer.add_page(page)
+        page_file = BytesIO()
+        writer.write(page_file)
+        pages.append(page_file.getvalue())
+
+    return pages
+
+
 def upload_letter_attachment_to_s3(data, *, file_location, page_count, original_filename):
     # Use of urllib.parse.quote encodes metadata into ascii, which is required by s3.
     # Making sure data for displaying to users is decoded is taken care of by LetterMetadata
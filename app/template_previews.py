@@ -1,11 +1,24 @@
 import base64
-from io import BytesIO
+from hashlib import sha256
 
-import requests
-from flask import abort, current_app, json
-from notifications_utils.pdf import extract_page_from_pdf
+from flask import abort, current_app, has_request_context, json, request
+from gds_metrics.metrics import Counter
 
 from app import current_service
+from app.extensions import http_session, redis_client
+
+LETTER_PREVIEW_CACHE_TOTAL = Counter(
+    "letter_preview_cache_total",
+    "Letter previews, by whether they came from the cache, had to be rendered, or were too big to cache",
+    ["filetype", "result"],
+)
+
+# The types of preview that template preview renders from a template, and so can be cached
+PREVIEW_CONTENT_TYPES = {
+    "json": "application/json",
+    "pdf": "application/pdf",
+    "png": "image/png",
+}
 
 
 class AuthPreview:
@@ -15,6 +28,81 @@ class AuthPreview:
         allowed_headers = {header: value for header, value in headers.items() if header.lower() in header_allowlist}
         return allowed_headers.items()
 
+    @classmethod
+    def _render(cls, path, data, filetype, page=None):
+        """
+        Renders a preview with template preview, or gets it from Redis if
+        the same template and branding (or the same attachment) have been
+        rendered recently.
+
+        The cache key is a hash of everything sent to template preview, so
+        it’s also used as the ETag, letting browsers which already have the
+        preview skip downloading it again.
+
+        Previews with values filled in aren’t cached, in Redis or by the
+        browser, so that nobody’s personal details are.
+        """
+        if filetype not in PREVIEW_CONTENT_TYPES or data.get("values"):
+            resp = cls._post_to_template_preview(path, data, filetype, page)
+            return resp.content, resp.status_code, cls.get_allowed_headers(resp.headers)
+
+        cache_key = "letter-preview-{}".format(
+            sha256(
+                json.dumps(
+                    _with_keys_as_strings({"path": path, "data": data, "filetype": filetype, "page": page}),
+                    sort_keys=True,
+                ).encode()
+            ).hexdigest()
+        )
+        headers = {"Content-Type": PREVIEW_CONTENT_TYPES[filetype], "ETag": f'"{cache_key}"'}
+
+        if has_request_context() and request.if_none_match.contains(cache_key):
+            return b"", 304, headers
+
+        ttl_in_seconds = current_app.config["LETTER_PREVIEW_CACHE_TTL_IN_SECONDS"]
+
+        if ttl_in_seconds and (cached := redis_client.get(cache_key)):
+            LETTER_PREVIEW_CACHE_TOTAL.labels(filetype=filetype, result="hit").inc()
+            return base64.b64decode(cached), 200, headers
+
+        resp = cls._post_to_template_preview(path, data, filetype, page)
+
+        if resp.status_code != 200:
+            return resp.content, resp.status_code, cls.get_allowed_headers(resp.headers)
+
+        if ttl_in_seconds:
+            if len(resp.content) <= current_app.config["LETTER_PREVIEW_CACHE_MAX_ITEM_SIZE_IN_BYTES"]:
+                # The Redis client is set up to decode what it returns as text, which PNGs and PDFs aren’t
+                redis_client.set(cache_key, base64.b64encode(resp.content), ex=ttl_in_seconds)
+                LETTER_PREVIEW_CACHE_TOTAL.labels(filetype=filetype, result="miss").inc()
+            else:
+                LETTER_PREVIEW_CACHE_TOTAL.labels(filetype=filetype, result="too_big").inc()
+
+        return resp.content, resp.status_code, headers
+
+    @staticmethod
+    def _post_to_template_preview(path, data, filetype, page=None):
+        return http_session.post(
+            "{}/{}.{}{}".format(
+                current_app.config["TEMPLATE_PREVIEW_API_HOST"],
+                path,
+                filetype,
+                "?page={}".format(page) if page else "",
+            ),
+            json=data,
+            headers={"Authorization": f"Token {current_app.config['TEMPLATE_PREVIEW_API_KEY']}"},
+        )
+
+
+def _with_keys_as_strings(data):
+    # Values filled in from a spreadsheet can have a `None` key (for cells
+    # without a header) which can’t be sorted alongside strings
+    if isinstance(data, dict):
+        return {repr(key): _with_keys_as_strings(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_with_keys_as_strings(value) for value in data]
+    return data
+
 
 class LetterAttachmentPreview(AuthPreview):
     @classmethod
@@ -23,15 +111,8 @@ class LetterAttachmentPreview(AuthPreview):
             "letter_attachment_id": attachment_id,
             "service_id": current_service.id,
         }
-        resp = requests.post(
-            "{}/letter_attachment_preview.png{}".format(
-                current_app.config["TEMPLATE_PREVIEW_API_HOST"],
-                "?page={}".format(page) if page else "",
-            ),
-            json=data,
-            headers={"Authorization": f"Token {current_app.config['TEMPLATE_PREVIEW_API_KEY']}"},
-        )
-        return resp.content, resp.status_code, cls.get_allowed_headers(resp.headers)
+        # Attachments never change, a new one gets a new ID
+        return cls._render("letter_attachment_preview", data, "png", page=page)
 
 
 class TemplatePreview(AuthPreview):
@@ -43,22 +124,11 @@ class TemplatePreview(AuthPreview):
             "values": values,
             "filename": current_service.letter_branding.filename,
         }
-        resp = requests.post(
-            "{}/preview.{}{}".format(
-                current_app.config["TEMPLATE_PREVIEW_API_HOST"],
-                filetype,
-                "?page={}".format(page) if page else "",
-            ),
-            json=data,
-            headers={"Authorization": f"Token {current_app.config['TEMPLATE_PREVIEW_API_KEY']}"},
-        )
-        return resp.content, resp.status_code, cls.get_allowed_headers(resp.headers)
+        return cls._render("preview", data, filetype, page=page)
 
     @classmethod
-    def from_valid_pdf_file(cls, pdf_file, page):
-        pdf_page = extract_page_from_pdf(BytesIO(pdf_file), int(page) - 1)
-
-        resp = requests.post(
+    def from_valid_pdf_page(cls, pdf_page, page):
+        resp = http_session.post(
             "{}/precompiled-preview.png{}".format(
                 current_app.config["TEMPLATE_PREVIEW_API_HOST"], "?hide_notify=true" if page == "1" else ""
             ),
@@ -68,10 +138,8 @@ class TemplatePreview(AuthPreview):
         return resp.content, resp.status_code, cls.get_allowed_headers(resp.headers)
 
     @classmethod
-    def from_invalid_pdf_file(cls, pdf_file, page, is_an_attachment=False):
-        pdf_page = extract_page_from_pdf(BytesIO(pdf_file), int(page) - 1)
-
-        resp = requests.post(
+    def from_invalid_pdf_page(cls, pdf_page, page, is_an_attachment=False):
+        resp = http_session.post(
             "{}/precompiled/overlay.png{}".format(
                 current_app.config["TEMPLATE_PREVIEW_API_HOST"],
                 f"?page_number={page}&is_an_attachment={is_an_attachment}",
@@ -89,12 +157,7 @@ class TemplatePreview(AuthPreview):
             "values": None,
             "filename": filename,
         }
-        resp = requests.post(
-            f"{current_app.config['TEMPLATE_PREVIEW_API_HOST']}/preview.png",
-            json=data,
-            headers={"Authorization": f"Token {current_app.config['TEMPLATE_PREVIEW_API_KEY']}"},
-        )
-        return resp.content, resp.status_code, cls.get_allowed_headers(resp.headers)
+        return cls._render("preview", data, "png")
 
     @classmethod
     def from_utils_template(cls, template, filetype, page=None):
@@ -136,7 +199,7 @@ def sanitise_letter(pdf_file, *, upload_id, allow_international_letters, is_an_a
     )
     if is_an_attachment:
         url = url + "&is_an_attachment=true"
-    return requests.post(
+    return http_session.post(
         url,
         data=pdf_file,
         headers={"Authorization": f"Token {current_app.config['TEMPLATE_PREVIEW_API_KEY']}"},
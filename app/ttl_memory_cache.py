@@ -0,0 +1,45 @@
+from threading import Lock
+
+from cachetools import TTLCache
+
+
+class TTLMemoryCache:
+    """
+    Keeps values which are expensive to work out in memory, in this process
+    only, for a short time.
+
+    The size and TTL come from `<config_prefix>_MAX_SIZE` and
+    `<config_prefix>_TTL_IN_SECONDS`. A TTL of 0 turns the cache off.
+    """
+
+    def __init__(self, config_prefix):
+        # Make sure to call `init_app` to set the size and TTL of the cache.
+        self.config_prefix = config_prefix
+        self.cache = None
+        self.lock = Lock()
+
+    def init_app(self, application):
+        if application.config[f"{self.config_prefix}_TTL_IN_SECONDS"]:
+            self.cache = TTLCache(
+                maxsize=application.config[f"{self.config_prefix}_MAX_SIZE"],
+                ttl=application.config[f"{self.config_prefix}_TTL_IN_SECONDS"],
+            )
+
+    def get_or_set(self, key, get_value):
+        """
+        Returns what was cached for `key`, otherwise calls `get_value` and
+        caches what it returns
+        """
+        if self.cache is None:
+            return get_value()
+
+        with self.lock:
+            if (cached := self.cache.get(key)) is not None:
+                return cached
+
+        value = get_value()
+
+        with self.lock:
+            self.cache[key] = value
+
+        return value
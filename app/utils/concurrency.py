@@ -0,0 +1,73 @@
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from eventlet import GreenPool
+from eventlet.patcher import is_monkey_patched
+
+
+def run_concurrently(*fns, max_workers=None):
+    """
+    Calls each of `fns` (which should take no arguments – use `functools.partial`
+    to bind any) at the same time, and returns their results in the same order.
+
+    This is for fetching several independent things from the API or S3, so the
+    caller waits for the slowest call rather than the sum of all of them.
+
+    Each call runs with a copy of the caller’s context, so `current_app`,
+    `request`, `g` and `current_user` all behave as they would in the caller.
+    If any of the calls raise then, once they have all finished, the exception
+    from the first of them (in the order they were passed in) is re-raised.
+
+    Pass `max_workers` to limit how many of the calls run at once.
+    """
+    if len(fns) < 2:
+        return [fn() for fn in fns]
+
+    calls = [partial(contextvars.copy_context().run, fn) for fn in fns]
+
+    if is_monkey_patched("thread"):
+        # Under gunicorn’s eventlet workers threads are green anyway, but
+        # spawning green threads directly avoids the executor’s overhead
+        pool = GreenPool(min(len(calls), max_workers or len(calls)))
+        green_threads = [pool.spawn(call) for call in calls]
+        pool.waitall()
+        return [green_thread.wait() for green_thread in green_threads]
+
+    with ThreadPoolExecutor(max_workers=min(len(calls), max_workers or len(calls))) as executor:
+        futures = [executor.submit(call) for call in calls]
+
+    return [future.result() for future in futures]
+
+
+def read_ahead(fns, *, max_in_flight):
+    """
+    Calls each of `fns` in order and yields what they return, in the same
+    order, while up to `max_in_flight` of the calls after it are already
+    running.
+
+    This is for things like fetching pages from the API, so the next page is
+    (usually) ready by the time the caller has finished with this one. At
+    most `max_in_flight` results are held in memory waiting for the caller.
+    If the caller stops iterating, calls which haven’t started are cancelled.
+    """
+    fns = iter(fns)
+    executor = ThreadPoolExecutor(max_workers=max_in_flight)
+    in_flight = deque()
+
+    def submit_next():
+        for fn in fns:
+            in_flight.append(executor.submit(contextvars.copy_context().run, fn))
+            return
+
+    try:
+        for _ in range(max_in_flight):
+            submit_next()
+
+        while in_flight:
+            future = in_flight.popleft()
+            submit_next()
+            yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
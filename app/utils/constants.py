@@ -2,3 +2,4 @@ SIGN_IN_METHOD_TEXT = "text"
 SIGN_IN_METHOD_TEXT_OR_EMAIL = "text-or-email"
 
 JSON_UPDATES_BLUEPRINT_NAME = "json_updates"
+NO_COOKIE_BLUEPRINT_NAME = "no_cookie"
@@ -1,8 +1,24 @@
-from notifications_utils.recipients import RecipientCSV
+import csv
+from array import array
+from contextlib import closing
+from functools import partial
+from io import StringIO
+from itertools import accumulate
+from urllib.parse import parse_qs, urlparse
 
+from notifications_utils.formatters import strip_and_remove_obscure_whitespace
+from notifications_utils.insensitive_dict import InsensitiveDict
+from notifications_utils.recipients import first_column_headings
+
+from app.extensions import job_upload_cache
 from app.formatters import recipient_count
-from app.models.spreadsheet import Spreadsheet
-from app.utils.templates import get_sample_template
+from app.utils.concurrency import read_ahead
+
+# How many pages of notifications to fetch while the current one is being written
+PAGES_TO_READ_AHEAD = 3
+
+# Roughly how many characters of CSV to send to the user at a time
+CSV_CHUNK_SIZE = 64 * 1024
 
 
 def get_errors_for_csv(recipients, template_type):
@@ -37,38 +53,199 @@ def get_errors_for_csv(recipients, template_type):
     return errors
 
 
-def generate_notifications_csv(**kwargs):
+class RecipientCSVSummary:
+    """
+    What the pages for checking an upload need from a validated
+    `RecipientCSV`: its column headers, the outcome of validating it and the
+    rows that get shown. Unlike the `RecipientCSV` it doesn’t keep every row,
+    or the template it was validated against, so it’s cheap to keep around
+    in `recipient_csv_cache`.
+    """
+
+    ATTRIBUTES = (
+        "column_headers",
+        "_raw_column_headers",
+        "recipient_column_headers",
+        "missing_column_headers",
+        "duplicate_recipient_column_headers",
+        "has_recipient_columns",
+        "has_errors",
+        "too_many_rows",
+        "max_rows",
+        "more_rows_than_can_send",
+        "allowed_to_send_to",
+        "template_type",
+    )
+
+    def __init__(self, recipients):
+        for attribute in self.ATTRIBUTES:
+            setattr(self, attribute, getattr(recipients, attribute))
+        self.row_errors = get_errors_for_csv(recipients, recipients.template_type)
+        self.displayed_rows = tuple(recipients.displayed_rows)
+        self.count_of_recipients = len(recipients)
+
+    def __len__(self):
+        return self.count_of_recipients
+
+    def get_displayed_row(self, index):
+        """
+        Returns the row at `index` (counting from 0, like `RecipientCSV`) if
+        it’s one of the rows shown, otherwise `None`
+        """
+        return next((row for row in self.displayed_rows if row.index == index), None)
+
+
+def _get_pages_of_notifications(**kwargs):
+    """
+    Yields every page of notifications, starting from `kwargs["page"]`.
+
+    Once the first page says which is the last one, the following pages are
+    fetched a few at a time, ahead of the page being written out.
+    """
     from app import notification_api_client
-    from app.s3_client.s3_csv_client import s3download
 
-    if "page" not in kwargs:
-        kwargs["page"] = 1
+    page = int(kwargs.pop("page", 1))
+    notifications_resp = notification_api_client.get_notifications_for_service(page=page, **kwargs)
+    yield notifications_resp
 
-    if kwargs.get("job_id"):
-        original_file_contents = s3download(kwargs["service_id"], kwargs["job_id"])
-        original_upload = RecipientCSV(
-            original_file_contents,
-            template=get_sample_template(kwargs["template_type"]),
+    while notifications_resp["links"].get("next"):
+        last_page = max(_get_page_number(notifications_resp["links"].get("last")) or 0, page + 1)
+        next_pages = read_ahead(
+            (
+                partial(notification_api_client.get_notifications_for_service, page=next_page, **kwargs)
+                for next_page in range(page + 1, last_page + 1)
+            ),
+            max_in_flight=PAGES_TO_READ_AHEAD,
         )
-        original_column_headers = original_upload.column_headers
-        fieldnames = ["Row number"] + original_column_headers + ["Template", "Type", "Job", "Status", "Time"]
+        with closing(next_pages):
+            for notifications_resp in next_pages:
+                page += 1
+                yield notifications_resp
+                if not notifications_resp["links"].get("next"):
+                    break
+
+
+def _get_page_number(link):
+    if not link:
+        return None
+    try:
+        return int(parse_qs(urlparse(link).query)["page"][0])
+    except (KeyError, ValueError):
+        return None
+
+
+def _write_csv_in_chunks(rows, chunk_size=CSV_CHUNK_SIZE):
+    """
+    Writes all of `rows` with a single CSV writer, yielding the output
+    whenever there’s at least `chunk_size` characters of it, rather than
+    once for every row.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if remainder := buffer.getvalue():
+        yield remainder
+
+
+class CSVRowIndex:
+    """
+    The rows of a job’s original upload, read just well enough to give back
+    the value of each column by row number – without any of the validation
+    that `RecipientCSV` does, since the job has already been checked.
+
+    Only where each row starts in the file is kept; a row is parsed when
+    it’s looked up. Rows and cells are read the same way as `RecipientCSV`
+    reads them, including where a column header appears more than once: a
+    recipient column gets the value from the last of those columns, any other
+    column gets a list of the values if its header is repeated exactly, and
+    otherwise the last of the differently written headers wins.
+    """
+
+    def __init__(self, file_data, recipient_column_headers=()):
+        # A line break in a quoted value is read as `\n` by `RecipientCSV`,
+        # whatever line breaks the file uses
+        self.file_data = file_data.strip().replace("\r\n", "\n").replace("\r", "\n")
+
+        line_offsets = [0, *accumulate(map(len, StringIO(self.file_data)))]
+        reader = self._reader(self.file_data)
+
+        self.column_headers = next(reader, [])
+        # Where each row starts, plus where the last one ends (a quoted value
+        # can contain line breaks, so a row can be more than one line)
+        self.row_offsets = array("Q", [line_offsets[reader.line_num]])
+        for _ in reader:
+            self.row_offsets.append(line_offsets[reader.line_num])
+
+        recipient_column_keys = {InsensitiveDict.make_key(header) for header in recipient_column_headers}
+        self.is_recipient_column = [
+            InsensitiveDict.make_key(header) in recipient_column_keys for header in self.column_headers
+        ]
+
+    def __len__(self):
+        return len(self.row_offsets) - 1
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        row = next(self._reader(self.file_data[self.row_offsets[index] : self.row_offsets[index + 1]]), [])
+
+        cells = {}
+        for header, is_recipient_column, value in zip(self.column_headers, self.is_recipient_column, row):
+            value = strip_and_remove_obscure_whitespace(value) or None
+            if is_recipient_column:
+                cells[header] = value
+            else:
+                _insert_or_append_to_dict(cells, header, value)
+        for header in self.column_headers[len(row) :]:
+            _insert_or_append_to_dict(cells, header, None)
+
+        cells = InsensitiveDict(cells)
+
+        return [cells.get(header) for header in self.column_headers]
+
+    @staticmethod
+    def _reader(file_data):
+        return csv.reader(StringIO(file_data), quoting=csv.QUOTE_MINIMAL, skipinitialspace=True)
+
+
+def _insert_or_append_to_dict(dict_, key, value):
+    if not (key or value):
+        return
+
+    if key not in dict_:
+        dict_[key] = value
+    elif isinstance(dict_[key], list):
+        dict_[key].append(value)
     else:
-        fieldnames = ["Recipient", "Reference", "Template", "Type", "Sent by", "Sent by email", "Job", "Status", "Time"]
+        dict_[key] = [dict_[key], value]
 
-    yield ",".join(fieldnames) + "\n"
 
-    while kwargs["page"]:
-        notifications_resp = notification_api_client.get_notifications_for_service(**kwargs)
+def get_job_upload_index(service_id, job_id, template_type):
+    from app.s3_client.s3_csv_client import s3download
+
+    return job_upload_cache.get_or_set(
+        (str(service_id), str(job_id)),
+        lambda: CSVRowIndex(s3download(service_id, job_id), first_column_headings[template_type]),
+    )
+
+
+def _get_notification_rows(get_original_columns=None, **kwargs):
+    for notifications_resp in _get_pages_of_notifications(**kwargs):
         for notification in notifications_resp["notifications"]:
-            if kwargs.get("job_id"):
+            if get_original_columns:
                 values = (
                     [
                         notification["row_number"],
                     ]
-                    + [
-                        original_upload[notification["row_number"] - 1].get(header).data
-                        for header in original_column_headers
-                    ]
+                    + get_original_columns(notification["row_number"])
                     + [
                         notification["template_name"],
                         notification["template_type"],
@@ -90,10 +267,21 @@ def generate_notifications_csv(**kwargs):
                     notification["status"],
                     notification["created_at"],
                 ]
-            yield Spreadsheet.from_rows([map(str, values)]).as_csv_data
+            yield map(str, values)
 
-        if notifications_resp["links"].get("next"):
-            kwargs["page"] += 1
-        else:
-            return
-    raise Exception("Should never reach here")
+
+def generate_notifications_csv(**kwargs):
+    if kwargs.get("job_id"):
+        original_upload = get_job_upload_index(kwargs["service_id"], kwargs["job_id"], kwargs["template_type"])
+        fieldnames = ["Row number"] + original_upload.column_headers + ["Template", "Type", "Job", "Status", "Time"]
+
+        def get_original_columns(row_number):
+            return original_upload[row_number - 1]
+
+    else:
+        fieldnames = ["Recipient", "Reference", "Template", "Type", "Sent by", "Sent by email", "Job", "Status", "Time"]
+        get_original_columns = None
+
+    yield ",".join(fieldnames) + "\n"
+
+    yield from _write_csv_in_chunks(_get_notification_rows(get_original_columns, **kwargs))
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from hashlib import sha1
+
+from flask import current_app, request
+from flask_login import current_user
+from notifications_utils.timezones import utc_string_to_aware_gmt_datetime
+
+from app.extensions import redis_client
+
+# How long pages wait between polling for updates, in milliseconds
+MIN_POLL_INTERVAL = 2_000
+MAX_POLL_INTERVAL = 60_000
+
+# How long something has to have been idle for the interval to double
+POLL_INTERVAL_DOUBLES_EVERY = timedelta(minutes=1)
+
+
+def cache_json_updates(view):
+    """
+    Keeps what a `json_updates` view returns in Redis for a few seconds, so
+    that every open tab polling the same page for the same user only costs
+    one lot of API calls and rendering between them in that time.
+    """
+
+    @wraps(view)
+    def wrapped(service_id, **kwargs):
+        ttl_in_seconds = current_app.config["JSON_UPDATES_CACHE_TTL_IN_SECONDS"]
+
+        if request.method != "GET" or not ttl_in_seconds:
+            return view(service_id, **kwargs)
+
+        # What a user sees can depend on their permissions, so don’t share responses between users
+        cache_key = "service-{}-json-updates-{}".format(
+            service_id,
+            sha1(f"{current_user.id}-{request.full_path}".encode()).hexdigest(),
+        )
+
+        if cached := redis_client.get(cache_key):
+            return current_app.response_class(cached, mimetype="application/json")
+
+        response = current_app.make_response(view(service_id, **kwargs))
+
+        if response.status_code == 200:
+            redis_client.set(cache_key, response.get_data(as_text=True), ex=ttl_in_seconds)
+
+        return response
+
+    return wrapped
+
+
+def make_json_updates_conditional(response):
+    """
+    Tags each response with a hash of its content, and tells the browser it
+    hasn’t changed if it already has a response with the same tag, so
+    pages which aren’t changing don’t download the same partials every time
+    they poll.
+    """
+    if response.status_code == 200:
+        response.add_etag()
+        response.make_conditional(request)
+    return response
+
+
+def get_poll_interval(last_changed, *, active=False):
+    """
+    How long (in milliseconds) an auto-updating page should wait before
+    polling again.
+
+    Pages about something `active`, like a job which is still sending,
+    poll as often as they would anyway. Otherwise the wait doubles for every
+    minute since `last_changed`, up to a minute. Something which has never
+    changed (`last_changed` is `None`) gets the longest wait.
+
+    Because the wait only changes once a minute it doesn’t stop responses
+    from matching their previous ETag.
+    """
+    if active:
+        return MIN_POLL_INTERVAL
+
+    if not last_changed:
+        return MAX_POLL_INTERVAL
+
+    idle_for = datetime.now(timezone.utc) - utc_string_to_aware_gmt_datetime(last_changed)
+    doublings = max(0, min(idle_for // POLL_INTERVAL_DOUBLES_EVERY, 10))
+
+    return min(MIN_POLL_INTERVAL * 2**doublings, MAX_POLL_INTERVAL)
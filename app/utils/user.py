@@ -1,9 +1,12 @@
+import json
 import os
-from functools import wraps
+import re
+from functools import lru_cache, wraps
 
 from flask import abort, current_app
 from flask_login import current_user, login_required
 
+from app.extensions import redis_client
 from app.notify_client.organisations_api_client import organisations_client
 
 user_is_logged_in = login_required
@@ -13,6 +16,31 @@ with open(f"{os.path.dirname(os.path.realpath(__file__))}/email_domains.txt") as
     GOVERNMENT_EMAIL_DOMAIN_NAMES = [line.strip() for line in email_domains]
 
 
+class EmailDomains:
+    """
+    A set of domains which an email address can be checked against in one
+    lookup for each part of the address, rather than one comparison for
+    each domain.
+
+    An email address matches if it ends with `@` or `.` followed by any of
+    the domains, so `gov.uk` matches both `@gov.uk` and `@example.gov.uk`.
+    """
+
+    SEPARATORS = re.compile(r"[@.]")
+
+    def __init__(self, domains):
+        self.domains = frozenset(domains)
+
+    def __contains__(self, email_address):
+        email_address = email_address.lower()
+        return any(
+            email_address[separator.end() :] in self.domains for separator in self.SEPARATORS.finditer(email_address)
+        )
+
+
+GOVERNMENT_EMAIL_DOMAINS = EmailDomains(GOVERNMENT_EMAIL_DOMAIN_NAMES)
+
+
 def user_has_permissions(*permissions, **permission_kwargs):
     def wrap(func):
         @wraps(func)
@@ -53,21 +81,22 @@ def user_is_platform_admin(f):
 
 
 def is_gov_user(email_address):
-    return _email_address_ends_with(email_address, GOVERNMENT_EMAIL_DOMAIN_NAMES) or _email_address_ends_with(
-        email_address, organisations_client.get_domains()
-    )
-
-
-def _email_address_ends_with(email_address, known_domains):
-    return any(
-        email_address.lower().endswith(
-            (
-                f"@{known}",
-                f".{known}",
-            )
-        )
-        for known in known_domains
-    )
+    return email_address in GOVERNMENT_EMAIL_DOMAINS or email_address in _get_organisation_email_domains()
+
+
+def _get_organisation_email_domains():
+    if (cached_domains := redis_client.get("domains")) is None:
+        # Nothing cached to build the domains from, this caches them
+        return EmailDomains(organisations_client.get_domains())
+
+    return _parse_organisation_email_domains(cached_domains)
+
+
+@lru_cache(maxsize=1)
+def _parse_organisation_email_domains(cached_domains):
+    # What’s cached in Redis only changes when the list of domains does, so
+    # this doesn’t parse it, or build a set from it, on every call
+    return EmailDomains(json.loads(cached_domains))
 
 
 def normalise_email_address_aliases(email_address):
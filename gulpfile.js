@@ -6,6 +6,9 @@
 // 1. LIBRARIES
 // - - - - - - - - - - - - - - -
 const { src, pipe, dest, series, parallel, watch } = require('gulp');
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
 const rollupPluginNodeResolve = require('rollup-plugin-node-resolve');
 const streamqueue = require('streamqueue');
 const stylish = require('jshint-stylish');
@@ -29,6 +32,7 @@ plugins.uglify = require('gulp-uglify');
 const paths = {
   src: 'app/assets/',
   dist: 'app/static/',
+  manifest: 'asset-manifest.json',
   npm: 'node_modules/',
   govuk_frontend: 'node_modules/govuk-frontend/'
 };
@@ -177,17 +181,41 @@ const images = () => {
 };
 
 
+// Write the hash of every file to a manifest, so the app doesn't have to read and hash them itself
+// Uses MD5, like app/asset_fingerprinter.py does when a file isn't in the manifest
+
+const manifest = (cb) => {
+  const hashes = {};
+  const addHashesForDirectory = (directory) => {
+    fs.readdirSync(directory, { withFileTypes: true }).forEach(entry => {
+      const entryPath = path.join(directory, entry.name);
+      const assetPath = path.relative(paths.dist, entryPath).split(path.sep).join('/');
+
+      if (entry.isDirectory()) {
+        addHashesForDirectory(entryPath);
+      } else if (assetPath !== paths.manifest) {
+        hashes[assetPath] = crypto.createHash('md5').update(fs.readFileSync(entryPath)).digest('hex');
+      }
+    });
+  };
+
+  addHashesForDirectory(paths.dist);
+  fs.writeFileSync(paths.dist + paths.manifest, JSON.stringify(hashes, null, 2) + '\n');
+  cb();
+};
+
+
 const watchFiles = {
   javascripts: (cb) => {
-    watch([paths.src + 'javascripts/**/*'], series(clean.javascripts, javascripts));
+    watch([paths.src + 'javascripts/**/*'], series(clean.javascripts, javascripts, manifest));
     cb();
   },
   sass: (cb) => {
-    watch([paths.src + 'stylesheets/**/*'], series(clean.sass, sass));
+    watch([paths.src + 'stylesheets/**/*'], series(clean.sass, sass, manifest));
     cb();
   },
   images: (cb) => {
-    watch([paths.src + 'images/**/*'], series(clean.images, images));
+    watch([paths.src + 'images/**/*'], series(clean.images, images, manifest));
     cb();
   },
   self: (cb) => {
@@ -250,7 +278,8 @@ const defaultTask = series(
     images,
     javascripts,
     sass
-  )
+  ),
+  manifest
 );
 
 
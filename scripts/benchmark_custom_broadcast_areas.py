@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Compares how long it takes to count the phones in a large custom broadcast
+area, one ward at a time versus with `PreparedPolygons`, using real
+county-sized polygons from the broadcast areas database.
+
+Run from the root of the repo:
+
+    python scripts/benchmark_custom_broadcast_areas.py
+"""
+
+import sys
+from pathlib import Path
+from timeit import default_timer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.broadcast_areas.intersections import PreparedPolygons  # noqa: E402
+from app.broadcast_areas.models import (  # noqa: E402
+    CustomBroadcastArea,
+    broadcast_area_libraries,
+)
+
+COUNTIES = (
+    "ctyua21-E10000016",  # Kent
+    "ctyua21-E10000014",  # Hampshire
+    "ctyua21-E10000006",  # Cumbria
+    "ctyua21-E10000023",  # North Yorkshire
+    "ctyua21-S12000017",  # Highland
+)
+
+
+def one_ward_at_a_time(custom_area):
+    return sum(
+        area.simple_polygons.ratio_of_intersection_with(custom_area.polygons) * area.count_of_phones
+        for area in custom_area.nearby_electoral_wards
+    )
+
+
+def prepared(custom_area):
+    return sum(
+        ratio * area.count_of_phones
+        for area, ratio in zip(
+            custom_area.nearby_electoral_wards,
+            PreparedPolygons(custom_area.polygons).ratios_of_intersection(custom_area.nearby_electoral_wards),
+        )
+    )
+
+
+def time(fn, custom_area, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = default_timer()
+        result = fn(custom_area)
+        timings.append(default_timer() - start)
+    return result, min(timings)
+
+
+print(f"{'Area':<20} {'Wards':>6} {'One at a time':>14} {'Prepared':>10} {'Speedup':>8}")  # noqa: T201
+
+for county in broadcast_area_libraries.get_areas(COUNTIES):
+    custom_area = CustomBroadcastArea.from_polygon_objects(county.polygons)
+    # Load the wards (and their polygons) up front so only the estimate is timed
+    wards = custom_area.nearby_electoral_wards
+    ward_areas = [ward.simple_polygons.estimated_area for ward in wards]
+
+    expected, before = time(one_ward_at_a_time, custom_area)
+    actual, after = time(prepared, custom_area)
+
+    assert abs(actual - expected) <= expected * 0.001, (county.name, expected, actual)
+
+    print(f"{county.name:<20} {len(wards):>6} {before:>13.3f}s {after:>9.3f}s {before / after:>7.1f}x")  # noqa: T201
@@ -4,6 +4,7 @@ import pytest
 from custom_polygons import BRISTOL, SKYE
 
 from app.broadcast_areas.models import (
+    BroadcastArea,
     BroadcastAreasRepository,
     CustomBroadcastArea,
     broadcast_area_libraries,
@@ -12,6 +13,7 @@ from app.broadcast_areas.populations import (
     CITY_OF_LONDON,
     estimate_number_of_smartphones_for_population,
 )
+from app.broadcast_areas.repo import GeometryStore, PackedRTree, rtree_index
 
 
 def close_enough(a, b):
@@ -406,3 +408,190 @@ def test_count_of_phones_for_custom_area(
     assert sorted(overlap.name for overlap in area.nearby_electoral_wards) == expected_possible_overlaps
 
     assert close_enough(area.count_of_phones, expected_count_of_phones)
+
+
+def test_geometry_store_round_trips_polygons(tmp_path):
+    path = tmp_path / "geometry.bin"
+    areas = [
+        ("area-1", [[[1.5, 2.25], [3.0, 4.0], [1.5, 2.25]]], [[[1.5, 2.25], [1.5, 2.25]]], "EPSG:32630"),
+        (
+            "area-2",
+            [[[-0.1, 51.5], [0.1, 51.5], [0.0, 51.6], [-0.1, 51.5]], [[1.0, 1.0], [2.0, 2.0], [1.0, 1.0]]],
+            [],
+            "EPSG:32631",
+        ),
+    ]
+
+    GeometryStore.write(path, areas)
+    store = GeometryStore(path)
+
+    assert store.is_built
+    for id, polygons, simple_polygons, utm_crs in areas:
+        assert store.get_polygons(id) == (polygons, utm_crs)
+        assert store.get_simple_polygons(id) == (simple_polygons, utm_crs)
+
+
+def test_geometry_store_is_not_built_if_file_missing(tmp_path):
+    assert not GeometryStore(tmp_path / "geometry.bin").is_built
+
+
+@pytest.mark.parametrize("node_size", (2, 4, 16))
+def test_packed_rtree_finds_every_overlapping_box(tmp_path, node_size):
+    path = tmp_path / "rtree.bin"
+    areas = [(f"area-{x}-{y}", (x, y, x + 1.5, y + 1.5)) for x in range(10) for y in range(10)]
+
+    PackedRTree.write(path, areas, node_size=node_size)
+    index = PackedRTree(path)
+
+    assert sorted(index.query((2.75, 3.75, 4.25, 4.25))) == [
+        "area-2-3",
+        "area-2-4",
+        "area-3-3",
+        "area-3-4",
+        "area-4-3",
+        "area-4-4",
+    ]
+    assert index.query((20, 20, 21, 21)) == []
+    assert len(index.query((-1, -1, 20, 20))) == 100
+
+
+def test_packed_rtree_with_no_areas(tmp_path):
+    path = tmp_path / "rtree.bin"
+
+    PackedRTree.write(path, [])
+
+    assert PackedRTree(path).query((0, 0, 1, 1)) == []
+
+
+def test_rtree_index_only_contains_electoral_wards():
+    # Roughly Bristol
+    ward_ids = rtree_index.query((-2.7, 51.4, -2.5, 51.5))
+
+    assert ward_ids
+    assert all(ward_id.startswith("wd21-") for ward_id in ward_ids)
+
+
+def test_get_ancestors_for_areas():
+    ancestors = BroadcastAreasRepository().get_ancestors_for_areas(
+        ["wd21-E05004516", "lad21-E09000012", "ctyua21-E10000014"]
+    )
+
+    assert {area_id: [row[0] for row in rows] for area_id, rows in ancestors.items()} == {
+        "wd21-E05004516": ["lad21-E07000087", "ctyua21-E10000014"],
+        "lad21-E09000012": [],
+        "ctyua21-E10000014": [],
+    }
+
+
+def test_prefetch_ancestors_uses_one_query(mocker):
+    areas = broadcast_area_libraries.get_areas(["wd21-E05004516", "wd21-E05009373"])
+    mock_query = mocker.spy(BroadcastAreasRepository, "query")
+
+    broadcast_area_libraries.prefetch_ancestors(areas)
+
+    assert {area.name: [ancestor.name for ancestor in area.ancestors] for area in areas} == {
+        "Fareham East": ["Fareham", "Hampshire"],
+        "Hackney Downs": ["Hackney"],
+    }
+    assert {area.name: area.parent.parent.name if area.parent.parent else None for area in areas} == {
+        "Fareham East": "Hampshire",
+        "Hackney Downs": None,
+    }
+    assert mock_query.call_count == 1
+
+
+def test_prefetch_sub_areas_uses_one_query_per_level(mocker):
+    hampshire = broadcast_area_libraries.get_areas(["ctyua21-E10000014"])[0]
+    mock_query = mocker.spy(BroadcastAreasRepository, "query")
+
+    broadcast_area_libraries.prefetch_sub_areas([hampshire])
+
+    assert "Fareham East" in [ward.name for district in hampshire.sub_areas for ward in district.sub_areas]
+    # Districts, then wards, then checking that wards have no sub areas
+    assert mock_query.call_count == 3
+
+
+@pytest.fixture
+def database_with_precomputed_hierarchy(tmp_path):
+    repo = BroadcastAreasRepository(read_only=False)
+    repo.database = tmp_path / "broadcast-areas.sqlite3"
+
+    repo.create_tables()
+    repo.insert_broadcast_area_library(
+        "local-authorities", name="Local authorities", name_singular="local authority", is_group=True
+    )
+    repo.insert_broadcast_areas(
+        [
+            ("ctyua21-1", "County", "local-authorities", None, [], [], "EPSG:32630", None),
+            ("lad21-1", "District", "local-authorities", "ctyua21-1", [], [], "EPSG:32630", None),
+            ("wd21-1", "Ward 1", "local-authorities", "lad21-1", [], [], "EPSG:32630", 1000),
+            ("wd21-2", "Ward 2", "local-authorities", "lad21-1", [], [], "EPSG:32630", 500),
+        ],
+        keep_old_features=False,
+    )
+    repo.insert_ancestors()
+    repo.update_counts_of_phones({"ctyua21-1": 1500, "lad21-1": 1500})
+
+    return repo
+
+
+def test_count_of_phones_and_depth_are_precomputed(database_with_precomputed_hierarchy, mocker):
+    repo = database_with_precomputed_hierarchy
+    areas = {row[0]: BroadcastArea(row) for row in repo.get_areas(["ctyua21-1", "lad21-1", "wd21-1"])}
+    county, district, ward = areas["ctyua21-1"], areas["lad21-1"], areas["wd21-1"]
+    mock_query = mocker.spy(BroadcastAreasRepository, "query")
+
+    assert repo.has_precomputed_hierarchy
+    assert county.count_of_phones == 1500
+    assert [county.depth, district.depth, ward.depth] == [0, 1, 2]
+    assert district.is_lower_tier_local_authority
+    assert not county.is_lower_tier_local_authority
+    assert mock_query.call_count == 0
+
+
+@pytest.fixture
+def database_without_precomputed_hierarchy(tmp_path):
+    repo = BroadcastAreasRepository(read_only=False)
+    repo.database = tmp_path / "broadcast-areas.sqlite3"
+
+    with repo.conn() as conn:
+        conn.execute(
+            """
+        CREATE TABLE broadcast_areas (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            broadcast_area_library_id TEXT NOT NULL,
+            broadcast_area_library_group_id TEXT,
+            count_of_phones INTEGER
+        )"""
+        )
+        conn.executemany(
+            "INSERT INTO broadcast_areas VALUES (?, ?, ?, ?, ?)",
+            [
+                ("ctyua21-1", "County", "local-authorities", None, None),
+                ("lad21-1", "District", "local-authorities", "ctyua21-1", None),
+                ("wd21-1", "Ward", "local-authorities", "lad21-1", 1000),
+            ],
+        )
+
+    return repo
+
+
+def test_reads_database_without_precomputed_hierarchy(database_without_precomputed_hierarchy):
+    repo = database_without_precomputed_hierarchy
+
+    assert not repo.has_precomputed_hierarchy
+    assert repo.get_areas(["wd21-1"]) == [("wd21-1", "Ward", 1000, "local-authorities", None)]
+    assert repo.get_parent_for_area("wd21-1") == ("lad21-1", "District", None, "local-authorities", None)
+    assert [ancestor[0] for ancestor in repo.get_ancestors_for_areas(["wd21-1"])["wd21-1"]] == ["lad21-1", "ctyua21-1"]
+    assert [area[0] for area in repo.get_all_areas_for_library("local-authorities")] == ["ctyua21-1", "lad21-1"]
+
+
+def test_count_of_phones_is_added_up_without_precomputed_hierarchy():
+    district = BroadcastArea(("lad21-1", "District", None, "local-authorities", None))
+    district.sub_areas = [
+        BroadcastArea(("wd21-1", "Ward 1", 1000, "local-authorities", None)),
+        BroadcastArea(("wd21-2", "Ward 2", 500, "local-authorities", None)),
+    ]
+
+    assert district.count_of_phones == 1500
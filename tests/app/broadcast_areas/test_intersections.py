@@ -0,0 +1,42 @@
+from math import isclose
+
+import pytest
+from notifications_utils.polygons import Polygons
+
+from app.broadcast_areas.intersections import PreparedPolygons
+from app.broadcast_areas.models import CustomBroadcastArea
+from tests.app.broadcast_areas.custom_polygons import BRISTOL, SKYE
+
+
+def square(x, y, size):
+    return [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+
+
+@pytest.mark.parametrize(
+    "polygons, expected_ratio",
+    (
+        ([square(-1.9, 52.1, 0.1)], 1),
+        ([square(-1.05, 52.95, 0.1)], 0.25),
+        ([square(-0.5, 53.5, 0.1)], 0),
+        ([square(-1.9, 52.1, 0.1), square(-0.5, 52.1, 0.1)], 0.5),
+    ),
+)
+def test_ratio_of_intersection(polygons, expected_ratio):
+    prepared_polygons = PreparedPolygons(Polygons([square(-2, 52, 1)]))
+
+    assert isclose(prepared_polygons.ratio_of_intersection(Polygons(polygons)), expected_ratio, rel_tol=0.01)
+
+
+@pytest.mark.parametrize("polygon", (BRISTOL, SKYE))
+def test_ratios_of_intersection_match_intersecting_each_ward(polygon):
+    custom_area = CustomBroadcastArea(name="foo", polygons=[polygon])
+    wards = custom_area.nearby_electoral_wards
+
+    assert wards
+    for ward, ratio in zip(wards, custom_area.prepared_polygons.ratios_of_intersection(wards)):
+        assert isclose(
+            ratio,
+            ward.simple_polygons.ratio_of_intersection_with(custom_area.polygons),
+            rel_tol=0.001,
+            abs_tol=1e-9,
+        )
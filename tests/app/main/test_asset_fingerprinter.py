@@ -1,4 +1,9 @@
 # coding=utf-8
+import hashlib
+import json
+from unittest.mock import Mock
+
+import pytest
 
 from app.asset_fingerprinter import AssetFingerprinter
 
@@ -98,3 +103,52 @@ class TestAssetFingerprintWithUnicode:
     def test_can_read_self(self):
         "Ralph’s apostrophe is a string containing a unicode character"
         AssetFingerprinter(filesystem_path="tests/app/main/").get_url("test_asset_fingerprinter.py")
+
+
+class TestAssetManifest:
+    @pytest.fixture
+    def static_folder(self, tmp_path):
+        (tmp_path / "fonts").mkdir()
+        (tmp_path / "fonts" / "bold.woff2").write_bytes(b"bold")
+        (tmp_path / "fonts" / "light.woff2").write_bytes(b"light")
+        (tmp_path / "application.css").write_text("body {}")
+        return tmp_path
+
+    @staticmethod
+    def init_fingerprinter(static_folder, manifest=None, required=False):
+        if manifest is not None:
+            (static_folder / AssetFingerprinter.MANIFEST_FILENAME).write_text(json.dumps(manifest))
+        fingerprinter = AssetFingerprinter(filesystem_path=f"{static_folder}/")
+        fingerprinter.init_app(Mock(config={"ASSET_PATH": "/static/", "ASSET_MANIFEST_REQUIRED": required}))
+        return fingerprinter
+
+    def test_uses_hash_from_manifest(self, static_folder, mocker):
+        fingerprinter = self.init_fingerprinter(static_folder, {"application.css": "1234"})
+        mock_get_contents = mocker.patch.object(AssetFingerprinter, "get_asset_file_contents")
+
+        assert fingerprinter.get_url("application.css") == "/static/application.css?1234"
+        assert mock_get_contents.called is False
+
+    @pytest.mark.parametrize("manifest", (None, {"other.css": "1234"}))
+    def test_hashes_file_if_not_in_manifest(self, static_folder, manifest):
+        fingerprinter = self.init_fingerprinter(static_folder, manifest)
+
+        assert fingerprinter.get_url("application.css") == (
+            f"/static/application.css?{hashlib.md5(b'body {}').hexdigest()}"
+        )
+
+    def test_raises_if_manifest_required_and_missing(self, static_folder):
+        with pytest.raises(FileNotFoundError):
+            self.init_fingerprinter(static_folder, required=True)
+
+    def test_raises_if_manifest_required_and_asset_not_in_it(self, static_folder):
+        fingerprinter = self.init_fingerprinter(static_folder, {"other.css": "1234"}, required=True)
+
+        with pytest.raises(KeyError):
+            fingerprinter.get_url("application.css")
+
+    @pytest.mark.parametrize("manifest", (None, {"fonts/bold.woff2": "1", "fonts/light.woff2": "2", "other.css": "3"}))
+    def test_get_asset_paths(self, static_folder, manifest):
+        fingerprinter = self.init_fingerprinter(static_folder, manifest)
+
+        assert fingerprinter.get_asset_paths("fonts/*.woff2") == ["fonts/bold.woff2", "fonts/light.woff2"]
@@ -5,6 +5,7 @@ from wtforms import ValidationError
 
 from app.main.validators import (
     CharactersNotAllowed,
+    CommonlyUsedPassword,
     MustContainAlphanumericCharacters,
     NoCommasInPlaceHolders,
     OnlySMSCharacters,
@@ -187,3 +188,25 @@ def test_string_cannot_contain_string_with_custom_error_message():
         StringsNotAllowed("abc", "123", message="No sequences please")(None, _gen_mock_field("abc"))
 
     assert str(error.value) == "No sequences please"
+
+
+@pytest.mark.parametrize(
+    "password, normalise, expected_valid",
+    (
+        ("govuknotify", False, False),
+        ("GOV.UK Notify", False, False),
+        ("correct horse battery staple", False, True),
+        ("P4ssw0rd", False, True),
+        ("P4ssw0rd", True, False),
+        ("FOOTBALL", True, False),
+        ("", False, True),
+    ),
+)
+def test_commonly_used_password(password, normalise, expected_valid):
+    validator = CommonlyUsedPassword(message="Too common", normalise=normalise)
+
+    if expected_valid:
+        validator(None, _gen_mock_field(password))
+    else:
+        with pytest.raises(ValidationError, match="Too common"):
+            validator(None, _gen_mock_field(password))
@@ -599,7 +599,8 @@ def test_broadcast_dashboard_json(
 
     json_response = json.loads(response.get_data(as_text=True))
 
-    assert json_response.keys() == {"current_broadcasts"}
+    assert json_response.keys() == {"current_broadcasts", "poll_interval"}
+    assert json_response["poll_interval"] == 2_000
 
     assert "Waiting for approval" in json_response["current_broadcasts"]
     assert "Live since today at 2:20am" in json_response["current_broadcasts"]
@@ -181,7 +181,7 @@ def test_view_conversation_updates(
         side_effect=HTTPError(response=Mock(status_code=404)),
     )
     mock_get_partials = mocker.patch(
-        "app.main.views.conversation.get_conversation_partials", return_value={"messages": "foo"}
+        "app.main.views.conversation.get_conversation_partials", return_value=({"messages": "foo"}, None)
     )
 
     response = client_request.get_response(
@@ -190,11 +190,38 @@ def test_view_conversation_updates(
         notification_id=fake_uuid,
     )
 
-    assert json.loads(response.get_data(as_text=True)) == {"messages": "foo"}
+    assert json.loads(response.get_data(as_text=True)) == {"messages": "foo", "poll_interval": 60_000}
 
     mock_get_partials.assert_called_once_with(SERVICE_ONE_ID, "07123 456789")
 
 
+@freeze_time("2012-01-01 00:00:00")
+def test_view_conversation_updates_gets_each_side_of_the_conversation_once(
+    client_request,
+    mocker,
+    fake_uuid,
+    mock_get_inbound_sms_by_id_with_no_messages,
+    mock_get_notification,
+    mock_get_inbound_sms,
+):
+    mock_get_notifications = mocker.patch(
+        "app.notification_api_client.get_notifications_for_service",
+        return_value=create_notifications(content="Hello"),
+    )
+
+    response = client_request.get_response(
+        "json_updates.conversation_updates",
+        service_id=SERVICE_ONE_ID,
+        notification_id=fake_uuid,
+    )
+
+    # The most recent message was sent less than a minute ago
+    assert json.loads(response.get_data(as_text=True))["poll_interval"] == 2_000
+
+    mock_get_inbound_sms.assert_called_once_with(SERVICE_ONE_ID, user_number="07123 456789")
+    mock_get_notifications.assert_called_once_with(SERVICE_ONE_ID, to="07123 456789", template_type="sms")
+
+
 @freeze_time("2012-01-01 00:00:00")
 def test_view_conversation_with_empty_inbound(
     client_request,
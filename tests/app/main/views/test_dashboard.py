@@ -412,11 +412,58 @@ def test_view_inbox_updates(
         service_id=SERVICE_ONE_ID,
     )
 
-    assert json.loads(response.get_data(as_text=True)) == {"messages": "foo"}
+    assert json.loads(response.get_data(as_text=True)) == {"messages": "foo", "poll_interval": 60_000}
 
     mock_get_partials.assert_called_once_with(SERVICE_ONE_ID)
 
 
+@freeze_time("2020-01-01 12:00:00")
+@pytest.mark.parametrize(
+    "statuses, most_recent_inbound_sms, expected_poll_interval",
+    (
+        ([], None, 60_000),
+        ([("sms", "delivered"), ("letter", "created")], None, 60_000),
+        ([("sms", "delivered"), ("email", "sending")], None, 2_000),
+        ([("sms", "created")], "2019-12-31T12:00:00.000000Z", 2_000),
+        ([("sms", "delivered")], "2020-01-01T11:58:00.000000Z", 8_000),
+    ),
+)
+def test_service_dashboard_updates_polls_more_often_after_recent_activity(
+    client_request,
+    service_one,
+    mocker,
+    statuses,
+    most_recent_inbound_sms,
+    expected_poll_interval,
+):
+    service_one["permissions"] += ["inbound_sms"]
+
+    mocker.patch(
+        "app.main.views.dashboard.get_dashboard_partials",
+        return_value={"totals": "foo"},
+    )
+    mocker.patch(
+        "app.template_statistics_client.get_template_statistics_for_service",
+        return_value=[
+            {"template_type": template_type, "status": status, "count": 1} for template_type, status in statuses
+        ],
+    )
+    mocker.patch(
+        "app.service_api_client.get_inbound_sms_summary",
+        return_value={"count": 1, "most_recent": most_recent_inbound_sms},
+    )
+
+    response = client_request.get_response(
+        "json_updates.service_dashboard_updates",
+        service_id=SERVICE_ONE_ID,
+    )
+
+    assert json.loads(response.get_data(as_text=True)) == {
+        "totals": "foo",
+        "poll_interval": expected_poll_interval,
+    }
+
+
 @freeze_time("2016-07-01 13:00")
 def test_download_inbox(
     client_request,
@@ -49,3 +49,25 @@ def test_headers_non_ascii_characters_are_replaced(
         " *.notifications.service.gov.uk static-logos??.test.com data:;"
         "frame-src 'self' www.youtube-nocookie.com;"
     )
+
+
+def test_previews_without_personal_details_can_be_kept_by_the_browser(client_request, mocker):
+    mocker.patch(
+        "app.template_previews.http_session.post",
+        return_value=mocker.Mock(content=b"png", status_code=200, headers={}),
+    )
+
+    response = client_request.get_response("no_cookie.letter_branding_preview_image", filename="hm-government")
+
+    assert response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "no-cache, private, must-revalidate"
+
+
+def test_pages_cannot_be_kept_by_the_browser(
+    client_request,
+    mock_get_service_and_organisation_counts,
+):
+    client_request.logout()
+    response = client_request.get_response(".index")
+
+    assert response.headers["Cache-Control"] == "no-store, no-cache, private, must-revalidate"
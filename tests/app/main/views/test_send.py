@@ -19,6 +19,8 @@ from notifications_utils.template import SMSPreviewTemplate
 from xlrd.biffh import XLRDError
 from xlrd.xldate import XLDateAmbiguous, XLDateError, XLDateNegative, XLDateTooLarge
 
+from app.ttl_memory_cache import TTLMemoryCache
+from app.utils.csv import RecipientCSVSummary
 from app.utils.templates import TemplatedLetterImageTemplate
 from tests import (
     sample_uuid,
@@ -37,6 +39,7 @@ from tests.conftest import (
     mock_get_service_letter_template,
     mock_get_service_template,
     normalize_spaces,
+    set_config_values,
 )
 
 template_types = ["email", "sms"]
@@ -3662,6 +3665,132 @@ def test_check_messages_shows_over_max_row_error(
     )
 
 
+def test_check_messages_reuses_validated_upload_for_each_row(
+    client_request,
+    notify_admin,
+    mock_get_service_template,
+    mock_get_users_by_service,
+    mock_get_live_service,
+    mock_get_job_doesnt_exist,
+    mock_get_jobs,
+    mock_s3_get_metadata,
+    mock_s3_set_metadata,
+    mock_s3_download,
+    fake_uuid,
+    mocker,
+):
+    mocker.patch("app.service_api_client.get_notification_count", return_value=0)
+    recipient_csv_cache = TTLMemoryCache(config_prefix="RECIPIENT_CSV_CACHE")
+    with set_config_values(notify_admin, {"RECIPIENT_CSV_CACHE_TTL_IN_SECONDS": 60}):
+        recipient_csv_cache.init_app(notify_admin)
+    mocker.patch("app.main.views.send.recipient_csv_cache", recipient_csv_cache)
+    mock_recipient_csv = mocker.patch("app.main.views.send.RecipientCSV", wraps=RecipientCSV)
+
+    with client_request.session_transaction() as session:
+        session["file_uploads"] = {fake_uuid: {"template_id": fake_uuid}}
+
+    for row_index in (2, 3, 2):
+        client_request.get(
+            "main.check_messages",
+            service_id=SERVICE_ONE_ID,
+            template_id=fake_uuid,
+            upload_id=fake_uuid,
+            row_index=row_index,
+            _test_page_title=False,
+        )
+
+    assert mock_s3_download.call_count == 1
+    assert mock_recipient_csv.call_count == 1
+    assert mock_s3_get_metadata.call_count == 3
+
+    (cached,) = recipient_csv_cache.cache.values()
+    assert isinstance(cached, RecipientCSVSummary)
+    assert not hasattr(cached, "template")
+
+
+def test_check_messages_validates_upload_again_after_more_messages_sent(
+    client_request,
+    notify_admin,
+    mock_get_service_template,
+    mock_get_users_by_service,
+    mock_get_live_service,
+    mock_get_job_doesnt_exist,
+    mock_get_jobs,
+    mock_s3_get_metadata,
+    mock_s3_set_metadata,
+    mock_s3_download,
+    fake_uuid,
+    mocker,
+):
+    mocker.patch("app.service_api_client.get_notification_count", side_effect=[0, 0, 1])
+    recipient_csv_cache = TTLMemoryCache(config_prefix="RECIPIENT_CSV_CACHE")
+    with set_config_values(notify_admin, {"RECIPIENT_CSV_CACHE_TTL_IN_SECONDS": 60}):
+        recipient_csv_cache.init_app(notify_admin)
+    mocker.patch("app.main.views.send.recipient_csv_cache", recipient_csv_cache)
+    mock_recipient_csv = mocker.patch("app.main.views.send.RecipientCSV", wraps=RecipientCSV)
+
+    with client_request.session_transaction() as session:
+        session["file_uploads"] = {fake_uuid: {"template_id": fake_uuid}}
+
+    for _ in range(3):
+        client_request.get(
+            "main.check_messages",
+            service_id=SERVICE_ONE_ID,
+            template_id=fake_uuid,
+            upload_id=fake_uuid,
+            _test_page_title=False,
+        )
+
+    # How many messages can still be sent decides whether the upload has too many rows
+    assert mock_recipient_csv.call_count == 2
+    first_call, second_call = mock_recipient_csv.call_args_list
+    assert first_call.kwargs["remaining_messages"] - 1 == second_call.kwargs["remaining_messages"]
+
+
+def test_check_messages_validates_upload_again_to_preview_row_not_shown(
+    client_request,
+    notify_admin,
+    mock_get_service_template,
+    mock_get_users_by_service,
+    mock_get_live_service,
+    mock_get_job_doesnt_exist,
+    mock_get_jobs,
+    mock_s3_get_metadata,
+    mock_s3_set_metadata,
+    fake_uuid,
+    mocker,
+):
+    mocker.patch("app.service_api_client.get_notification_count", return_value=0)
+    mock_s3_download = mocker.patch(
+        "app.main.views.send.s3download",
+        return_value="phone number\n" + "\n".join(f"0770090{i:04}" for i in range(60)),
+    )
+    recipient_csv_cache = TTLMemoryCache(config_prefix="RECIPIENT_CSV_CACHE")
+    with set_config_values(notify_admin, {"RECIPIENT_CSV_CACHE_TTL_IN_SECONDS": 60}):
+        recipient_csv_cache.init_app(notify_admin)
+    mocker.patch("app.main.views.send.recipient_csv_cache", recipient_csv_cache)
+    mock_recipient_csv = mocker.patch("app.main.views.send.RecipientCSV", wraps=RecipientCSV)
+
+    with client_request.session_transaction() as session:
+        session["file_uploads"] = {fake_uuid: {"template_id": fake_uuid}}
+
+    for row_index in (2, 51, 61):
+        client_request.get(
+            "main.check_messages",
+            service_id=SERVICE_ONE_ID,
+            template_id=fake_uuid,
+            upload_id=fake_uuid,
+            row_index=row_index,
+            _test_page_title=False,
+        )
+
+    (cached,) = recipient_csv_cache.cache.values()
+    assert len(cached.displayed_rows) == 50
+    assert cached.count_of_recipients == 60
+    assert mock_s3_download.call_count == 2
+    assert mock_recipient_csv.call_count == 2
+
+
 @pytest.mark.parametrize("existing_session_items", [{}, {"recipient": "07700900001"}, {"name": "Jo"}])
 def test_check_notification_redirects_if_session_not_populated(
     client_request, service_one, fake_uuid, existing_session_items, mock_get_service_template_with_placeholders
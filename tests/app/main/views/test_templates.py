@@ -3245,9 +3245,9 @@ def test_letter_attachment_preview_image_shows_overlay_when_content_outside_prin
     overlay_expected,
 ):
     mocker.patch(
-        "app.main.views.templates.get_attachment_pdf_and_metadata",
+        "app.main.views.templates.get_attachment_pages_and_metadata",
         return_value=(
-            "pdf_file",
+            ["page 1", "page 2", "page 3"],
             {
                 "message": "content-outside-printable-area",
                 "invalid_pages": invalid_pages,
@@ -3255,10 +3255,10 @@ def test_letter_attachment_preview_image_shows_overlay_when_content_outside_prin
         ),
     )
     template_preview_mock_valid = mocker.patch(
-        "app.main.views.templates.TemplatePreview.from_valid_pdf_file", return_value=make_response("page.html", 200)
+        "app.main.views.templates.TemplatePreview.from_valid_pdf_page", return_value=make_response("page.html", 200)
     )
     template_preview_mock_invalid = mocker.patch(
-        "app.main.views.templates.TemplatePreview.from_invalid_pdf_file", return_value=make_response("page.html", 200)
+        "app.main.views.templates.TemplatePreview.from_invalid_pdf_page", return_value=make_response("page.html", 200)
     )
 
     client_request.get_response(
@@ -3269,8 +3269,10 @@ def test_letter_attachment_preview_image_shows_overlay_when_content_outside_prin
     )
 
     if overlay_expected:
-        template_preview_mock_invalid.assert_called_once_with("pdf_file", page_requested, is_an_attachment=True)
+        template_preview_mock_invalid.assert_called_once_with(
+            f"page {page_requested}", page_requested, is_an_attachment=True
+        )
         assert template_preview_mock_valid.called is False
     else:
-        template_preview_mock_valid.assert_called_once_with("pdf_file", page_requested)
+        template_preview_mock_valid.assert_called_once_with(f"page {page_requested}", page_requested)
         assert template_preview_mock_invalid.called is False
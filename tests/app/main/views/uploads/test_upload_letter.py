@@ -571,9 +571,9 @@ def test_uploaded_letter_preview_image_shows_overlay_when_content_outside_printa
     overlay_expected,
 ):
     mocker.patch(
-        "app.main.views.uploads.get_letter_pdf_and_metadata",
+        "app.main.views.uploads.get_letter_pages_and_metadata",
         return_value=(
-            "pdf_file",
+            ["page 1", "page 2", "page 3"],
             {
                 "message": "content-outside-printable-area",
                 "invalid_pages": invalid_pages,
@@ -581,10 +581,10 @@ def test_uploaded_letter_preview_image_shows_overlay_when_content_outside_printa
         ),
     )
     template_preview_mock_valid = mocker.patch(
-        "app.main.views.uploads.TemplatePreview.from_valid_pdf_file", return_value=make_response("page.html", 200)
+        "app.main.views.uploads.TemplatePreview.from_valid_pdf_page", return_value=make_response("page.html", 200)
     )
     template_preview_mock_invalid = mocker.patch(
-        "app.main.views.uploads.TemplatePreview.from_invalid_pdf_file", return_value=make_response("page.html", 200)
+        "app.main.views.uploads.TemplatePreview.from_invalid_pdf_page", return_value=make_response("page.html", 200)
     )
 
     client_request.get_response(
@@ -595,10 +595,10 @@ def test_uploaded_letter_preview_image_shows_overlay_when_content_outside_printa
     )
 
     if overlay_expected:
-        template_preview_mock_invalid.assert_called_once_with("pdf_file", page_requested)
+        template_preview_mock_invalid.assert_called_once_with(f"page {page_requested}", page_requested)
         assert template_preview_mock_valid.called is False
     else:
-        template_preview_mock_valid.assert_called_once_with("pdf_file", page_requested)
+        template_preview_mock_valid.assert_called_once_with(f"page {page_requested}", page_requested)
         assert template_preview_mock_invalid.called is False
 
 
@@ -617,9 +617,9 @@ def test_uploaded_letter_preview_image_does_not_show_overlay_if_no_content_outsi
     metadata,
     fake_uuid,
 ):
-    mocker.patch("app.main.views.uploads.get_letter_pdf_and_metadata", return_value=("pdf_file", metadata))
+    mocker.patch("app.main.views.uploads.get_letter_pages_and_metadata", return_value=(["page 1"], metadata))
     template_preview_mock = mocker.patch(
-        "app.main.views.uploads.TemplatePreview.from_valid_pdf_file", return_value=make_response("page.html", 200)
+        "app.main.views.uploads.TemplatePreview.from_valid_pdf_page", return_value=make_response("page.html", 200)
     )
 
     client_request.get_response(
@@ -629,7 +629,7 @@ def test_uploaded_letter_preview_image_does_not_show_overlay_if_no_content_outsi
         page=1,
     )
 
-    template_preview_mock.assert_called_once_with("pdf_file", 1)
+    template_preview_mock.assert_called_once_with("page 1", 1)
 
 
 def test_uploaded_letter_preview_image_400s_for_bad_page_type(
@@ -646,6 +646,25 @@ def test_uploaded_letter_preview_image_400s_for_bad_page_type(
     )
 
 
+@pytest.mark.parametrize("page", (0, 2))
+def test_uploaded_letter_preview_image_400s_for_page_not_in_letter(
+    mocker,
+    client_request,
+    fake_uuid,
+    page,
+):
+    mocker.patch("app.main.views.uploads.get_letter_pages_and_metadata", return_value=(["page 1"], {}))
+
+    client_request.get(
+        "main.view_letter_upload_as_preview",
+        file_id=fake_uuid,
+        service_id=SERVICE_ONE_ID,
+        page=page,
+        _test_page_title=False,
+        _expected_status=400,
+    )
+
+
 @pytest.mark.parametrize(
     "address, post_data, expected_postage",
     (
@@ -694,7 +713,6 @@ def test_send_uploaded_letter_sends_letter_and_redirects_to_notification_page(
         }
     )
 
-    mocker.patch("app.main.views.uploads.get_letter_pdf_and_metadata", return_value=("file", metadata))
     mock_send = mocker.patch("app.main.views.uploads.notification_api_client.send_precompiled_letter")
     mocker.patch("app.main.views.uploads.get_letter_metadata", return_value=metadata)
 
@@ -757,7 +775,6 @@ def test_send_uploaded_letter_when_service_does_not_have_correct_permissions(
     permissions,
     fake_uuid,
 ):
-    mocker.patch("app.main.views.uploads.get_letter_pdf_and_metadata", return_value=("file", {"status": "valid"}))
     mock_send = mocker.patch("app.main.views.uploads.notification_api_client.send_precompiled_letter")
 
     service_one["permissions"] = permissions
@@ -1,4 +1,5 @@
 import pytest
+from werkzeug.exceptions import NotFound
 
 from app.models.organisation import Organisation
 from app.models.service import Service
@@ -105,3 +106,35 @@ def test_has_templates_of_type_includes_folders(
     mocker.patch("app.template_folder_api_client.get_template_folders", return_value=[create_folder(id="something")])
 
     assert Service(service_one).has_templates_of_type("sms")
+
+
+def test_get_template_folder_path(mocker, service_one):
+    mocker.patch(
+        "app.template_folder_api_client.get_template_folders",
+        return_value=[
+            {"id": "child", "parent_id": "parent", "name": "Child"},
+            {"id": "grandchild", "parent_id": "child", "name": "Grandchild"},
+            {"id": "parent", "parent_id": None, "name": "Parent"},
+        ],
+    )
+    service = Service(service_one)
+
+    assert [folder["name"] for folder in service.get_template_folder_path("grandchild")] == [
+        "Templates",
+        "Parent",
+        "Child",
+        "Grandchild",
+    ]
+    assert [folder["name"] for folder in service.get_template_folder_path("child")] == [
+        "Templates",
+        "Parent",
+        "Child",
+    ]
+    assert [folder["name"] for folder in service.get_template_folder_path(None)] == ["Templates"]
+
+
+def test_get_template_folder_404s_for_unknown_folder(mocker, service_one):
+    mocker.patch("app.template_folder_api_client.get_template_folders", return_value=[create_folder(id="something")])
+
+    with pytest.raises(NotFound):
+        Service(service_one).get_template_folder("something-else")
@@ -3,8 +3,14 @@ import uuid
 import pytest
 
 from app.models.service import Service
-from app.models.template_list import TemplateList, UserTemplateList
+from app.models.template_list import (
+    TemplateFolderTree,
+    TemplateList,
+    UserTemplateList,
+    UserTemplateLists,
+)
 from app.models.user import User
+from tests.conftest import SERVICE_ONE_ID, SERVICE_TWO_ID
 
 INV_PARENT_FOLDER_ID = "7e979e79-d970-43a5-ac69-b625a8d147b0"
 INV_CHILD_1_FOLDER_ID = "92ee1ee0-e4ee-4dcc-b1a7-a5da9ebcfa2b"
@@ -104,3 +110,89 @@ def test_template_list_yields_all_folders_without_user(
         "2's Visible grandchild",
         "2's Visible child",
     )
+
+
+def test_template_folder_tree_counts_templates_in_sub_folders():
+    folders = [
+        {"id": "grandchild", "parent_id": "child"},
+        {"id": "child", "parent_id": "parent"},
+        {"id": "parent", "parent_id": None},
+        {"id": "empty", "parent_id": None},
+    ]
+    templates = [
+        {"id": "1", "template_type": "sms", "folder": "grandchild"},
+        {"id": "2", "template_type": "sms", "folder": "child"},
+        {"id": "3", "template_type": "email", "folder": "parent"},
+        {"id": "4", "template_type": "letter", "folder": None},
+    ]
+
+    tree = TemplateFolderTree(templates, folders)
+
+    assert [folder["id"] for folder in tree.get_folders(None)] == ["parent", "empty"]
+    assert [template["id"] for template in tree.get_templates("all", "child")] == ["2"]
+    assert [template["id"] for template in tree.get_templates("email", "child")] == []
+    assert [template["id"] for template in tree.get_templates("letter", None)] == ["4"]
+    assert {
+        folder["id"]: (tree.count_templates("sms", folder["id"]), tree.count_templates("email", folder["id"]))
+        for folder in folders
+    } == {
+        "grandchild": (1, 0),
+        "child": (2, 0),
+        "parent": (2, 1),
+        "empty": (0, 0),
+    }
+
+
+@pytest.mark.parametrize(
+    "template_type, expected_folder_names",
+    (
+        ("all", ("Invisible folder", "Parent 1 - invisible", "Parent 2 - visible")),
+        ("sms", ("Parent 2 - visible",)),
+        ("email", ()),
+    ),
+)
+def test_template_list_only_yields_folders_with_templates_of_type(
+    mock_get_hierarchy_of_folders,
+    mock_get_service_templates,
+    service_one,
+    template_type,
+    expected_folder_names,
+):
+    mock_get_service_templates.side_effect = None
+    mock_get_service_templates.return_value = {
+        "data": [
+            {
+                "id": str(uuid.uuid4()),
+                "name": "Template",
+                "template_type": "sms",
+                "folder": INV_CHILD_2_FOLDER_ID,
+            }
+        ]
+    }
+    service = Service(service_one)
+
+    result_folder_names = tuple(
+        result.name
+        for result in TemplateList(service=service, template_type=template_type)
+        if result.is_folder and not result.ancestors
+    )
+
+    assert result_folder_names == expected_folder_names
+
+
+def test_user_template_lists_prefetches_templates_and_folders_for_every_service(
+    notify_admin,
+    mocker,
+    service_one,
+    service_two,
+    mock_get_service_templates,
+    mock_get_template_folders,
+):
+    mock_prefetch_templates = mocker.patch("app.service_api_client.prefetch_service_templates")
+    mock_prefetch_folders = mocker.patch("app.template_folder_api_client.prefetch_template_folders")
+    user = mocker.Mock(services=[Service(service_two), Service(service_one)])
+
+    list(UserTemplateLists(user))
+
+    mock_prefetch_templates.assert_called_once_with([SERVICE_ONE_ID, SERVICE_TWO_ID])
+    mock_prefetch_folders.assert_called_once_with([SERVICE_ONE_ID, SERVICE_TWO_ID])
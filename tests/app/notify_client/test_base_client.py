@@ -1,4 +1,11 @@
-from app.notify_client import NotifyAdminAPIClient
+from unittest.mock import Mock
+
+import pytest
+
+from app.extensions import redis_client
+from app.in_process_cache import InProcessCache
+from app.notify_client import NotifyAdminAPIClient, RequestMemo, cache
+from tests.conftest import set_config_values
 
 
 class TestBaseClient:
@@ -41,3 +48,189 @@ class TestBaseClient:
         request_kwargs = perform_request_mock.call_args_list[-1][0][2]
         headers = request_kwargs["headers"]
         assert headers["X-Notify-User-Id"] == str(fake_uuid)
+
+    def test_repeated_get_in_same_request_only_calls_api_once(self, notify_admin, mocker):
+        api_client = NotifyAdminAPIClient()
+        api_client.init_app(notify_admin)
+        perform_request_mock = mocker.patch.object(api_client, "_perform_request")
+        perform_request_mock.return_value.json.return_value = {"data": {"foo": "bar"}}
+
+        with notify_admin.test_request_context():
+            first_response = api_client.get("/mocked-request", params={"a": 1})
+            first_response["data"]["foo"] = "qux"
+            second_response = api_client.get("/mocked-request", params={"a": 1})
+            second_response["data"]["foo"] = "baz"
+            third_response = api_client.get("/mocked-request", params={"a": 1})
+            api_client.get("/mocked-request", params={"a": 2})
+
+            assert RequestMemo.get_for_request().duplicates_avoided == 2
+
+        assert third_response == {"data": {"foo": "bar"}}
+        assert [call[0][2]["params"] for call in perform_request_mock.call_args_list] == [{"a": 1}, {"a": 2}]
+
+    def test_get_is_not_memoised_outside_request_context(self, notify_admin, mocker):
+        api_client = NotifyAdminAPIClient()
+        api_client.init_app(notify_admin)
+        perform_request_mock = mocker.patch.object(api_client, "_perform_request")
+
+        api_client.get("/mocked-request")
+        api_client.get("/mocked-request")
+
+        assert perform_request_mock.call_count == 2
+
+    @pytest.mark.parametrize("method", ["post", "put", "delete"])
+    def test_writes_clear_memoised_responses(self, notify_admin, mocker, method):
+        api_client = NotifyAdminAPIClient()
+        api_client.init_app(notify_admin)
+        perform_request_mock = mocker.patch.object(api_client, "_perform_request")
+
+        with notify_admin.test_request_context():
+            api_client.get("/mocked-request")
+            getattr(api_client, method)("/mocked-request", data={})
+            api_client.get("/mocked-request")
+
+        assert [call[0][0] for call in perform_request_mock.call_args_list] == ["GET", method.upper(), "GET"]
+
+    def test_read_only_posts_dont_clear_memoised_responses(self, notify_admin, mocker):
+        api_client = NotifyAdminAPIClient()
+        api_client.init_app(notify_admin)
+        perform_request_mock = mocker.patch.object(api_client, "_perform_request")
+
+        with notify_admin.test_request_context():
+            api_client.get("/mocked-request")
+            api_client.request("POST", "/mocked-search", data={"phone_number": "07700900000"}, read_only=True)
+            api_client.request("POST", "/mocked-search", data={"phone_number": "07700900000"}, read_only=True)
+            api_client.get("/mocked-request")
+
+        assert [call[0][0] for call in perform_request_mock.call_args_list] == ["GET", "POST", "POST"]
+
+    def test_cache_set_methods_are_only_memoised_once(self, notify_admin, mocker):
+        mocker.patch("app.extensions.RedisClient.get", return_value=None)
+        mocker.patch("app.extensions.RedisClient.set")
+
+        class ExampleClient(NotifyAdminAPIClient):
+            @cache.set("thing-{thing_id}")
+            def get_thing(self, thing_id):
+                return self.get(f"/thing/{thing_id}")
+
+        api_client = ExampleClient()
+        api_client.init_app(notify_admin)
+        perform_request_mock = mocker.patch.object(api_client, "_perform_request")
+        perform_request_mock.return_value.json.return_value = {"id": "1"}
+
+        with notify_admin.test_request_context():
+            assert api_client.get_thing("1") == {"id": "1"}
+            assert api_client.get_thing("1") == {"id": "1"}
+
+            assert list(RequestMemo.get_for_request().responses) == [cache._memo_key("thing-{thing_id}", ("1",), {})]
+
+        assert perform_request_mock.call_count == 1
+
+    def test_cache_delete_clears_memoised_responses(self, notify_admin, mocker):
+        mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=None)
+        mocker.patch("app.extensions.RedisClient.set")
+        mocker.patch("app.extensions.RedisClient.delete")
+
+        class ExampleClient(NotifyAdminAPIClient):
+            @cache.set("thing-{thing_id}")
+            def get_thing(self, thing_id):
+                return {"id": thing_id}
+
+            @cache.delete("thing-{thing_id}")
+            def forget_thing(self, thing_id):
+                pass
+
+        api_client = ExampleClient()
+
+        with notify_admin.test_request_context():
+            assert api_client.get_thing("1") == {"id": "1"}
+            assert api_client.get_thing("1") == {"id": "1"}
+            assert mock_redis_get.call_count == 1
+
+            api_client.forget_thing("1")
+
+            assert api_client.get_thing("1") == {"id": "1"}
+            assert mock_redis_get.call_count == 2
+
+    def test_cache_set_in_process_keeps_responses_in_memory_until_deleted(self, notify_admin, mocker):
+        mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=None)
+        mocker.patch("app.extensions.RedisClient.set")
+        mocker.patch("app.extensions.RedisClient.delete")
+        mock_redis_store = Mock()
+        in_process_cache = InProcessCache(Mock(active=True, redis_store=mock_redis_store))
+        with set_config_values(notify_admin, {"IN_PROCESS_CACHE_TTL_IN_SECONDS": 5}):
+            in_process_cache.init_app(notify_admin)
+        mocker.patch("app.notify_client.in_process_cache", in_process_cache)
+        mock_counter = mocker.patch("app.notify_client.REQUEST_CACHE_TOTAL")
+
+        class ExampleClient(NotifyAdminAPIClient):
+            @cache.set("thing-{thing_id}", in_process=True)
+            def get_thing(self, thing_id):
+                return {"id": thing_id}
+
+            @cache.delete("thing-{thing_id}")
+            def forget_thing(self, thing_id):
+                pass
+
+        api_client = ExampleClient()
+
+        assert api_client.get_thing("1") == {"id": "1"}
+        assert api_client.get_thing(thing_id="1") == {"id": "1"}
+        assert mock_redis_get.call_count == 1
+
+        api_client.forget_thing("1")
+
+        mock_redis_store.publish.assert_called_once_with(
+            InProcessCache.INVALIDATION_CHANNEL, '{"keys": ["thing-1"], "patterns": []}'
+        )
+        assert api_client.get_thing("1") == {"id": "1"}
+        assert mock_redis_get.call_count == 2
+        assert [call[1] for call in mock_counter.labels.call_args_list] == [
+            {"key_format": "thing-{thing_id}", "result": "miss"},
+            {"key_format": "thing-{thing_id}", "result": "in_process_hit"},
+            {"key_format": "thing-{thing_id}", "result": "miss"},
+        ]
+
+    def test_cache_set_counts_responses_from_redis(self, notify_admin, mocker):
+        mocker.patch("app.extensions.RedisClient.get", return_value=b'{"id": "1"}')
+        mock_counter = mocker.patch("app.notify_client.REQUEST_CACHE_TOTAL")
+
+        class ExampleClient(NotifyAdminAPIClient):
+            @cache.set("thing-{thing_id}", in_process=True)
+            def get_thing(self, thing_id):
+                raise AssertionError("Should have come from Redis")
+
+        assert ExampleClient().get_thing("1") == {"id": "1"}
+        mock_counter.labels.assert_called_once_with(key_format="thing-{thing_id}", result="redis_hit")
+
+    def test_prefetch_gets_everything_cached_in_one_go_and_fetches_the_rest(self, notify_admin, mocker):
+        mocker.patch.object(redis_client, "active", True)
+        mock_redis_store = mocker.patch.object(redis_client, "redis_store")
+        mock_redis_store.mget.return_value = ['{"id": "1", "cached": true}', None]
+        mock_redis_get = mocker.patch("app.extensions.RedisClient.get", return_value=None)
+        mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+
+        class ExampleClient(NotifyAdminAPIClient):
+            @cache.set("thing-{thing_id}")
+            def get_thing(self, thing_id):
+                return {"id": thing_id, "cached": False}
+
+        api_client = ExampleClient()
+
+        with notify_admin.test_request_context():
+            cache.prefetch("thing-{thing_id}", api_client.get_thing, "thing_id", ["1", "2", "1"])
+
+            mock_redis_store.mget.assert_called_once_with(["thing-1", "thing-2"])
+            mock_redis_get.assert_called_once_with("thing-2")
+            assert mock_redis_set.call_args[0][0] == "thing-2"
+
+            assert api_client.get_thing("1") == {"id": "1", "cached": True}
+            assert api_client.get_thing("2") == {"id": "2", "cached": False}
+            assert mock_redis_get.call_count == 1
+
+    def test_prefetch_does_nothing_outside_request_context(self, notify_admin, mocker):
+        mock_get_thing = mocker.Mock()
+
+        cache.prefetch("thing-{thing_id}", mock_get_thing, "thing_id", ["1", "2"])
+
+        assert mock_get_thing.call_args_list == []
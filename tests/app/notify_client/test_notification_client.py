@@ -62,9 +62,20 @@ def test_client_gets_notifications_for_service_and_job_by_page(mocker, arguments
 )
 def test_client_gets_notifications_for_service_and_job_by_page_posts_for_to(mocker, arguments, expected_call):
 
-    mock_post = mocker.patch("app.notify_client.notification_api_client.NotificationApiClient.post")
+    mock_request = mocker.patch("app.notify_client.notification_api_client.NotificationApiClient.request")
     NotificationApiClient().get_notifications_for_service("abcd1234", **arguments)
-    mock_post.assert_called_once_with(**expected_call)
+    mock_request.assert_called_once_with("POST", expected_call["url"], data=expected_call["data"], read_only=True)
+
+
+def test_client_does_not_memoise_pages_of_notifications_for_csv(mocker):
+    mock_request = mocker.patch("app.notify_client.notification_api_client.NotificationApiClient.request")
+    NotificationApiClient().get_notifications_for_service("abcd1234", page=2, format_for_csv=True)
+    mock_request.assert_called_once_with(
+        "GET",
+        "/service/abcd1234/notifications",
+        params={"page": 2, "format_for_csv": True},
+        memoise=False,
+    )
 
 
 def test_send_notification(mocker, client_request, active_user_with_permissions):
@@ -1,6 +1,11 @@
 from unittest.mock import Mock
 
-from app.s3_client.s3_csv_client import set_metadata_on_csv_upload
+import pytest
+
+from app.s3_client.s3_csv_client import (
+    s3download,
+    set_metadata_on_csv_upload,
+)
 
 
 def test_sets_metadata(client_request, mocker):
@@ -19,3 +24,35 @@ def test_sets_metadata(client_request, mocker):
         MetadataDirective="REPLACE",
         ServerSideEncryption="AES256",
     )
+
+
+@pytest.fixture
+def mock_csv_upload_in_chunks(mocker):
+    def _mock(contents, chunk_size):
+        data = contents.encode("utf-8")
+        mocked_s3_object = Mock()
+        mocked_s3_object.get.return_value = {
+            "Body": Mock(
+                iter_chunks=Mock(
+                    return_value=(data[start : start + chunk_size] for start in range(0, len(data), chunk_size))
+                )
+            )
+        }
+        return mocker.patch("app.s3_client.s3_csv_client.get_csv_upload", return_value=mocked_s3_object)
+
+    return _mock
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 3, 1024))
+@pytest.mark.parametrize(
+    "contents",
+    (
+        "",
+        "phone number,name\r\n07700 900123,Zoë\r\n07700 900456,Chloé",
+        "email address\ntest@example.com\n",
+    ),
+)
+def test_s3download_decodes_in_chunks(client_request, mock_csv_upload_in_chunks, contents, chunk_size):
+    mock_csv_upload_in_chunks(contents, chunk_size)
+
+    assert s3download("1234", "5678") == contents
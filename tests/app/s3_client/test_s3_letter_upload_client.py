@@ -1,19 +1,25 @@
 import urllib
 import uuid
+from io import BytesIO
 
 import boto3
 import botocore
 import pytest
 from flask import current_app
 from moto import mock_s3
+from pypdf import PdfReader
 
 from app.s3_client.s3_letter_upload_client import (
     LetterMetadata,
     LetterNotFoundError,
     backup_original_letter_to_s3,
     get_letter_metadata,
+    get_letter_pages_and_metadata,
+    split_pdf_into_pages,
     upload_letter_to_s3,
 )
+from app.ttl_memory_cache import TTLMemoryCache
+from tests.conftest import set_config_values
 
 
 def test_backup_original_letter_to_s3(mocker, notify_admin):
@@ -117,3 +123,42 @@ def test_get_letter_s3_object_raises_custom_error(will_raise_custom_error, expec
 
     with pytest.raises(expected_exception):
         get_letter_metadata("service", "file")
+
+
+def test_split_pdf_into_pages():
+    with open("tests/test_pdf_files/multi_page_pdf.pdf", "rb") as file:
+        pdf_file = file.read()
+
+    pages = split_pdf_into_pages(pdf_file)
+
+    assert len(pages) == len(PdfReader(BytesIO(pdf_file)).pages) > 1
+    for page, original_page in zip(pages, PdfReader(BytesIO(pdf_file)).pages):
+        assert len(PdfReader(BytesIO(page)).pages) == 1
+        assert PdfReader(BytesIO(page)).pages[0].extract_text() == original_page.extract_text()
+
+
+def test_get_letter_pages_and_metadata_only_downloads_and_splits_letter_once(notify_admin, mocker):
+    with open("tests/test_pdf_files/one_page_pdf.pdf", "rb") as file:
+        pdf_file = file.read()
+
+    mock_get_pdf = mocker.patch(
+        "app.s3_client.s3_letter_upload_client.get_letter_pdf_and_metadata",
+        return_value=(pdf_file, {"status": "valid"}),
+    )
+    mock_split = mocker.patch(
+        "app.s3_client.s3_letter_upload_client.split_pdf_into_pages",
+        wraps=split_pdf_into_pages,
+    )
+
+    letter_upload_cache = TTLMemoryCache(config_prefix="LETTER_UPLOAD_CACHE")
+    with set_config_values(notify_admin, {"LETTER_UPLOAD_CACHE_TTL_IN_SECONDS": 60}):
+        letter_upload_cache.init_app(notify_admin)
+    mocker.patch("app.s3_client.s3_letter_upload_client.letter_upload_cache", letter_upload_cache)
+
+    for _ in range(3):
+        pages, metadata = get_letter_pages_and_metadata("abc", "def")
+
+    assert len(pages) == 1
+    assert metadata == {"status": "valid"}
+    mock_get_pdf.assert_called_once_with("abc", "def")
+    mock_split.assert_called_once_with(pdf_file)
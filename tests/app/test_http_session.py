@@ -0,0 +1,67 @@
+from http.client import HTTPMessage
+from unittest.mock import Mock
+
+import pytest
+import requests
+from requests.cookies import extract_cookies_to_jar
+
+from app.http_session import PooledHTTPSession
+from tests.conftest import set_config_values
+
+
+def test_init_app_mounts_pooled_adapter(notify_admin):
+    http_session = PooledHTTPSession()
+
+    with set_config_values(notify_admin, {"HTTP_POOL_CONNECTIONS": 3, "HTTP_POOL_MAXSIZE": 7}):
+        http_session.init_app(notify_admin)
+
+    for prefix in ("http://", "https://"):
+        adapter = http_session.session.get_adapter(prefix)
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+
+    assert http_session.session.get_adapter("http://") is http_session.session.get_adapter("https://")
+
+
+def test_session_does_not_keep_cookies(notify_admin):
+    http_session = PooledHTTPSession()
+    http_session.init_app(notify_admin)
+    headers = HTTPMessage()
+    headers["Set-Cookie"] = "session=someone-elses; Path=/"
+    request = requests.Request("GET", "https://example.com/").prepare()
+
+    extract_cookies_to_jar(http_session.session.cookies, request, Mock(_original_response=Mock(msg=headers)))
+
+    assert list(http_session.session.cookies) == []
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected_timeout",
+    [
+        ({}, (5, 120)),
+        ({"timeout": 1}, 1),
+    ],
+)
+def test_request_uses_default_timeout_unless_given(notify_admin, mocker, kwargs, expected_timeout):
+    http_session = PooledHTTPSession()
+    http_session.init_app(notify_admin)
+    mock_request = mocker.patch.object(http_session.session, "request")
+
+    http_session.post("https://example.com", data="foo", **kwargs)
+
+    mock_request.assert_called_once_with("POST", "https://example.com", data="foo", timeout=expected_timeout)
+
+
+def test_api_client_requests_go_through_shared_session(notify_admin, mocker):
+    from app.notify_client import NotifyAdminAPIClient
+
+    api_client = NotifyAdminAPIClient()
+    api_client.init_app(notify_admin)
+    mock_request = mocker.patch("app.notify_client.http_session.request")
+    mock_request.return_value.status_code = 200
+    mock_request.return_value.json.return_value = {"foo": "bar"}
+
+    assert api_client.get("/foo") == {"foo": "bar"}
+
+    assert mock_request.call_args[0] == ("GET", "http://you-forgot-to-mock-an-api-call-to/foo")
+    assert mock_request.call_args[1]["timeout"] == (5, 30)
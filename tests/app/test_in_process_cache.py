@@ -0,0 +1,104 @@
+import json
+from unittest.mock import Mock
+
+from app.in_process_cache import InProcessCache
+from tests.conftest import set_config_values
+
+
+def _enabled_in_process_cache(notify_admin, redis_client=None):
+    in_process_cache = InProcessCache(redis_client or Mock(active=True))
+
+    with set_config_values(notify_admin, {"IN_PROCESS_CACHE_TTL_IN_SECONDS": 5}):
+        in_process_cache.init_app(notify_admin)
+
+    return in_process_cache
+
+
+def test_calls_every_time_if_ttl_is_zero(notify_admin):
+    redis_client = Mock(active=True)
+    in_process_cache = InProcessCache(redis_client)
+    in_process_cache.init_app(notify_admin)
+    get_user = Mock(return_value={"id": "1"})
+
+    assert in_process_cache.get_or_call("user-1", get_user) == ({"id": "1"}, False)
+    assert in_process_cache.get_or_call("user-1", get_user) == ({"id": "1"}, False)
+
+    assert get_user.call_count == 2
+    assert redis_client.redis_store.pubsub.call_args_list == []
+
+
+def test_does_nothing_if_redis_is_disabled(notify_admin):
+    in_process_cache = _enabled_in_process_cache(notify_admin, Mock(active=False))
+
+    assert not in_process_cache.enabled
+
+
+def test_does_nothing_if_it_cant_subscribe_to_invalidations(notify_admin):
+    redis_client = Mock(active=True)
+    redis_client.redis_store.pubsub.side_effect = ConnectionError
+
+    in_process_cache = _enabled_in_process_cache(notify_admin, redis_client)
+
+    assert not in_process_cache.enabled
+
+
+def test_subscribes_to_invalidations_in_a_thread(notify_admin):
+    redis_client = Mock(active=True)
+
+    in_process_cache = _enabled_in_process_cache(notify_admin, redis_client)
+
+    pubsub = redis_client.redis_store.pubsub.return_value
+    pubsub.subscribe.assert_called_once_with(
+        **{InProcessCache.INVALIDATION_CHANNEL: in_process_cache._handle_invalidation}
+    )
+    assert pubsub.run_in_thread.call_args[1]["daemon"] is True
+    assert in_process_cache.subscriber == pubsub.run_in_thread.return_value
+
+
+def test_caches_copies_of_responses(notify_admin):
+    in_process_cache = _enabled_in_process_cache(notify_admin)
+    get_user = Mock(side_effect=lambda user_id: {"id": user_id})
+
+    first_response, _ = in_process_cache.get_or_call("user-1", get_user, "1")
+    first_response["id"] = "modified"
+
+    assert in_process_cache.get_or_call("user-1", get_user, "1") == ({"id": "1"}, True)
+    assert in_process_cache.get_or_call("user-2", get_user, "2") == ({"id": "2"}, False)
+    assert get_user.call_count == 2
+
+
+def test_evict_forgets_keys_and_tells_other_processes(notify_admin):
+    redis_client = Mock(active=True)
+    in_process_cache = _enabled_in_process_cache(notify_admin, redis_client)
+    in_process_cache.get_or_call("user-1", Mock(return_value={}))
+    in_process_cache.get_or_call("user-2", Mock(return_value={}))
+
+    in_process_cache.evict(keys=["user-1"])
+
+    assert list(in_process_cache.cache) == ["user-2"]
+    redis_client.redis_store.publish.assert_called_once_with(
+        InProcessCache.INVALIDATION_CHANNEL, json.dumps({"keys": ["user-1"], "patterns": []})
+    )
+
+
+def test_invalidations_from_other_processes_forget_matching_keys(notify_admin):
+    in_process_cache = _enabled_in_process_cache(notify_admin)
+    for key in ("user-1", "service-1", "service-2"):
+        in_process_cache.get_or_call(key, Mock(return_value={}))
+
+    in_process_cache._handle_invalidation({"data": b'{"keys": ["user-1"], "patterns": ["service-?"]}'})
+    in_process_cache._handle_invalidation({"data": "not json"})
+
+    assert list(in_process_cache.cache) == []
+
+
+def test_does_not_cache_response_fetched_while_it_was_being_invalidated(notify_admin):
+    in_process_cache = _enabled_in_process_cache(notify_admin)
+
+    def get_user():
+        # Another process changes the user while we’re fetching the old version
+        in_process_cache._handle_invalidation({"data": '{"keys": ["user-1"]}'})
+        return {"name": "Old name"}
+
+    assert in_process_cache.get_or_call("user-1", get_user) == ({"name": "Old name"}, False)
+    assert "user-1" not in in_process_cache.cache
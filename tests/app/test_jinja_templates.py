@@ -1,11 +1,16 @@
+import stat
 from itertools import chain
 from pathlib import Path
 
 import pytest
 from flask import current_app
+from jinja2 import FileSystemBytecodeCache
 from jinja2.nodes import Call, FromImport, Name
 from orderedset import OrderedSet
 
+from app import get_jinja_bytecode_cache, precompile_jinja_templates
+from tests.conftest import set_config_values
+
 
 class UnusedJinjaImports(Exception):
     def __init__(self, unused_imports, file):
@@ -32,3 +37,49 @@ def test_for_unused_jinja_imports(client_request, file):
 
     if unused_imports := imports - calls:
         raise UnusedJinjaImports(unused_imports, file)
+
+
+def test_precompile_jinja_templates_compiles_all_templates(notify_admin):
+    count, seconds = precompile_jinja_templates(notify_admin)
+
+    # As well as our own templates, there are the ones from GOV.UK Frontend
+    assert count > len(files)
+    assert seconds >= 0
+
+
+def test_get_jinja_bytecode_cache(notify_admin, tmp_path):
+    directory = tmp_path / "jinja"
+
+    with set_config_values(
+        notify_admin, {"USE_JINJA_BYTECODE_CACHE": True, "JINJA_BYTECODE_CACHE_DIR": str(directory)}
+    ):
+        bytecode_cache = get_jinja_bytecode_cache(notify_admin)
+
+    assert isinstance(bytecode_cache, FileSystemBytecodeCache)
+    assert bytecode_cache.directory == str(directory)
+    assert directory.is_dir()
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+
+
+def test_get_jinja_bytecode_cache_uses_jinjas_private_directory_by_default(notify_admin):
+    with set_config_values(notify_admin, {"USE_JINJA_BYTECODE_CACHE": True, "JINJA_BYTECODE_CACHE_DIR": None}):
+        bytecode_cache = get_jinja_bytecode_cache(notify_admin)
+
+    assert isinstance(bytecode_cache, FileSystemBytecodeCache)
+    assert bytecode_cache.directory == FileSystemBytecodeCache().directory
+
+
+def test_get_jinja_bytecode_cache_refuses_directory_others_can_write_to(notify_admin, tmp_path):
+    directory = tmp_path / "jinja"
+    directory.mkdir()
+    directory.chmod(0o777)
+
+    with set_config_values(
+        notify_admin, {"USE_JINJA_BYTECODE_CACHE": True, "JINJA_BYTECODE_CACHE_DIR": str(directory)}
+    ):
+        with pytest.raises(RuntimeError):
+            get_jinja_bytecode_cache(notify_admin)
+
+
+def test_get_jinja_bytecode_cache_returns_none_if_not_used(notify_admin):
+    assert get_jinja_bytecode_cache(notify_admin) is None
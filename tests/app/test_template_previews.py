@@ -9,11 +9,12 @@ from notifications_utils.template import LetterPreviewTemplate
 from app import load_service_before_request
 from app.models.branding import LetterBranding
 from app.template_previews import (
+    LetterAttachmentPreview,
     TemplatePreview,
     get_page_count_for_letter,
     sanitise_letter,
 )
-from tests.conftest import create_notification
+from tests.conftest import create_notification, set_config_values
 
 
 @pytest.mark.parametrize(
@@ -73,7 +74,7 @@ def test_from_database_object_makes_request(
     load_service_before_request()
 
     request_mock_returns = Mock(content="a", status_code="b", headers={"content-type": "image/png"})
-    request_mock = mocker.patch("app.template_previews.requests.post", return_value=request_mock_returns)
+    request_mock = mocker.patch("app.template_previews.http_session.post", return_value=request_mock_returns)
     mocker.patch("app.template_previews.current_service", letter_branding=letter_branding)
     template = mock_get_service_letter_template("123", "456")["data"]
 
@@ -100,7 +101,7 @@ def test_from_notification_has_correct_args(mocker, client_request):
     load_service_before_request()
 
     request_mock_returns = Mock(content="a", status_code="b", headers={"content-type": "image/png"})
-    request_mock = mocker.patch("app.template_previews.requests.post", return_value=request_mock_returns)
+    request_mock = mocker.patch("app.template_previews.http_session.post", return_value=request_mock_returns)
     mocker.patch("app.template_previews.current_service", letter_branding=LetterBranding({"filename": "hm-government"}))
 
     notification = create_notification(
@@ -145,14 +146,13 @@ def test_from_notification_rejects_precompiled_templates(mocker):
         ("2", "http://localhost:9999/precompiled-preview.png"),
     ],
 )
-def test_from_valid_pdf_file_makes_request(mocker, client_request, page_number, expected_url):
-    mocker.patch("app.template_previews.extract_page_from_pdf", return_value=b"pdf page")
+def test_from_valid_pdf_page_makes_request(mocker, client_request, page_number, expected_url):
     request_mock = mocker.patch(
-        "app.template_previews.requests.post",
+        "app.template_previews.http_session.post",
         return_value=Mock(content="a", status_code="b", headers={"content-type": "image/png"}),
     )
 
-    response = TemplatePreview.from_valid_pdf_file(b"pdf file", page_number)
+    response = TemplatePreview.from_valid_pdf_page(b"pdf page", page_number)
 
     assert response == ("a", "b", {"content-type": "image/png"}.items())
     request_mock.assert_called_once_with(
@@ -162,14 +162,13 @@ def test_from_valid_pdf_file_makes_request(mocker, client_request, page_number,
     )
 
 
-def test_from_invalid_pdf_file_makes_request(mocker, client_request):
-    mocker.patch("app.template_previews.extract_page_from_pdf", return_value=b"pdf page")
+def test_from_invalid_pdf_page_makes_request(mocker, client_request):
     request_mock = mocker.patch(
-        "app.template_previews.requests.post",
+        "app.template_previews.http_session.post",
         return_value=Mock(content="a", status_code="b", headers={"content-type": "image/png"}),
     )
 
-    response = TemplatePreview.from_invalid_pdf_file(b"pdf file", "1")
+    response = TemplatePreview.from_invalid_pdf_page(b"pdf page", "1")
 
     assert response == ("a", "b", {"content-type": "image/png"}.items())
     request_mock.assert_called_once_with(
@@ -207,7 +206,7 @@ def test_page_count_unpacks_from_json_response(
 
 
 def test_from_example_template_makes_request(mocker, client_request):
-    request_mock = mocker.patch("app.template_previews.requests.post")
+    request_mock = mocker.patch("app.template_previews.http_session.post")
     template = {}
     filename = "geo"
 
@@ -228,7 +227,7 @@ def test_sanitise_letter_calls_template_preview_sanitise_endpoint_with_file(
     query_param_value,
     fake_uuid,
 ):
-    request_mock = mocker.patch("app.template_previews.requests.post")
+    request_mock = mocker.patch("app.template_previews.http_session.post")
 
     sanitise_letter("pdf_data", upload_id=fake_uuid, allow_international_letters=allow_international_letters)
 
@@ -248,7 +247,7 @@ def test_sanitise_letter_calls_template_preview_sanitise_endpoint_with_file_for_
     client_request,
     fake_uuid,
 ):
-    request_mock = mocker.patch("app.template_previews.requests.post")
+    request_mock = mocker.patch("app.template_previews.http_session.post")
 
     sanitise_letter("pdf_data", upload_id=fake_uuid, allow_international_letters=False, is_an_attachment=True)
 
@@ -262,3 +261,125 @@ def test_sanitise_letter_calls_template_preview_sanitise_endpoint_with_file_for_
     request_mock.assert_called_once_with(
         expected_url, headers={"Authorization": "Token my-secret-key"}, data="pdf_data"
     )
+
+
+def test_from_example_template_caches_previews(notify_admin, mocker):
+    request_mock = mocker.patch(
+        "app.template_previews.http_session.post",
+        return_value=Mock(content=b"png", status_code=200, headers={"content-type": "image/png"}),
+    )
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", side_effect=[None, base64.b64encode(b"png")])
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+
+    with set_config_values(notify_admin, {"LETTER_PREVIEW_CACHE_TTL_IN_SECONDS": 60}):
+        with notify_admin.test_request_context():
+            first_response = TemplatePreview.from_example_template({}, "geo")
+            second_response = TemplatePreview.from_example_template({}, "geo")
+
+    assert (
+        first_response
+        == second_response
+        == (
+            b"png",
+            200,
+            {"Content-Type": "image/png", "ETag": mocker.ANY},
+        )
+    )
+    assert request_mock.call_count == 1
+
+    cache_key = mock_redis_set.call_args[0][0]
+    assert cache_key.startswith("letter-preview-")
+    assert first_response[2]["ETag"] == f'"{cache_key}"'
+    assert mock_redis_get.call_args_list == [mocker.call(cache_key), mocker.call(cache_key)]
+    assert mock_redis_set.call_args == mocker.call(cache_key, base64.b64encode(b"png"), ex=60)
+
+
+def test_from_database_object_doesnt_cache_previews_with_values(notify_admin, mocker):
+    request_mock = mocker.patch(
+        "app.template_previews.http_session.post",
+        return_value=Mock(content=b"png", status_code=200, headers={}),
+    )
+    mocker.patch("app.template_previews.current_service", letter_branding=LetterBranding({"filename": "geo"}))
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get")
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+
+    with set_config_values(notify_admin, {"LETTER_PREVIEW_CACHE_TTL_IN_SECONDS": 60}):
+        with notify_admin.test_request_context():
+            response = TemplatePreview.from_database_object({}, "png", values={"name": "Jo", None: ["extra"]})
+
+    # Without an ETag the browser isn’t allowed to store it either
+    assert response == (b"png", 200, {}.items())
+    assert request_mock.call_count == 1
+    assert mock_redis_get.call_args_list == []
+    assert mock_redis_set.call_args_list == []
+
+
+def test_from_example_template_uses_different_cache_keys_for_different_brandings(notify_admin, mocker):
+    mocker.patch(
+        "app.template_previews.http_session.post",
+        return_value=Mock(content=b"png", status_code=200, headers={}),
+    )
+
+    with notify_admin.test_request_context():
+        first_etag = TemplatePreview.from_example_template({}, "geo")[2]["ETag"]
+        second_etag = TemplatePreview.from_example_template({}, "hm-government")[2]["ETag"]
+
+    assert first_etag != second_etag
+
+
+def test_from_example_template_doesnt_cache_big_previews(notify_admin, mocker):
+    mocker.patch(
+        "app.template_previews.http_session.post",
+        return_value=Mock(content=b"x" * 11, status_code=200, headers={}),
+    )
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+
+    with set_config_values(
+        notify_admin,
+        {"LETTER_PREVIEW_CACHE_TTL_IN_SECONDS": 60, "LETTER_PREVIEW_CACHE_MAX_ITEM_SIZE_IN_BYTES": 10},
+    ):
+        with notify_admin.test_request_context():
+            response = TemplatePreview.from_example_template({}, "geo")
+
+    assert response[0] == b"x" * 11
+    assert mock_redis_set.call_args_list == []
+
+
+def test_from_example_template_returns_304_if_browser_already_has_preview(notify_admin, mocker):
+    request_mock = mocker.patch(
+        "app.template_previews.http_session.post",
+        return_value=Mock(content=b"png", status_code=200, headers={}),
+    )
+
+    with notify_admin.test_request_context():
+        etag = TemplatePreview.from_example_template({}, "geo")[2]["ETag"]
+
+    with notify_admin.test_request_context(headers={"If-None-Match": etag}):
+        response = TemplatePreview.from_example_template({}, "geo")
+
+    assert response == (b"", 304, {"Content-Type": "image/png", "ETag": etag})
+    assert request_mock.call_count == 1
+
+
+def test_from_attachment_data_caches_previews(notify_admin, mocker):
+    request_mock = mocker.patch(
+        "app.template_previews.http_session.post",
+        return_value=Mock(content=b"png", status_code=200, headers={}),
+    )
+    mocker.patch("app.template_previews.current_service", id="1234")
+    mocker.patch("app.extensions.RedisClient.get", side_effect=[None, base64.b64encode(b"png")])
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+
+    with set_config_values(notify_admin, {"LETTER_PREVIEW_CACHE_TTL_IN_SECONDS": 60}):
+        with notify_admin.test_request_context():
+            first_response = LetterAttachmentPreview.from_attachment_data("5678", page=2)
+            second_response = LetterAttachmentPreview.from_attachment_data("5678", page=2)
+
+    assert first_response == second_response
+    assert first_response[2]["ETag"] == f'"{mock_redis_set.call_args[0][0]}"'
+    request_mock.assert_called_once_with(
+        "http://localhost:9999/letter_attachment_preview.png?page=2",
+        json={"letter_attachment_id": "5678", "service_id": "1234"},
+        headers={"Authorization": "Token my-secret-key"},
+    )
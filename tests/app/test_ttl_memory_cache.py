@@ -0,0 +1,30 @@
+from unittest.mock import Mock
+
+from app.ttl_memory_cache import TTLMemoryCache
+from tests.conftest import set_config_values
+
+
+def test_gets_value_every_time_if_ttl_is_zero(notify_admin):
+    cache = TTLMemoryCache(config_prefix="RECIPIENT_CSV_CACHE")
+    cache.init_app(notify_admin)
+    get_value = Mock(return_value="value")
+
+    assert cache.get_or_set("key", get_value) == "value"
+    assert cache.get_or_set("key", get_value) == "value"
+
+    assert get_value.call_count == 2
+
+
+def test_caches_value_per_key(notify_admin):
+    cache = TTLMemoryCache(config_prefix="RECIPIENT_CSV_CACHE")
+
+    with set_config_values(notify_admin, {"RECIPIENT_CSV_CACHE_TTL_IN_SECONDS": 60}):
+        cache.init_app(notify_admin)
+
+    get_value = Mock(side_effect=["value-1", "value-2"])
+
+    assert cache.get_or_set(("key", 1), get_value) == "value-1"
+    assert cache.get_or_set(("key", 1), get_value) == "value-1"
+    assert cache.get_or_set(("key", 2), get_value) == "value-2"
+
+    assert get_value.call_count == 2
@@ -0,0 +1,84 @@
+import threading
+import time
+from functools import partial
+
+import pytest
+from flask import g, request
+
+from app.utils.concurrency import read_ahead, run_concurrently
+
+
+def test_run_concurrently_returns_results_in_order():
+    assert run_concurrently(lambda: 1, lambda: 2, lambda: 3) == [1, 2, 3]
+
+
+def test_run_concurrently_with_one_function():
+    assert run_concurrently(lambda: "foo") == ["foo"]
+
+
+def test_run_concurrently_runs_functions_at_the_same_time():
+    # If the functions ran one after another the first would time out waiting for the second
+    barrier = threading.Barrier(2, timeout=5)
+    assert run_concurrently(barrier.wait, barrier.wait) in ([0, 1], [1, 0])
+
+
+def test_run_concurrently_reraises_first_exception_after_all_have_finished():
+    finished = []
+
+    def fail(message):
+        raise ValueError(message)
+
+    with pytest.raises(ValueError, match="first"):
+        run_concurrently(
+            lambda: fail("first"),
+            lambda: fail("second"),
+            lambda: finished.append(True),
+        )
+
+    assert finished == [True]
+
+
+def test_run_concurrently_shares_request_context(notify_admin):
+    with notify_admin.test_request_context("/foo"):
+        g.user_id = "1234"
+        assert run_concurrently(lambda: request.path, lambda: g.user_id) == ["/foo", "1234"]
+
+
+def test_run_concurrently_limits_how_many_functions_run_at_once():
+    running, most_running = 0, 0
+    lock = threading.Lock()
+
+    def count_running():
+        nonlocal running, most_running
+        with lock:
+            running += 1
+            most_running = max(most_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    run_concurrently(*([count_running] * 6), max_workers=2)
+
+    assert most_running == 2
+
+
+def test_read_ahead_yields_results_in_order():
+    def slow(result, delay):
+        time.sleep(delay)
+        return result
+
+    fns = [partial(slow, "a", 0.03), partial(slow, "b", 0), partial(slow, "c", 0.01), partial(slow, "d", 0)]
+
+    assert list(read_ahead(fns, max_in_flight=2)) == ["a", "b", "c", "d"]
+
+
+def test_read_ahead_only_calls_as_many_functions_as_allowed_ahead_of_the_caller():
+    called = []
+    results = read_ahead((partial(called.append, i) for i in range(10)), max_in_flight=2)
+
+    next(results)
+    time.sleep(0.05)
+    results.close()
+
+    assert 0 in called
+    assert set(called) <= {0, 1, 2}
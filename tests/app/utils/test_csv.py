@@ -1,11 +1,18 @@
 from collections import namedtuple
 from csv import DictReader
 from io import StringIO
+from time import perf_counter
 
 import pytest
 
-from app.utils.csv import generate_notifications_csv, get_errors_for_csv
-from tests.conftest import fake_uuid
+from app.ttl_memory_cache import TTLMemoryCache
+from app.utils.csv import (
+    CSV_CHUNK_SIZE,
+    CSVRowIndex,
+    generate_notifications_csv,
+    get_errors_for_csv,
+)
+from tests.conftest import fake_uuid, set_config_values
 
 
 def _get_notifications_csv(
@@ -217,6 +224,178 @@ def test_generate_notifications_csv_calls_twice_if_next_link(
     assert mock_get_notifications.mock_calls[1][2]["page"] == 2
 
 
+def test_generate_notifications_csv_reads_ahead_to_the_last_page(notify_admin, mocker):
+    def _get(service_id, page):
+        return {
+            "notifications": _get_notifications_csv(recipient=f"page-{page}@example.com")(service_id)["notifications"],
+            "links": (
+                {
+                    "next": f"/service/{service_id}/notifications?page={page + 1}",
+                    "last": f"/service/{service_id}/notifications?page=5",
+                }
+                if page < 5
+                else {}
+            ),
+        }
+
+    mock_get_notifications = mocker.patch(
+        "app.notification_api_client.get_notifications_for_service",
+        side_effect=_get,
+    )
+
+    csv = list(DictReader(StringIO("\n".join(generate_notifications_csv(service_id="1234", page="2")))))
+
+    assert [row["Recipient"] for row in csv] == [
+        "page-2@example.com",
+        "page-3@example.com",
+        "page-4@example.com",
+        "page-5@example.com",
+    ]
+    assert sorted(call[2]["page"] for call in mock_get_notifications.mock_calls) == [2, 3, 4, 5]
+
+
+def test_generate_notifications_csv_writes_rows_in_chunks(notify_admin, mocker):
+    mocker.patch(
+        "app.notification_api_client.get_notifications_for_service",
+        side_effect=_get_notifications_csv(rows=2000),
+    )
+
+    header, *chunks = generate_notifications_csv(service_id="1234")
+
+    assert 1 < len(chunks) < 10
+    assert all(len(chunk) >= CSV_CHUNK_SIZE for chunk in chunks[:-1])
+    assert "".join(chunks).count("\r\n") == 2000
+
+
+def _get_pages_of_notifications_csv(rows, page_size):
+    notifications = _get_notifications_csv(rows=page_size)("1234")["notifications"]
+
+    def _get(service_id, page):
+        return {
+            "notifications": notifications,
+            "links": (
+                {
+                    "next": f"/service/{service_id}/notifications?page={page + 1}",
+                    "last": f"/service/{service_id}/notifications?page={rows // page_size}",
+                }
+                if page < rows // page_size
+                else {}
+            ),
+        }
+
+    return _get
+
+
+def test_generate_notifications_csv_writes_every_row_of_every_page(notify_admin, mocker):
+    mock_get_notifications = mocker.patch(
+        "app.notification_api_client.get_notifications_for_service",
+        side_effect=_get_pages_of_notifications_csv(rows=10_000, page_size=500),
+    )
+
+    csv = list(DictReader(StringIO("".join(generate_notifications_csv(service_id="1234")))))
+
+    assert len(csv) == 10_000
+    assert all(row["Recipient"] == "foo@bar.com" for row in csv)
+    assert sorted(call[2]["page"] for call in mock_get_notifications.mock_calls) == list(range(1, 21))
+
+
+@pytest.mark.performance
+def test_generate_notifications_csv_rows_per_second(notify_admin, mocker):
+    rows = 100_000
+    mocker.patch(
+        "app.notification_api_client.get_notifications_for_service",
+        side_effect=_get_pages_of_notifications_csv(rows=rows, page_size=5000),
+    )
+
+    start = perf_counter()
+    csv_content = "".join(generate_notifications_csv(service_id="1234"))
+    rows_per_second = rows / (perf_counter() - start)
+
+    assert csv_content.count("\r\n") == rows
+    # Writing a row used to mean creating a new spreadsheet and CSV writer
+    # for it – this is a generous lower bound so it doesn’t flake on slow
+    # machines, but would catch going back to anything like that
+    assert rows_per_second > 25_000, f"{rows_per_second:.0f} rows per second"
+
+
+def test_csv_row_index_looks_up_rows_by_index():
+    index = CSVRowIndex(
+        """
+        phone_number, Name, address
+        07700900001, Anne , "1 Example Street
+        Example Town"
+        07700900002,
+        07700900003,  ,"",extra
+    """
+    )
+
+    assert index.column_headers == ["phone_number", "Name", "address"]
+    assert len(index) == 3
+    assert index[0] == ["07700900001", "Anne", "1 Example Street\n        Example Town"]
+    assert index[1] == ["07700900002", None, None]
+    assert index[2] == ["07700900003", None, None]
+
+    with pytest.raises(IndexError):
+        index[3]
+
+
+@pytest.mark.parametrize(
+    "file_data, expected_row",
+    [
+        (
+            # Like RecipientCSV, the last of the recipient columns wins
+            "phone number,name,Phone_Number\n07700900001,Anne,07700900002",
+            ["07700900002", "Anne", "07700900002"],
+        ),
+        (
+            # and the values of other columns with exactly the same header are kept in a list
+            "phone number,name,name\n07700900001,Anne,Bob",
+            ["07700900001", ["Anne", "Bob"], ["Anne", "Bob"]],
+        ),
+        (
+            "phone number,name,Name\n07700900001,Anne,Bob",
+            ["07700900001", "Bob", "Bob"],
+        ),
+    ],
+)
+def test_csv_row_index_reads_duplicate_columns_like_recipient_csv(file_data, expected_row):
+    index = CSVRowIndex(file_data, ["phone number"])
+
+    assert index.column_headers == file_data.splitlines()[0].split(",")
+    assert index[0] == expected_row
+
+
+def test_csv_row_index_reads_line_breaks_in_values_as_newlines():
+    index = CSVRowIndex('phone number,address\r\n07700900001,"1 Example Street\r\nExample Town"\r\n07700900002,x')
+
+    assert len(index) == 2
+    assert index[0] == ["07700900001", "1 Example Street\nExample Town"]
+    assert index[1] == ["07700900002", "x"]
+
+
+def test_generate_notifications_csv_reuses_index_of_original_upload(notify_admin, mocker, _get_notifications_csv_mock):
+    mock_s3download = mocker.patch(
+        "app.s3_client.s3_csv_client.s3download",
+        return_value="phone_number\n07700900123",
+    )
+    job_upload_cache = TTLMemoryCache(config_prefix="JOB_UPLOAD_CACHE")
+    with set_config_values(notify_admin, {"JOB_UPLOAD_CACHE_TTL_IN_SECONDS": 60}):
+        job_upload_cache.init_app(notify_admin)
+    mocker.patch("app.utils.csv.job_upload_cache", job_upload_cache)
+
+    for _ in range(2):
+        csv = list(
+            DictReader(
+                StringIO(
+                    "\n".join(generate_notifications_csv(service_id="1234", job_id=fake_uuid, template_type="sms"))
+                )
+            )
+        )
+        assert csv[0]["phone_number"] == "07700900123"
+
+    mock_s3download.assert_called_once_with("1234", fake_uuid)
+
+
 MockRecipients = namedtuple(
     "RecipientCSV",
     ["rows_with_bad_recipients", "rows_with_missing_data", "rows_with_message_too_long", "rows_with_empty_message"],
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+from flask import Response, jsonify
+from freezegun import freeze_time
+
+from app.utils.json_updates import (
+    cache_json_updates,
+    get_poll_interval,
+    make_json_updates_conditional,
+)
+from tests.conftest import SERVICE_ONE_ID, set_config_values
+
+
+def test_make_json_updates_conditional_adds_etag(notify_admin):
+    with notify_admin.test_request_context():
+        response = make_json_updates_conditional(Response('{"foo": "bar"}'))
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+
+
+def test_make_json_updates_conditional_returns_304_if_unchanged(notify_admin):
+    with notify_admin.test_request_context():
+        etag = make_json_updates_conditional(Response('{"foo": "bar"}')).headers["ETag"]
+
+    with notify_admin.test_request_context(headers={"If-None-Match": etag}):
+        unchanged = make_json_updates_conditional(Response('{"foo": "bar"}'))
+        changed = make_json_updates_conditional(Response('{"foo": "baz"}'))
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+
+
+def test_make_json_updates_conditional_ignores_errors(notify_admin):
+    with notify_admin.test_request_context():
+        response = make_json_updates_conditional(Response("Not found", status=404))
+
+    assert "ETag" not in response.headers
+
+
+def test_cache_json_updates_does_nothing_if_ttl_is_zero(notify_admin, mocker):
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get")
+    view = mocker.Mock(return_value={"foo": "bar"})
+
+    with notify_admin.test_request_context():
+        assert cache_json_updates(view)(service_id=SERVICE_ONE_ID) == {"foo": "bar"}
+
+    view.assert_called_once_with(SERVICE_ONE_ID)
+    assert mock_redis_get.call_args_list == []
+
+
+def test_cache_json_updates_shares_responses_for_the_same_user_and_url(notify_admin, mocker, fake_uuid):
+    mocker.patch("app.utils.json_updates.current_user", id=fake_uuid)
+    mock_redis_get = mocker.patch("app.extensions.RedisClient.get", side_effect=[None, '{"foo": "bar"}'])
+    mock_redis_set = mocker.patch("app.extensions.RedisClient.set")
+    view = mocker.Mock(side_effect=lambda service_id: jsonify(foo="bar"))
+
+    with set_config_values(notify_admin, {"JSON_UPDATES_CACHE_TTL_IN_SECONDS": 5}):
+        with notify_admin.test_request_context("/services/1234/dashboard.json?page=2"):
+            first_response = cache_json_updates(view)(service_id=SERVICE_ONE_ID)
+            second_response = cache_json_updates(view)(service_id=SERVICE_ONE_ID)
+
+    assert json.loads(first_response.get_data()) == json.loads(second_response.get_data()) == {"foo": "bar"}
+    assert second_response.mimetype == "application/json"
+    assert view.call_count == 1
+
+    cache_key = mock_redis_set.call_args[0][0]
+    assert cache_key.startswith(f"service-{SERVICE_ONE_ID}-json-updates-")
+    assert mock_redis_get.call_args_list == [mocker.call(cache_key), mocker.call(cache_key)]
+    assert mock_redis_set.call_args[1] == {"ex": 5}
+
+
+@freeze_time("2020-01-01 12:00:00")
+@pytest.mark.parametrize(
+    "last_changed, active, expected_interval",
+    (
+        ("2020-01-01T11:00:00.000000Z", True, 2_000),
+        ("2020-01-01T11:59:30.000000Z", False, 2_000),
+        ("2020-01-01T11:59:00.000000Z", False, 4_000),
+        ("2020-01-01T11:58:00.000000Z", False, 8_000),
+        ("2020-01-01T11:56:30.000000Z", False, 16_000),
+        ("2020-01-01T11:56:00.000000Z", False, 32_000),
+        ("2020-01-01T11:55:00.000000Z", False, 60_000),
+        ("2019-01-01T12:00:00.000000Z", False, 60_000),
+        ("2020-01-01T12:05:00.000000Z", False, 2_000),
+        (None, False, 60_000),
+    ),
+)
+def test_get_poll_interval(last_changed, active, expected_interval):
+    assert get_poll_interval(last_changed, active=active) == expected_interval
@@ -3,7 +3,12 @@ from flask import request
 from werkzeug.exceptions import Forbidden
 
 from app import load_service_before_request
-from app.utils.user import user_has_permissions
+from app.utils.user import (
+    EmailDomains,
+    _parse_organisation_email_domains,
+    is_gov_user,
+    user_has_permissions,
+)
 
 
 @pytest.mark.parametrize(
@@ -163,3 +168,45 @@ def test_user_with_no_permissions_to_service_goes_to_templates(
 
     load_service_before_request()
     index()
+
+
+@pytest.mark.parametrize(
+    "email_address, expected_match",
+    (
+        ("test@gov.uk", True),
+        ("test@Example.GOV.UK", True),
+        ("test@nhs.net", True),
+        ("test@example.nhs.net", True),
+        ("test@notgov.uk", False),
+        ("test@gov.uk.example.com", False),
+        ("test@net", False),
+    ),
+)
+def test_email_domains(email_address, expected_match):
+    assert (email_address in EmailDomains(["gov.uk", "nhs.net"])) is expected_match
+
+
+def test_is_gov_user_only_rebuilds_organisation_domains_when_they_change(mocker):
+    mocker.patch(
+        "app.extensions.RedisClient.get",
+        side_effect=['["example.com"]', '["example.com"]', '["example.org"]'],
+    )
+    mock_get_domains = mocker.patch("app.organisations_client.get_domains")
+    mock_email_domains = mocker.patch("app.utils.user.EmailDomains", wraps=EmailDomains)
+    _parse_organisation_email_domains.cache_clear()
+
+    assert is_gov_user("test@example.com") is True
+    assert is_gov_user("test@example.com") is True
+    assert is_gov_user("test@example.com") is False
+
+    assert mock_get_domains.call_count == 0
+    assert mock_email_domains.call_args_list == [mocker.call(["example.com"]), mocker.call(["example.org"])]
+
+
+def test_is_gov_user_gets_organisation_domains_from_api_if_not_cached(mocker):
+    mocker.patch("app.extensions.RedisClient.get", return_value=None)
+    mock_get_domains = mocker.patch("app.organisations_client.get_domains", return_value=["example.com"])
+
+    assert is_gov_user("test@example.com") is True
+
+    mock_get_domains.assert_called_once_with()
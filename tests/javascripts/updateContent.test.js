@@ -161,6 +161,42 @@ describe('Update content', () => {
 
       });
 
+      test("It should wait longer between requests if the server asks it to", () => {
+
+        responseObj.poll_interval = 30000;
+
+        // Time from start of module: 2000ms
+        // First call happens at 2000ms by default
+        jest.advanceTimersByTime(2000);
+        expect($.ajax).toHaveBeenCalledTimes(1);
+
+        // Time from start of module: 3000ms
+        // Server responds, asking for the next request to wait 30000ms
+        jest.advanceTimersByTime(serverResponse.responseTimeInMilliseconds);
+        serverResponse.complete();
+
+        // Time from start of module: 4000ms
+        // Second call still uses the interval set before the response arrived
+        jest.advanceTimersByTime(1000);
+        expect($.ajax).toHaveBeenCalledTimes(2);
+
+        // Time from start of module: 5000ms
+        jest.advanceTimersByTime(serverResponse.responseTimeInMilliseconds);
+        serverResponse.complete();
+
+        // Time from start of module: 33999ms
+        // Third call waits for the 30000ms the server asked for, rather than the 6905ms backoff
+        jest.advanceTimersByTime(28999);
+        expect($.ajax).toHaveBeenCalledTimes(2);
+
+        // Time from start of module: 34000ms
+        jest.advanceTimersByTime(1);
+        expect($.ajax).toHaveBeenCalledTimes(3);
+
+        delete responseObj.poll_interval;
+
+      });
+
       each([
         [1000, 0],
         [1500, 100],